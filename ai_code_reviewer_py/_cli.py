@@ -0,0 +1,170 @@
+# Command implementations behind `cli.py`; importing this module pulls in the AI and git stacks.
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import click
+
+from ai_code_reviewer_py.app_service import AppService
+from ai_code_reviewer_py.config_loader import api_key_from_env, validate_final_config
+from ai_code_reviewer_py.config_models import AppConfig
+from ai_code_reviewer_py.enums import AIProvider
+
+_PROVIDER_BY_VALUE = {p.value: p for p in AIProvider}
+
+try:
+    import uvloop  # type: ignore[import-not-found,import-untyped]
+except ImportError:  # uvloop ships with the optional "speedups" extra and does not support Windows
+    _LOOP_FACTORY = None
+else:
+    _LOOP_FACTORY = uvloop.new_event_loop
+
+
+async def _run_with_service(service: AppService, coro, prewarm: bool = False):
+    """Runs a service coroutine and releases the service's pooled connections afterwards."""
+    async with service:
+        if prewarm:
+            service.start_prewarm()
+        await coro
+
+
+def _apply_common_config_overrides(
+    final_config: AppConfig,
+    ai_provider_override: Optional[str],
+    enable_anthropic_web_search_override: Optional[bool],
+    enable_citations_override: Optional[bool],
+    enable_batch_processing_override: Optional[bool],
+    enable_extended_thinking_override: Optional[bool],
+    save_to_markdown_override: Optional[bool],
+    markdown_output_dir_override: Optional[str],
+    include_diff_in_markdown_override: Optional[bool] = None,
+    cache_remote_archives_override: Optional[bool] = None,
+) -> AppConfig:
+    """Returns a copy of `final_config` with the CLI overrides applied.
+
+    Click has already typed every override, so they go in through one `model_copy`
+    instead of a validated assignment per field.
+    """
+    updates: Dict[str, Any] = {
+        field: value
+        for field, value in (
+            ("enable_anthropic_web_search", enable_anthropic_web_search_override),
+            ("enable_citations", enable_citations_override),
+            ("enable_batch_processing", enable_batch_processing_override),
+            ("enable_extended_thinking", enable_extended_thinking_override),
+            ("save_to_markdown", save_to_markdown_override),
+            ("markdown_output_dir", markdown_output_dir_override),
+            ("include_diff_in_markdown", include_diff_in_markdown_override),
+            ("cache_remote_archives", cache_remote_archives_override),
+        )
+        if value is not None
+    }
+    if ai_provider_override is not None:
+        provider = _PROVIDER_BY_VALUE[ai_provider_override]
+        updates["ai_provider"] = provider
+        if not final_config.api_key:
+            updates["api_key"] = api_key_from_env(provider)
+    return final_config.model_copy(update=updates) if updates else final_config
+
+
+def review(
+    ctx: click.Context,
+    commit_range: str,
+    ai_provider_override: Optional[str],
+    enable_anthropic_web_search_override: Optional[bool],
+    enable_citations_override: Optional[bool],
+    enable_batch_processing_override: Optional[bool],
+    enable_extended_thinking_override: Optional[bool],
+    save_to_markdown: Optional[bool],
+    markdown_output_dir: Optional[str],
+    include_diff_in_markdown: Optional[bool]
+):
+    final_config = _apply_common_config_overrides(
+        final_config=ctx.obj['base_config'], # Start with base config
+        ai_provider_override=ai_provider_override,
+        enable_anthropic_web_search_override=enable_anthropic_web_search_override,
+        enable_citations_override=enable_citations_override,
+        enable_batch_processing_override=enable_batch_processing_override,
+        enable_extended_thinking_override=enable_extended_thinking_override,
+        save_to_markdown_override=save_to_markdown,
+        markdown_output_dir_override=markdown_output_dir,
+        include_diff_in_markdown_override=include_diff_in_markdown
+    )
+
+    validate_final_config(final_config)
+    service = AppService(final_config)
+    asyncio.run(_run_with_service(service, service.review_commits_in_range(commit_range), prewarm=True), loop_factory=_LOOP_FACTORY)
+
+
+def review_repo(
+    ctx: click.Context,
+    include_patterns: list[str],
+    exclude_patterns: list[str],
+    max_files: Optional[int],
+    ai_provider_override: Optional[str],
+    enable_anthropic_web_search_override: Optional[bool],
+    enable_citations_override: Optional[bool],
+    enable_batch_processing_override: Optional[bool],
+    enable_extended_thinking_override: Optional[bool],
+    save_to_markdown_override: Optional[bool],
+    markdown_output_dir_override: Optional[str]
+):
+    final_config = _apply_common_config_overrides(
+        final_config=ctx.obj['base_config'],
+        ai_provider_override=ai_provider_override,
+        enable_anthropic_web_search_override=enable_anthropic_web_search_override,
+        enable_citations_override=enable_citations_override,
+        enable_batch_processing_override=enable_batch_processing_override,
+        enable_extended_thinking_override=enable_extended_thinking_override,
+        save_to_markdown_override=save_to_markdown_override,
+        markdown_output_dir_override=markdown_output_dir_override,
+        # No include_diff_in_markdown_override for review-repo
+    )
+    
+    validate_final_config(final_config)
+    service = AppService(final_config)
+    asyncio.run(_run_with_service(service, service.review_repository_files(list(include_patterns), list(exclude_patterns), max_files), prewarm=True), loop_factory=_LOOP_FACTORY)
+
+
+def review_remote(
+    ctx: click.Context,
+    repo_url: str,
+    ref: str,
+    include_patterns: list[str],
+    exclude_patterns: list[str],
+    max_files: Optional[int],
+    ai_provider_override: Optional[str],
+    enable_anthropic_web_search_override: Optional[bool],
+    enable_citations_override: Optional[bool],
+    enable_batch_processing_override: Optional[bool],
+    enable_extended_thinking_override: Optional[bool],
+    save_to_markdown_override: Optional[bool],
+    markdown_output_dir_override: Optional[str],
+    cache_remote_archives_override: Optional[bool] = None
+):
+    final_config = _apply_common_config_overrides(
+        final_config=ctx.obj['base_config'],
+        ai_provider_override=ai_provider_override,
+        enable_anthropic_web_search_override=enable_anthropic_web_search_override,
+        enable_citations_override=enable_citations_override,
+        enable_batch_processing_override=enable_batch_processing_override,
+        enable_extended_thinking_override=enable_extended_thinking_override,
+        save_to_markdown_override=save_to_markdown_override,
+        markdown_output_dir_override=markdown_output_dir_override,
+        include_diff_in_markdown_override=None,
+        cache_remote_archives_override=cache_remote_archives_override
+    )
+    validate_final_config(final_config)
+    service = AppService(final_config)
+    asyncio.run(_run_with_service(service, service.review_external_repository(repo_url, ref, list(include_patterns), list(exclude_patterns), max_files), prewarm=True), loop_factory=_LOOP_FACTORY)
+
+
+def summarize_reviews(ctx: click.Context, since_date: Optional[str], min_score: Optional[int]):
+    since: Optional[datetime] = None
+    if since_date:
+        try:
+            since = datetime.strptime(since_date, "%Y-%m-%d")
+        except ValueError:
+            raise click.BadParameter(f"{since_date!r} does not match the format YYYY-MM-DD.", param_hint="'--since'")
+    service = AppService(ctx.obj['base_config'])
+    asyncio.run(_run_with_service(service, service.generate_review_summary(since, min_score)), loop_factory=_LOOP_FACTORY)
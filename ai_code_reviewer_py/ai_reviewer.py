@@ -1,10 +1,16 @@
+import copy
+import hashlib
+import io
 import json
 import re
 import asyncio
 import os
-from typing import Any, Dict, List, Optional, Union
+import random
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 from typing import cast
 
+import httpx
 import litellm
 
 from ai_code_reviewer_py.config_models import AppConfig
@@ -12,6 +18,168 @@ from ai_code_reviewer_py.git_analyzer import CommitInfo
 from ai_code_reviewer_py.models import AIReviewResponse, CommitDetails, FileDetails, RepositorySummaryResponse
 from ai_code_reviewer_py.exceptions import ReviewParsingError, ReviewGenerationError
 from ai_code_reviewer_py.enums import AIProvider, AIModel
+from ai_code_reviewer_py import json_utils
+
+_MARKDOWN_JSON_RE = re.compile(r"```(?:json)?\s*([\s\S]*?)\s*```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r',(\s*[}\]])')
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _extract_json_payload(response_text: str) -> Any:
+    """Decodes the JSON object in an AI response in a single pass, ignoring any prose or code fences around it."""
+    cleaned_response = response_text.strip()
+
+    # JSON-mode responses are a bare object, so try them as-is before any scraping
+    if cleaned_response.startswith('{'):
+        try:
+            return json_utils.loads(cleaned_response)
+        except json_utils.JSONDecodeError:
+            start = 0
+    else:
+        # Try to extract JSON from markdown code blocks first
+        markdown_json_match = _MARKDOWN_JSON_RE.search(cleaned_response)
+        if markdown_json_match:
+            cleaned_response = markdown_json_match.group(1)
+
+        start = cleaned_response.find('{')
+        if start == -1:
+            # Last resort: try parsing the entire cleaned response
+            return json_utils.loads(cleaned_response)
+
+    try:
+        # Decodes the first object and ignores whatever prose follows it
+        return _JSON_DECODER.raw_decode(cleaned_response, start)[0]
+    except json.JSONDecodeError:
+        # Try to fix common JSON issues within the outermost braces
+        json_content = cleaned_response[start:cleaned_response.rfind('}') + 1]
+        json_content = json_content.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
+        # Remove any trailing commas before closing braces/brackets
+        json_content = _TRAILING_COMMA_RE.sub(r'\1', json_content)
+        return json_utils.loads(json_content)
+
+
+_JSON_MODE_PROVIDERS = frozenset({AIProvider.OPENAI, AIProvider.GOOGLE})
+_MODEL_BY_VALUE = {model.value: model for model in AIModel}
+_WEB_SEARCH_SUPPORTED_MODELS = frozenset({
+    AIModel.CLAUDE_SONNET_4_20250514,
+    AIModel.CLAUDE_3_7_SONNET_20250219,
+    AIModel.CLAUDE_3_5_SONNET_LATEST
+})
+
+# Only providers whose litellm handler sends traffic through `litellm.aclient_session`
+# benefit from warming our pool; the others use litellm's own cached clients.
+_PREWARM_URLS: Dict[Optional[AIProvider], str] = {
+    AIProvider.OPENAI: "https://api.openai.com/v1",
+}
+
+
+def _write_file_blocks(buf: io.StringIO, files_data: List[FileDetails]):
+    """Streams each file into the prompt buffer without building per-file intermediate strings."""
+    write = buf.write
+    for file_data in files_data:
+        write("=== FILE: ")
+        write(file_data.path)
+        write(" ===\n")
+        write(file_data.content)
+        write("\n=== END FILE ===\n\n")
+
+
+def _retry_delay(attempt: int, error: Exception) -> float:
+    """Exponential backoff with jitter, stretched to honour a provider's Retry-After on rate limits."""
+    delay = (2 ** attempt) + random.random()
+    response = getattr(error, "response", None)
+    retry_after = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass
+    return delay
+
+
+class _RequestRateLimiter:
+    """Spaces out request starts so no more than `requests_per_minute` begin in any minute."""
+
+    def __init__(self, requests_per_minute: int):
+        self._interval = 60.0 / requests_per_minute
+        self._lock = asyncio.Lock()
+        self._next_slot = 0.0
+
+    async def acquire(self):
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self._interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class _JSONObjectScanner:
+    """Tracks brace depth across streamed chunks to spot when the first top-level JSON object is complete."""
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._length = 0
+        self._start = 0
+        self._end: Optional[int] = None
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, text: str) -> bool:
+        """Adds a chunk and returns True once a JSON object in the stream has closed and parses.
+
+        A balanced candidate that does not parse (braces in leading prose or a code snippet) is dropped
+        and scanning carries on, so the stream is only cut short once the payload is really complete.
+        """
+        self._parts.append(text)
+        offset = self._length
+        self._length += len(text)
+        for i, ch in enumerate(text):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == '\\':
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '{':
+                if not self._started:
+                    self._start = offset + i
+                    self._started = True
+                self._depth += 1
+            elif not self._started:
+                continue
+            elif ch == '"':
+                self._in_string = True
+            elif ch == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    if self._candidate_parses(offset + i + 1):
+                        self._end = offset + i + 1
+                        return True
+                    self._started = False
+        return False
+
+    def _candidate_parses(self, end: int) -> bool:
+        try:
+            parsed = json_utils.loads(self.text[self._start:end])
+        except json_utils.JSONDecodeError:
+            return False
+        # An empty `{}` is far more likely a literal quoted in prose than the payload
+        return isinstance(parsed, dict) and bool(parsed)
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    @property
+    def payload(self) -> str:
+        """The completed JSON object if one was found, otherwise everything read so far."""
+        if self._end is None:
+            return self.text
+        return self.text[self._start:self._end]
 
 
 class AIReviewer:
@@ -21,18 +189,82 @@ class AIReviewer:
         self.model = config.model or self._get_default_model()
         self.enable_extended_thinking = config.enable_extended_thinking
         self.enable_citations = config.enable_citations
-
-    def _get_default_model(self) -> str:
-        if self.provider == AIProvider.OPENAI:
-            return AIModel.GPT_4_1_MINI
-        elif self.provider == AIProvider.ANTHROPIC:
-            return AIModel.CLAUDE_SONNET_4_20250514
-        elif self.provider == AIProvider.GOOGLE:
-            return AIModel.GEMINI_2_5_FLASH_PREVIEW_05_20
-        return AIModel.GPT_4_1_MINI
+        # Caps how many reviews (including their retries) are in flight at once
+        self._semaphore = asyncio.Semaphore(config.max_concurrency)
+        self._rate_limiter = _RequestRateLimiter(config.requests_per_minute) if config.requests_per_minute else None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        # Parsed results of earlier LLM calls keyed by a hash of model + prompt, in LRU order
+        self._response_cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Static prompt pieces depend only on config, so build them once per reviewer
+        self._criteria_block = '\n'.join(f"{i+1}. {criterion.title()}" for i, criterion in enumerate(config.review_criteria))
+        # Optional fragments carry their own line breaks so nothing, not even a blank line, is left behind when disabled
+        if self.enable_citations:
+            self._citation_issue_field = '\n      "citation": "<source URL or reference if applicable>",'
+            self._citation_sources_field = '\n  "sources": ["<list of sources consulted>"],'
+            self._review_citation_note = '\n\nProvide citations for any security recommendations or best practices you mention.'
+            self._repository_citation_note = '\n\nProvide citations for security recommendations and architectural guidance.'
+        else:
+            self._citation_issue_field = self._citation_sources_field = ''
+            self._review_citation_note = self._repository_citation_note = ''
+        self._review_schema_block = self._build_review_schema_block()
+        self._review_prefix = self._build_review_prompt_prefix()
+        self._marshalled_review_prefix = self._build_marshalled_review_prompt_prefix()
+        self._repository_prefix = self._build_repository_prompt_prefix()
+        self._system_message = {"role": "system", "content": "You are a senior software engineer providing code reviews. You MUST respond with valid JSON only. No markdown formatting, no code blocks, no explanations outside JSON. Be thorough and constructive in your analysis."}
+        # Request options only depend on config, so resolve them once
+        self._litellm_kwargs = self._prepare_litellm_kwargs()
+        self._chunk_summary_prefix = self._build_chunk_summary_prompt_prefix()
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Returns the pooled client shared by all LLM calls, creating it inside the running event loop."""
+        if self._http_client is None:
+            # With HTTP/2 concurrent requests multiplex over one connection per host instead of
+            # each waiting for a free keep-alive socket
+            self._http_client = httpx.AsyncClient(
+                http2=self.config.enable_http2,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_concurrency,
+                    max_keepalive_connections=self.config.max_concurrency
+                ),
+                timeout=httpx.Timeout(600.0, connect=10.0)
+            )
+            litellm.aclient_session = self._http_client
+        return self._http_client
+
+    async def aclose(self):
+        if self._http_client is None:
+            return
+        if litellm.aclient_session is self._http_client:
+            litellm.aclient_session = None
+        await self._http_client.aclose()
+        self._http_client = None
+
+    async def prewarm(self, connections: int = 4):
+        """Opens pooled connections to the provider ahead of the first review. Failures are ignored."""
+        url = _PREWARM_URLS.get(self.provider)
+        if not url:
+            return
+        client = self._get_http_client()
+        count = min(connections, self.config.max_concurrency)
+        await asyncio.gather(*(client.head(url) for _ in range(count)), return_exceptions=True)
+
+    def _get_default_model(self) -> Union[str, AIModel]:
+        return self.config.get_default_model()
 
     def _prepare_litellm_kwargs(self) -> Dict[str, Any]:
-        kwargs = {}
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "api_key": self.config.api_key.strip(),
+            "max_tokens": self.config.max_tokens or 4000,
+            "temperature": 0.1,
+            "top_p": 0.99,
+            "stream": self.config.enable_streaming,
+        }
+
+        # Anthropic only offers JSON output through forced tool use, which clashes with thinking and web search
+        if self.config.enable_json_mode and self.provider in _JSON_MODE_PROVIDERS:
+            kwargs["response_format"] = {"type": "json_object"}
 
         if self.provider == AIProvider.ANTHROPIC and self.enable_extended_thinking:
             max_tokens_budget = self.config.max_tokens or 64000
@@ -40,16 +272,8 @@ class AIReviewer:
             kwargs["thinking"] = {"type": "enabled", "budget_tokens": budget_tokens}
         
         if self.provider == AIProvider.ANTHROPIC and self.config.enable_anthropic_web_search:
-            supported_web_search_models = [
-                AIModel.CLAUDE_SONNET_4_20250514,
-                AIModel.CLAUDE_3_7_SONNET_20250219,
-                AIModel.CLAUDE_3_5_SONNET_LATEST
-            ]
-            current_model_enum = None
-            for model in AIModel:
-                if model.value == self.model:
-                    current_model_enum = model
-            if current_model_enum in supported_web_search_models:
+            current_model_enum = _MODEL_BY_VALUE.get(self.model)
+            if current_model_enum in _WEB_SEARCH_SUPPORTED_MODELS:
                 kwargs["tools"] = [{
                     "type": "web_search_20250305", 
                     "name": "web_search"
@@ -59,34 +283,8 @@ class AIReviewer:
 
         return kwargs
 
-    def _build_prompt(self, diff: str, commit: CommitInfo) -> str:
-        commit_details_for_prompt = CommitDetails(
-            hash=commit['hash'],
-            message=commit['message'],
-            author=f"{commit['author_name']} <{commit['author_email']}>",
-            date=commit['date'].isoformat()
-        )
-
-        citation_issue_field = '"citation": "<source URL or reference if applicable>",' if self.enable_citations else ''
-        citation_sources_field = '"sources": ["<list of sources consulted>"],' if self.enable_citations else ''
-
-        criteria_list = '\n'.join(f"{i+1}. {criterion.title()}" for i, criterion in enumerate(self.config.review_criteria))
-        base_prompt = f"""You are an expert code reviewer. Please review the following git commit and provide feedback.
-
-Commit Message: {commit_details_for_prompt['message']}
-Author: {commit_details_for_prompt['author']}
-Date: {commit_details_for_prompt['date']}
-
-Code Changes:
-{diff}
-
-Please analyze this commit and provide a structured review focusing on:
-{criteria_list}
-
-{ 'Provide citations for any security recommendations or best practices you mention.' if self.enable_citations else ''}
-
-Format your response as JSON with this structure:
-{{
+    def _build_review_schema_block(self) -> str:
+        return f"""{{
   "score": "<number 1-10>",
   "summary": "<brief summary>",
   "issues": [
@@ -94,8 +292,7 @@ Format your response as JSON with this structure:
       "severity": "low|medium|high|critical",
       "description": "<issue description>",
       "suggestion": "<how to fix>",
-      "category": "security|performance|quality|style|testing|documentation",
-      {citation_issue_field}
+      "category": "security|performance|quality|style|testing|documentation",{self._citation_issue_field}
       "auto_fixable": "<boolean>"
     }}
   ],
@@ -103,45 +300,85 @@ Format your response as JSON with this structure:
   "security": ["<security-related notes>"],
   "performance": ["<performance-related notes>"],
   "dependencies": ["<dependency-related observations>"],
-  "accessibility": ["<accessibility considerations>"],
-  {citation_sources_field}
+  "accessibility": ["<accessibility considerations>"],{self._citation_sources_field}
   "confidence": "<number 1-10 indicating confidence in the review>"
-}}
+}}"""
 
-Be constructive, specific, and provide actionable feedback. Focus on the most impactful improvements."""
-        return base_prompt + "\n\nIMPORTANT: Respond ONLY with valid JSON. Do not wrap your response in markdown code blocks or add any explanation outside the JSON."
+    def _build_review_prompt_prefix(self) -> str:
+        """Builds the static instructions that open every commit review prompt.
 
-    def _build_repository_review_prompt(self, files_data: List[FileDetails], repo_info: str) -> str:
-        citation_issue_field = '"citation": "<source URL or reference if applicable>",' if self.enable_citations else ''
-        citation_sources_field = '"sources": ["<list of sources consulted>"],' if self.enable_citations else ''
+        Built once in `__init__` so the text stays byte-identical across calls,
+        letting providers reuse their cached prefill for it.
+        """
+        return f"""You are an expert code reviewer. Please review the git commit given at the end of this message and provide feedback.
 
-        criteria_list = '\n'.join(f"{i+1}. {criterion.title()}" for i, criterion in enumerate(self.config.review_criteria))
-        
-        # Prepare the complete repository content
-        repository_content = []
-        for file_data in files_data:
-            repository_content.append(f"=== FILE: {file_data['path']} ===")
-            repository_content.append(file_data['content'])
-            repository_content.append("=== END FILE ===\n")
-        
-        full_repo_text = "\n".join(repository_content)
-        
-        base_prompt = f"""You are a senior software architect conducting a comprehensive repository analysis. Please review the entire repository and provide detailed feedback.
+Please analyze the commit and provide a structured review focusing on:
+{self._criteria_block}{self._review_citation_note}
+
+Format your response as JSON with this structure:
+{self._review_schema_block}
+
+Be constructive, specific, and provide actionable feedback. Focus on the most impactful improvements.
 
-Repository: {repo_info}
-Total Files: {len(files_data)}
+IMPORTANT: Respond ONLY with valid JSON. Do not wrap your response in markdown code blocks or add any explanation outside the JSON.
 
-Complete Repository Content:
-{full_repo_text}
+"""
+
+    def _build_prompt(self, diff: str, commit: CommitInfo) -> str:
+        commit_details_for_prompt = CommitDetails(
+            hash=commit.hash,
+            message=commit.message,
+            author=f"{commit.author_name} <{commit.author_email}>",
+            date=commit.date.isoformat()
+        )
+
+        # Dynamic commit data goes strictly after the static prefix
+        return f"""{self._review_prefix}Commit Message: {commit_details_for_prompt['message']}
+Author: {commit_details_for_prompt['author']}
+Date: {commit_details_for_prompt['date']}
+
+Code Changes:
+{diff}"""
+
+    def _build_marshalled_review_prompt_prefix(self) -> str:
+        """Builds the static instructions for reviewing several small commits in one request."""
+        return f"""You are an expert code reviewer. Please review each of the numbered git commits given at the end of this message and provide separate feedback for every commit.
+
+Please analyze each commit on its own and provide a structured review focusing on:
+{self._criteria_block}{self._review_citation_note}
+
+Format your response as a JSON object with a "reviews" list holding exactly one entry per commit. Each entry has an "index" field with the commit number plus the fields of this structure:
+{self._review_schema_block}
+
+Be constructive, specific, and provide actionable feedback. Focus on the most impactful improvements.
+
+IMPORTANT: Respond ONLY with valid JSON. Do not wrap your response in markdown code blocks or add any explanation outside the JSON.
+
+"""
+
+    def _build_marshalled_prompt(self, batch: List[Tuple[str, CommitInfo]]) -> str:
+        buf = io.StringIO()
+        buf.write(self._marshalled_review_prefix)
+        for index, (diff, commit) in enumerate(batch):
+            buf.write(f"=== COMMIT {index} ===\n")
+            buf.write(f"Commit Message: {commit.message}\n")
+            buf.write(f"Author: {commit.author_name} <{commit.author_email}>\n")
+            buf.write(f"Date: {commit.date.isoformat()}\n\n")
+            buf.write("Code Changes:\n")
+            buf.write(diff)
+            buf.write(f"\n=== END COMMIT {index} ===\n\n")
+        return buf.getvalue()
+
+    def _build_repository_prompt_prefix(self) -> str:
+        """Builds the static instructions that open every repository review prompt (see `_build_review_prompt_prefix`)."""
+        return f"""You are a senior software architect conducting a comprehensive repository analysis. Please review the entire repository given at the end of this message and provide detailed feedback.
 
 Please analyze this entire repository and provide a structured review focusing on:
-{criteria_list}
+{self._criteria_block}
 VERY IMPORTANT: Security Assessment (potential backdoors, vulnerabilities, insecure practices)
 Architecture and Design Patterns
 Code Quality and Consistency
-Dependencies and Third-party Risk
-
-{"Provide citations for security recommendations and architectural guidance." if self.enable_citations else ""}
+Dependencies and Third-party Risk{self._repository_citation_note}
 
 Format your response as JSON with this structure:
 {{
@@ -182,136 +419,261 @@ Format your response as JSON with this structure:
   "architectural_strengths": ["<what the repository does well>"],
   "critical_issues": ["<urgent issues that need immediate attention>"],
   "improvement_opportunities": ["<areas for enhancement>"],
-  "compliance_considerations": ["<any compliance or regulatory considerations>"],
-  {citation_sources_field}
+  "compliance_considerations": ["<any compliance or regulatory considerations>"],{self._citation_sources_field}
   "confidence": "<number 1-10 indicating confidence in the assessment>"
 }}
 
-Provide a thorough, professional analysis that considers the repository as a complete system. Focus on security, architecture, and overall code quality."""
-        
-        return base_prompt + "\n\nIMPORTANT: Respond ONLY with valid JSON. Do not wrap your response in markdown code blocks or add any explanation outside the JSON."
-
-    async def _call_llm_with_litellm(self, prompt: str) -> str:
-        litellm_model_name = self.model
-        api_key = self.config.api_key.strip()
-
-        messages = [
-            {"role": "system", "content": "You are a senior software engineer providing code reviews. You MUST respond with valid JSON only. No markdown formatting, no code blocks, no explanations outside JSON. Be thorough and constructive in your analysis."},
-            {"role": "user", "content": prompt}
-        ]
-
-        litellm_kwargs = self._prepare_litellm_kwargs()
-
-        response = await litellm.acompletion(
-            model=litellm_model_name,
-            api_key=api_key,
-            messages=messages,
-            max_tokens=self.config.max_tokens or 4000,
-            temperature=0.1,
-            top_p=0.99,
-            **litellm_kwargs
-        )
-        return response.choices[0].message.content
+Provide a thorough, professional analysis that considers the repository as a complete system. Focus on security, architecture, and overall code quality.
+
+IMPORTANT: Respond ONLY with valid JSON. Do not wrap your response in markdown code blocks or add any explanation outside the JSON.
+
+"""
+
+    def _build_repository_review_prompt(self, files_data: List[FileDetails], repo_info: str) -> str:
+        # Write the prompt straight into one buffer so the repository text is never held twice
+        buf = io.StringIO()
+        buf.write(self._repository_prefix)
+        buf.write(f"Repository: {repo_info}\nTotal Files: {len(files_data)}\n\nComplete Repository Content:\n")
+        _write_file_blocks(buf, files_data)
+        return buf.getvalue()
+
+    def _build_chunk_summary_prompt_prefix(self) -> str:
+        """Builds the static instructions for summarizing one chunk of a repository that is too large for a single prompt."""
+        return f"""You are a senior software architect. The files given at the end of this message are one part of a larger repository. Summarize them as compact notes that another reviewer will combine into a full repository assessment.
+
+Focus on:
+{self._criteria_block}
+VERY IMPORTANT: Security Assessment (potential backdoors, vulnerabilities, insecure practices)
+
+Format your response as JSON with this structure:
+{{
+  "files": [
+    {{
+      "path": "<file path>",
+      "purpose": "<one sentence on what the file does>",
+      "security_concerns": ["<suspicious patterns, vulnerabilities or insecure practices>"],
+      "quality_notes": ["<notable strengths or problems>"],
+      "dependencies": ["<third-party packages or services used>"]
+    }}
+  ],
+  "patterns_used": ["<design patterns identified>"],
+  "critical_issues": ["<urgent issues found in these files>"]
+}}
+
+Keep every entry short and concrete.
+
+IMPORTANT: Respond ONLY with valid JSON. Do not wrap your response in markdown code blocks or add any explanation outside the JSON.
+
+"""
+
+    def _chunk_repository_files(self, files_data: List[FileDetails]) -> List[List[FileDetails]]:
+        chunk_limit = self.config.repository_chunk_chars
+        chunks: List[List[FileDetails]] = []
+        current: List[FileDetails] = []
+        current_size = 0
+        for file_data in files_data:
+            file_size = len(file_data.content)
+            if current and current_size + file_size > chunk_limit:
+                chunks.append(current)
+                current, current_size = [], 0
+            current.append(file_data)
+            current_size += file_size
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _build_chunk_summary_prompt(self, files_data: List[FileDetails], repo_info: str) -> str:
+        buf = io.StringIO()
+        buf.write(self._chunk_summary_prefix)
+        buf.write(f"Repository: {repo_info}\nFiles in this part: {len(files_data)}\n\n")
+        _write_file_blocks(buf, files_data)
+        return buf.getvalue()
+
+    def _build_repository_reduce_prompt(self, chunk_summaries: List[Any], repo_info: str, total_files: int) -> str:
+        buf = io.StringIO()
+        buf.write(self._repository_prefix)
+        buf.write(f"Repository: {repo_info}\nTotal Files: {total_files}\n\n")
+        buf.write("The repository was too large for a single prompt, so it was reviewed in parts. "
+                  "Base your assessment on these notes, which together cover every file:\n")
+        for i, summary in enumerate(chunk_summaries):
+            buf.write(f"=== PART {i + 1} ===\n")
+            buf.write(json.dumps(summary, separators=(',', ':')))
+            buf.write("\n=== END PART ===\n\n")
+        return buf.getvalue()
+
+    def _build_user_message(self, prompt: str, cache_prefix: Optional[str]) -> Dict[str, Any]:
+        # Anthropic only caches content explicitly marked with cache_control, so split the
+        # static prefix into its own block; other providers cache matching prefixes automatically.
+        if self.provider == AIProvider.ANTHROPIC and cache_prefix and prompt.startswith(cache_prefix):
+            return {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": cache_prefix, "cache_control": {"type": "ephemeral"}},
+                    {"type": "text", "text": prompt[len(cache_prefix):]}
+                ]
+            }
+        return {"role": "user", "content": prompt}
+
+    async def _call_llm_with_litellm(self, prompt: str, cache_prefix: Optional[str] = None) -> str:
+        messages = [self._system_message, self._build_user_message(prompt, cache_prefix)]
+
+        self._get_http_client()
+        if self._rate_limiter:
+            await self._rate_limiter.acquire()
+
+        response = await litellm.acompletion(messages=messages, **self._litellm_kwargs)
+        if not self.config.enable_streaming:
+            return response.choices[0].message.content
+        return await self._collect_streamed_response(response)
+
+    @staticmethod
+    async def _collect_streamed_response(stream) -> str:
+        """Reads a streamed completion, stopping as soon as the JSON object it carries is complete."""
+        scanner = _JSONObjectScanner()
+        try:
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content and scanner.feed(content):
+                    break
+        finally:
+            close = getattr(stream, "aclose", None)
+            if close is not None:
+                await close()
+        if not scanner.text:
+            raise ReviewGenerationError("AI response stream ended without any content.")
+        return scanner.payload
 
     @staticmethod
     def _parse_response(response_text: str) -> AIReviewResponse:
         try:
-            cleaned_response = response_text.strip()
-            
-            # Try to extract JSON from markdown code blocks first
-            markdown_json_match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", cleaned_response, re.DOTALL)
-            if markdown_json_match:
-                cleaned_response = markdown_json_match.group(1)
-            
-            # Look for JSON object boundaries
-            json_match = re.search(r"\{[\s\S]*\}", cleaned_response)
-            if json_match:
-                json_content = json_match.group(0)
-                try:
-                    parsed_json = json.loads(json_content)
-                except json.JSONDecodeError:
-                    # Try to fix common JSON issues
-                    json_content = json_content.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                    # Remove any trailing commas before closing braces/brackets
-                    json_content = re.sub(r',(\s*[}\]])', r'\1', json_content)
-                    parsed_json = json.loads(json_content)
-            else:
-                # Last resort: try parsing the entire cleaned response
-                parsed_json = json.loads(cleaned_response)
-            
-            # Basic validation to ensure it's somewhat like AIReviewResponse
-            if not isinstance(parsed_json, dict) or "score" not in parsed_json or "summary" not in parsed_json:
-                raise ReviewParsingError(f"Parsed JSON does not match expected AIReviewResponse structure. Keys found: {list(parsed_json.keys()) if isinstance(parsed_json, dict) else 'Not a dict'}. Response: {response_text[:200]}...")
-            
-            # Ensure required fields exist with defaults
-            parsed_json.setdefault('issues', [])
-            parsed_json.setdefault('suggestions', [])
-            parsed_json.setdefault('confidence', 5)
-
-            # Ensure numeric fields are properly converted from strings if needed
-            if 'score' in parsed_json and isinstance(parsed_json['score'], str):
-                try:
-                    parsed_json['score'] = int(parsed_json['score'])
-                except (ValueError, TypeError):
-                    parsed_json['score'] = 7  # Default fallback
-            
-            if 'confidence' in parsed_json and isinstance(parsed_json['confidence'], str):
-                try:
-                    parsed_json['confidence'] = int(parsed_json['confidence'])
-                except (ValueError, TypeError):
-                    parsed_json['confidence'] = 5  # Default fallback
-
-            return AIReviewResponse(**parsed_json)
+            return AIReviewer._coerce_review(_extract_json_payload(response_text), response_text)
         except json.JSONDecodeError as e:
             raise ReviewParsingError(f"Failed to parse AI response as JSON: {e}. Response: {response_text[:200]}...") from e
         except Exception as e:
             raise ReviewParsingError(f"Unexpected error parsing AI response: {e}. Response: {response_text[:200]}...") from e
 
+    @staticmethod
+    def _coerce_review(parsed_json: Any, response_text: str) -> AIReviewResponse:
+        # Basic validation to ensure it's somewhat like AIReviewResponse
+        if not isinstance(parsed_json, dict) or "score" not in parsed_json or "summary" not in parsed_json:
+            raise ReviewParsingError(f"Parsed JSON does not match expected AIReviewResponse structure. Keys found: {list(parsed_json.keys()) if isinstance(parsed_json, dict) else 'Not a dict'}. Response: {response_text[:200]}...")
+        
+        # Ensure required fields exist with defaults
+        parsed_json.setdefault('issues', [])
+        parsed_json.setdefault('suggestions', [])
+        parsed_json.setdefault('confidence', 5)
+
+        # Ensure numeric fields are properly converted from strings if needed
+        if 'score' in parsed_json and isinstance(parsed_json['score'], str):
+            try:
+                parsed_json['score'] = int(parsed_json['score'])
+            except (ValueError, TypeError):
+                parsed_json['score'] = 7  # Default fallback
+        
+        if 'confidence' in parsed_json and isinstance(parsed_json['confidence'], str):
+            try:
+                parsed_json['confidence'] = int(parsed_json['confidence'])
+            except (ValueError, TypeError):
+                parsed_json['confidence'] = 5  # Default fallback
+
+        return AIReviewResponse(**parsed_json)
+
+    @staticmethod
+    def _parse_marshalled_response(response_text: str, expected: int) -> Dict[int, AIReviewResponse]:
+        """Parses a multi-commit response into reviews keyed by commit index, skipping malformed entries."""
+        try:
+            parsed_json = _extract_json_payload(response_text)
+        except json.JSONDecodeError as e:
+            raise ReviewParsingError(f"Failed to parse AI response as JSON: {e}. Response: {response_text[:200]}...") from e
+
+        entries = parsed_json.get('reviews') if isinstance(parsed_json, dict) else parsed_json
+        if not isinstance(entries, list):
+            raise ReviewParsingError(f"Batched AI response has no reviews list. Response: {response_text[:200]}...")
+
+        reviews: Dict[int, AIReviewResponse] = {}
+        for position, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                continue
+            index = entry.pop('index', position)
+            try:
+                index = int(index)
+                review = AIReviewer._coerce_review(entry, response_text)
+            except (ValueError, TypeError, ReviewParsingError):
+                continue
+            if 0 <= index < expected:
+                reviews[index] = review
+        return reviews
+
     @staticmethod
     def _parse_repository_summary_response(response_text: str) -> RepositorySummaryResponse:
         try:
-            cleaned_response = response_text.strip()
-            
-            # Try to extract JSON from Markdown code blocks first
-            markdown_json_match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", cleaned_response, re.DOTALL)
-            if markdown_json_match:
-                cleaned_response = markdown_json_match.group(1)
-            
-            # Look for JSON object boundaries
-            json_match = re.search(r"\{[\s\S]*\}", cleaned_response)
-            if json_match:
-                json_content = json_match.group(0)
-                try:
-                    return RepositorySummaryResponse(**json.loads(json_content))
-                except json.JSONDecodeError:
-                    # Try to fix common JSON issues
-                    json_content = json_content.replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t')
-                    json_content = re.sub(r',(\s*[}\]])', r'\1', json_content)
-                    return RepositorySummaryResponse(**json.loads(json_content))
-            else:
-                return RepositorySummaryResponse(**json.loads(cleaned_response))
+            return RepositorySummaryResponse(**_extract_json_payload(response_text))
         except Exception as e:
             raise ReviewParsingError(f"Failed to parse repository summary response: {e}. Response: {response_text[:200]}...") from e
 
+    @staticmethod
+    def _parse_chunk_summary_response(response_text: str) -> Any:
+        try:
+            return _extract_json_payload(response_text)
+        except Exception as e:
+            raise ReviewParsingError(f"Failed to parse repository chunk summary: {e}. Response: {response_text[:200]}...") from e
+
+    async def _complete_and_parse(self, prompt: str, cache_prefix: str, parse: Callable[[str], Any]) -> Any:
+        """Sends a prompt and parses the reply, reusing earlier results for identical prompts.
+
+        Concurrent requests for the same prompt share one in-flight LLM call. Only successfully
+        parsed results are cached, so a retry after a malformed reply asks the model again.
+        """
+        key = hashlib.blake2b(f"{self.model}\0{prompt}".encode(), digest_size=16).hexdigest()
+        if key in self._response_cache:
+            self._response_cache.move_to_end(key)
+            return copy.deepcopy(self._response_cache[key])
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_parse(key, prompt, cache_prefix, parse))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield the shared call so one cancelled caller does not cancel it for the others
+        return copy.deepcopy(await asyncio.shield(task))
+
+    async def _fetch_and_parse(self, key: str, prompt: str, cache_prefix: str, parse: Callable[[str], Any]) -> Any:
+        result = parse(await self._call_llm_with_litellm(prompt, cache_prefix=cache_prefix))
+        if self.config.response_cache_size > 0:
+            self._response_cache[key] = result
+            if len(self._response_cache) > self.config.response_cache_size:
+                self._response_cache.popitem(last=False)
+        return result
+
     async def review_code(self, diff: str, commit: CommitInfo) -> AIReviewResponse:
         prompt = self._build_prompt(diff, commit)
         
         try:
-            raw_response_text = await self._call_llm_with_litellm(prompt)
-            parsed_response = AIReviewer._parse_response(raw_response_text)
-            return parsed_response
+            return await self._complete_and_parse(prompt, self._review_prefix, AIReviewer._parse_response)
         except ReviewParsingError as e:
             raise
         except Exception as e:
-            raise ReviewGenerationError(f"Failed to get review from AI for commit {commit['hash']}: {e}") from e
+            raise ReviewGenerationError(f"Failed to get review from AI for commit {commit.hash}: {e}") from e
+
+    async def _summarize_repository_chunk(self, files_data: List[FileDetails], repo_info: str) -> Any:
+        prompt = self._build_chunk_summary_prompt(files_data, repo_info)
+        return await self._complete_and_parse(prompt, self._chunk_summary_prefix, AIReviewer._parse_chunk_summary_response)
 
     async def review_entire_repository(self, files_data: List[FileDetails], repo_info: str) -> RepositorySummaryResponse:
-        prompt = self._build_repository_review_prompt(files_data, repo_info)
+        chunks = self._chunk_repository_files(files_data)
         
         try:
-            raw_response_text = await self._call_llm_with_litellm(prompt)
-            parsed_response = AIReviewer._parse_repository_summary_response(raw_response_text)
-            return parsed_response
+            if len(chunks) > 1:
+                # Map: summarize each chunk concurrently; reduce: one call turns the notes into the final report
+                chunk_summaries = await asyncio.gather(
+                    *(self._gated(self._summarize_repository_chunk, chunk, repo_info) for chunk in chunks)
+                )
+                prompt = self._build_repository_reduce_prompt(chunk_summaries, repo_info, len(files_data))
+            else:
+                prompt = self._build_repository_review_prompt(files_data, repo_info)
+            return await self._complete_and_parse(prompt, self._repository_prefix, AIReviewer._parse_repository_summary_response)
         except Exception as e:
             raise ReviewGenerationError(f"Failed to get repository review from AI: {e}") from e
 
@@ -324,10 +686,10 @@ Provide a thorough, professional analysis that considers the repository as a com
                 print(f"Repository review attempt {attempt + 1} failed: {e}")
                 if attempt == retries - 1:
                     print(f"All retry attempts failed for repository review. Using fallback.")
-                    continue
+                    return e
                 
-                delay = (2 ** attempt)
-                print(f"Retrying in {delay}s...")
+                delay = _retry_delay(attempt, e)
+                print(f"Retrying in {delay:.1f}s...")
                 await asyncio.sleep(delay)
         
         return Exception(f"Unexpected end of retry loop for repository review.")
@@ -340,14 +702,14 @@ Provide a thorough, professional analysis that considers the repository as a com
             except Exception as e:
                 print(f"Review attempt {attempt + 1} failed: {e}")
                 if attempt == retries - 1:
-                    print(f"All retry attempts failed for commit {commit['hash']}. Using fallback review.")
-                    continue
+                    print(f"All retry attempts failed for commit {commit.hash}. Using fallback review.")
+                    return e
                 
-                delay = (2 ** attempt)
-                print(f"Retrying in {delay}s...")
+                delay = _retry_delay(attempt, e)
+                print(f"Retrying in {delay:.1f}s...")
                 await asyncio.sleep(delay)
         
-        return Exception(f"Unexpected end of retry loop for commit {commit['hash']}. Using fallback review.")
+        return Exception(f"Unexpected end of retry loop for commit {commit.hash}. Using fallback review.")
 
     async def review_file_content_with_retry(self, file_content: str, file_path: str, max_retries: Optional[int] = None) -> AIReviewResponse | Exception:
         retries = max_retries if max_retries is not None else self.config.retry_attempts
@@ -358,13 +720,63 @@ Provide a thorough, professional analysis that considers the repository as a com
                 print(f"Review attempt {attempt + 1} for file {file_path} failed: {e}")
                 if attempt == retries - 1:
                     print(f"All retry attempts failed for file {file_path}. Using fallback review.")
-                    continue
+                    return e
                 
-                delay = (2 ** attempt)
-                print(f"Retrying in {delay}s...")
+                delay = _retry_delay(attempt, e)
+                print(f"Retrying in {delay:.1f}s...")
                 await asyncio.sleep(delay)
         return Exception(f"Unexpected end of retry loop for file {file_path}. Using fallback review.")
 
+    async def _gated(self, coro_fn, *args):
+        async with self._semaphore:
+            return await coro_fn(*args)
+
+    def _pack_commit_batches(self, diffs: List[str]) -> List[List[int]]:
+        """Greedily groups small commits (by estimated token count) so several can share one request."""
+        max_per_batch = self.config.batch_size
+        token_budget = self.config.marshal_token_budget
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        for i, diff in enumerate(diffs):
+            # Rough estimate; providers average about four characters per token for code
+            diff_tokens = len(diff) // 4
+            if max_per_batch <= 1 or diff_tokens > token_budget:
+                batches.append([i])
+                continue
+            if current and (len(current) >= max_per_batch or current_tokens + diff_tokens > token_budget):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += diff_tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    async def _review_commits_marshalled(self, batch: List[Tuple[str, CommitInfo]]) -> List[Union[AIReviewResponse, Exception]]:
+        if len(batch) == 1:
+            diff, commit = batch[0]
+            return [await self.review_code_with_retry(diff, commit)]
+
+        reviews: Dict[int, AIReviewResponse] = {}
+        try:
+            reviews = await self._complete_and_parse(
+                self._build_marshalled_prompt(batch),
+                self._marshalled_review_prefix,
+                lambda text: AIReviewer._parse_marshalled_response(text, len(batch))
+            )
+        except Exception as e:
+            print(f"Batched review of {len(batch)} commits failed: {e}. Reviewing them individually.")
+
+        # Any commit the batched response did not cover goes through the per-commit path
+        results: List[Union[AIReviewResponse, Exception]] = []
+        for index, (diff, commit) in enumerate(batch):
+            if index in reviews:
+                results.append(reviews[index])
+            else:
+                results.append(await self.review_code_with_retry(diff, commit))
+        return results
+
     async def review_multiple_commits(self, commits: List[CommitInfo], diffs: List[str]) -> List[Union[AIReviewResponse, Exception]]:
         if not self.config.enable_batch_processing:
             reviews: List[AIReviewResponse] = []
@@ -373,33 +785,38 @@ Provide a thorough, professional analysis that considers the repository as a com
                 reviews.append(review)
             return reviews
 
+        batches = self._pack_commit_batches(diffs)
         tasks = []
-        for i, commit_info in enumerate(commits):
-            tasks.append(self.review_code_with_retry(diffs[i], commit_info))
+        for batch in batches:
+            tasks.append(self._gated(self._review_commits_marshalled, [(diffs[i], commits[i]) for i in batch]))
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        batch_results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        processed_results = []
-        for i, res in enumerate(results):
-            if isinstance(res, Exception):
-                print(f"Error reviewing commit {commits[i]['hash']}: {res}")
-                processed_results.append(res)
+        results_by_index: Dict[int, Union[AIReviewResponse, Exception]] = {}
+        for batch, res in zip(batches, batch_results):
+            if isinstance(res, BaseException):
+                # A cancelled batch comes back as CancelledError, which is not an Exception
+                error = res if isinstance(res, Exception) else ReviewGenerationError("Review was cancelled.")
+                for i in batch:
+                    print(f"Error reviewing commit {commits[i].hash}: {error}")
+                    results_by_index[i] = error
             else:
-                processed_results.append(res)
-        return processed_results
+                for i, review in zip(batch, res):
+                    results_by_index[i] = review
+        return [results_by_index[i] for i in range(len(commits))]
 
     async def review_multiple_files(self, files_data: List[FileDetails]) -> List[Union[AIReviewResponse, Exception]]:
         # files_data is a list of dicts, each with "path" and "content"
         if not self.config.enable_batch_processing:
             reviews: List[Union[AIReviewResponse, Exception]] = []
             for file_data in files_data:
-                review = await self.review_file_content_with_retry(file_data["content"], file_data["path"])
+                review = await self.review_file_content_with_retry(file_data.content, file_data.path)
                 reviews.append(review)
             return reviews
 
         tasks = []
         for file_data in files_data:
-            tasks.append(self.review_file_content_with_retry(file_data["content"], file_data["path"]))
+            tasks.append(self._gated(self.review_file_content_with_retry, file_data.content, file_data.path))
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         return results
\ No newline at end of file
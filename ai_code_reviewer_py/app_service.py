@@ -1,31 +1,97 @@
 from pathlib import Path
-import json
+import asyncio
+import glob
+import heapq
+import os
+import tempfile
 
 import re
 from datetime import datetime
-from typing import Optional, List, Union
+from typing import AsyncIterator, Callable, Optional, List, Tuple, Union
 from rich.console import Console
 from rich.padding import Padding
 
+from ai_code_reviewer_py import json_utils
 from ai_code_reviewer_py.config_models import AppConfig
 from ai_code_reviewer_py.git_analyzer import GitAnalyzer, CommitInfo
 from ai_code_reviewer_py.ai_reviewer import AIReviewer
-from ai_code_reviewer_py.constants import GLOBAL_CONFIG_FILE, GLOBAL_CONFIG_DIR
+from ai_code_reviewer_py.constants import SUMMARY_CACHE_FILENAME
 from ai_code_reviewer_py.enums import IssueSeverity
 from ai_code_reviewer_py.models import AIReviewResponse, FileDetails, RepositorySummaryResponse
 
-from pydantic import ValidationError
+_REVIEW_HEADER_RE = re.compile(
+    r"\*\*Date:\*\* (?P<date>.*?)\n.*?- \*\*Score:\*\* (?P<score>\d+)/10.*?- \*\*Summary:\*\* (?P<summary>.*?)\n",
+    re.DOTALL
+)
+REVIEW_HEADER_READ_SIZE = 8192
+_SEVERITY_EMOJI = {
+    IssueSeverity.CRITICAL.value: '🚨',
+    IssueSeverity.HIGH.value: '🔥',
+    IssueSeverity.MEDIUM.value: '⚡',
+    IssueSeverity.LOW.value: 'ℹ️',
+}
+_RISK_EMOJI = {'low': '🟢', 'medium': '🟡', 'high': '🟠', 'critical': '🔴'}
+# Everything str.isalnum() rejects (\w also admits '_'), except spaces and hyphens
+_FILENAME_UNSAFE_RE = re.compile(r"(?:[^\w -]|_)+")
+_PATH_RESERVED_RE = re.compile(r'[<>:"/\\|?*]')
+
+def _compile_globs(patterns: List[str]) -> Optional[re.Pattern]:
+    """Compiles glob patterns into one regex with the same semantics as `Path.full_match`."""
+    if not patterns:
+        return None
+    return re.compile("|".join(
+        f"(?:{glob.translate(pattern, recursive=True, include_hidden=True)})" for pattern in patterns
+    ))
 
 class AppService:
     def __init__(self, config: AppConfig):
         self.config = config
-        self.git_analyzer = GitAnalyzer()
+        self.git_analyzer = GitAnalyzer(diff_cache_size=config.diff_cache_size)
         self.ai_reviewer = AIReviewer(config)
         self.console = Console()
+        self._prewarm_task: Optional[asyncio.Task] = None
+        self._created_output_dir: Optional[Path] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._prewarm_task is not None and not self._prewarm_task.done():
+            self._prewarm_task.cancel()
+        await self.ai_reviewer.aclose()
+
+    def start_prewarm(self):
+        """Starts warming provider connections in the background while git data is collected."""
+        if self.config.enable_connection_prewarm and self._prewarm_task is None:
+            self._prewarm_task = asyncio.create_task(self.ai_reviewer.prewarm())
+
+    async def _iter_diffs(self, commits: List[CommitInfo]) -> AsyncIterator[Tuple[int, str]]:
+        """Yields `(index, diff)` pairs as soon as each diff is fetched, at most `diff_concurrency` git processes at a time."""
+        semaphore = asyncio.Semaphore(self.config.diff_concurrency)
+
+        async def fetch(index: int, commit: CommitInfo) -> Tuple[int, str]:
+            async with semaphore:
+                return index, await asyncio.to_thread(self.git_analyzer.get_commit_diff, commit.hash)
+
+        fetch_tasks = [asyncio.create_task(fetch(i, c)) for i, c in enumerate(commits)]
+        try:
+            for next_diff in asyncio.as_completed(fetch_tasks):
+                yield await next_diff
+        finally:
+            # After a failed fetch, stop the queued ones from starting more git processes
+            for task in fetch_tasks:
+                task.cancel()
+            await asyncio.gather(*fetch_tasks, return_exceptions=True)
+
+    async def _review_commit_group(
+        self, commits: List[CommitInfo], diffs: List[str], indices: List[int]
+    ) -> Tuple[List[int], List[Union[AIReviewResponse, Exception]]]:
+        results = await self.ai_reviewer.review_multiple_commits([commits[i] for i in indices], [diffs[i] for i in indices])
+        return indices, results
 
     async def review_commits_in_range(self, commit_range: str):
         self.console.print(f"🔍 Analyzing commits in range: [cyan]{commit_range}[/cyan]...")
-        commits = self.git_analyzer.get_commits(commit_range)
+        commits = await asyncio.to_thread(self.git_analyzer.get_commits, commit_range)
 
         if not commits:
             self.console.print("[yellow]No commits found to review.[/yellow]")
@@ -33,20 +99,41 @@ class AppService:
 
         self.console.print(f"Found {len(commits)} commit(s) to review.")
 
-        diffs = [self.git_analyzer.get_commit_diff(c['hash']) for c in commits]
-        
-        review_results_or_errors = await self.ai_reviewer.review_multiple_commits(commits, diffs)
-
-        for i, result_or_error in enumerate(review_results_or_errors):
-            commit_info = commits[i]
-            current_diff = diffs[i]
-            self.console.rule(f"[bold blue]Reviewing commit: {commit_info['hash'][:8]} - {commit_info['message']}[/bold blue]")
-            if isinstance(result_or_error, Exception):
-                self.console.print(f"[bold red]❌ Review Failed for commit {commit_info['hash'][:8]}: {result_or_error}[/bold red]")
-            else:
-                self._display_review_to_console(result_or_error)
-                if self.config.save_to_markdown:
-                    self._save_commit_review_to_markdown(result_or_error, commit_info, current_diff)
+        # Reviews start as soon as a batch worth of diffs is in, instead of waiting for every diff;
+        # without batch processing the reviews stay sequential, so they still get all diffs in one call
+        group_size = max(1, self.config.batch_size) if self.config.enable_batch_processing else len(commits)
+        diffs: List[str] = [""] * len(commits)
+        review_tasks: List[asyncio.Task] = []
+        group: List[int] = []
+        try:
+            async for index, diff in self._iter_diffs(commits):
+                diffs[index] = diff
+                group.append(index)
+                if len(group) >= group_size:
+                    review_tasks.append(asyncio.create_task(self._review_commit_group(commits, diffs, group)))
+                    group = []
+        except BaseException:
+            # A diff failed after some reviews started; stop them rather than leave paid calls running unobserved
+            for task in review_tasks:
+                task.cancel()
+            await asyncio.gather(*review_tasks, return_exceptions=True)
+            raise
+        if group:
+            review_tasks.append(asyncio.create_task(self._review_commit_group(commits, diffs, group)))
+
+        for next_group in asyncio.as_completed(review_tasks):
+            indices, review_results_or_errors = await next_group
+            for i, result_or_error in zip(indices, review_results_or_errors):
+                await self._report_commit_review(commits[i], diffs[i], result_or_error)
+
+    async def _report_commit_review(self, commit_info: CommitInfo, current_diff: str, result_or_error: Union[AIReviewResponse, Exception]):
+        self.console.rule(f"[bold blue]Reviewing commit: {commit_info.hash[:8]} - {commit_info.message}[/bold blue]")
+        if isinstance(result_or_error, Exception):
+            self.console.print(f"[bold red]❌ Review Failed for commit {commit_info.hash[:8]}: {result_or_error}[/bold red]")
+        else:
+            self._display_review_to_console(result_or_error)
+            if self.config.save_to_markdown:
+                await asyncio.to_thread(self._save_commit_review_to_markdown, result_or_error, commit_info, current_diff)
 
     def _print_review_details_to_console(self, review: AIReviewResponse):
         """Helper method to print common review details to the console."""
@@ -72,14 +159,7 @@ class AppService:
         if review['issues']:
             self.console.print("\n[bold red]⚠️ Issues Found:[/bold red]")
             for issue in review['issues']:
-                severity_emoji_map = {
-                    IssueSeverity.CRITICAL: '🚨',
-                    IssueSeverity.HIGH: '🔥',
-                    IssueSeverity.MEDIUM: '⚡',
-                    IssueSeverity.LOW: 'ℹ️',
-                }
-                severity_enum = next((s for s in IssueSeverity if s.value == issue['severity']), None)
-                severity_emoji = severity_emoji_map.get(severity_enum, '❓')
+                severity_emoji = _SEVERITY_EMOJI.get(issue['severity'], '❓')
                 self.console.print(Padding(
                     f"{severity_emoji} [bold magenta]{issue['severity'].upper()}:[/bold magenta] {issue['description']}\n"
                     f"   💡 [italic]Suggestion:[/italic] {issue['suggestion']}" +
@@ -109,216 +189,111 @@ class AppService:
 
     @staticmethod
     def _generate_markdown_filename(commit: CommitInfo) -> str:
-        timestamp = commit['date'].strftime("%Y%m%d-%H%M%S")
-        short_hash = commit['hash'][:8]
-        sanitized_message = "".join(c if c.isalnum() or c in " -" else "" for c in commit['message']).replace(" ", "-")[:50]
+        timestamp = commit.date.strftime("%Y%m%d-%H%M%S")
+        short_hash = commit.hash[:8]
+        sanitized_message = _FILENAME_UNSAFE_RE.sub("", commit.message).replace(" ", "-")[:50]
         return f"{timestamp}-{short_hash}-{sanitized_message}.md"
 
     @staticmethod
     def _generate_common_ai_review_markdown_section(review: AIReviewResponse) -> str:
         """Generates common AI review sections (summary, score, issues) for markdown."""
-        md_content = f"## AI Review Summary\n"
-        md_content += f"- **Score:** {review['score']}/10\n"
-        md_content += f"- **Confidence:** {review['confidence']}/10\n"
-        md_content += f"- **Summary:** {review['summary']}\n\n"
+        parts: List[str] = [
+            "## AI Review Summary\n",
+            f"- **Score:** {review['score']}/10\n",
+            f"- **Confidence:** {review['confidence']}/10\n",
+            f"- **Summary:** {review['summary']}\n\n",
+        ]
 
         if review['issues']:
-            md_content += "## Issues Found\n"
+            parts.append("## Issues Found\n")
             for issue in review['issues']:
-                md_content += f"- **[{issue['severity'].upper()}]** {issue['description']}\n"
-                md_content += f"  - Suggestion: {issue['suggestion']}\n"
+                parts.append(f"- **[{issue['severity'].upper()}]** {issue['description']}\n")
+                parts.append(f"  - Suggestion: {issue['suggestion']}\n")
                 if issue.get('citation'):
-                    md_content += f"  - Citation: {issue['citation']}\n"
-            md_content += "\n"
-        return md_content
+                    parts.append(f"  - Citation: {issue['citation']}\n")
+            parts.append("\n")
+        return "".join(parts)
 
     def _generate_markdown_content(self, review: AIReviewResponse, commit: CommitInfo, diff: str) -> str:
-        md_content = f"# Code Review for Commit {commit['hash'][:8]}\n\n"
-        md_content += f"**Message:** {commit['message']}\n"
-        md_content += f"**Author:** {commit['author_name']} <{commit['author_email']}>\n"
-        md_content += f"**Date:** {commit['date'].isoformat()}\n\n"
-        
-        md_content += AppService._generate_common_ai_review_markdown_section(review)
-        
+        parts: List[str] = [
+            f"# Code Review for Commit {commit.hash[:8]}\n\n",
+            f"**Message:** {commit.message}\n",
+            f"**Author:** {commit.author_name} <{commit.author_email}>\n",
+            f"**Date:** {commit.date.isoformat()}\n\n",
+            AppService._generate_common_ai_review_markdown_section(review),
+        ]
+
         if self.config.include_diff_in_markdown and diff:
-            md_content += "## Code Diff\n"
-            md_content += f"```diff\n{diff}\n```\n\n"
-        
-        return md_content
+            parts.append("## Code Diff\n")
+            parts.append(f"```diff\n{diff}\n```\n\n")
+
+        return "".join(parts)
+
+    def _ensure_output_dir(self) -> Path:
+        """Returns the markdown output directory, creating it on the first save of the session."""
+        output_dir_path = Path(self.config.markdown_output_dir)
+        if output_dir_path != self._created_output_dir:
+            output_dir_path.mkdir(parents=True, exist_ok=True)
+            self._created_output_dir = output_dir_path
+        return output_dir_path
 
     def _save_commit_review_to_markdown(self, review: AIReviewResponse, commit: CommitInfo, diff: str):
         filename = AppService._generate_markdown_filename(commit)
-        output_dir_path = Path(self.config.markdown_output_dir)
-        output_dir_path.mkdir(parents=True, exist_ok=True)
-        filepath = output_dir_path / filename
+        filepath = self._ensure_output_dir() / filename
 
         markdown_content = self._generate_markdown_content(review, commit, diff)
 
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(markdown_content)
+            # One pre-encoded write instead of a series of default-sized buffer flushes
+            filepath.write_bytes(markdown_content.encode("utf-8"))
             self.console.print(f"[green]💾 Review saved to: {filepath}[/green]")
         except Exception as e:
             self.console.print(f"[red]❌ Failed to save markdown file: {e}[/red]")
 
-    def _load_or_create_global_config_data(self) -> tuple[dict, bool]:
-        """
-        Loads global config data if it exists, otherwise returns default AppConfig data.
-        Returns a tuple of (config_data_dict, file_existed_boolean).
-        """
-        GLOBAL_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-
-        if GLOBAL_CONFIG_FILE.exists():
-            try:
-                with open(GLOBAL_CONFIG_FILE, "r", encoding="utf-8") as f:
-                    return json.load(f), True
-            except json.JSONDecodeError:
-                self.console.print(f"[yellow]⚠️ Warning: Global config file {GLOBAL_CONFIG_FILE} is corrupted. Using defaults.[/yellow]")
-            except Exception as e:
-                self.console.print(f"[yellow]⚠️ Warning: Error reading global config file {GLOBAL_CONFIG_FILE}: {e}. Using defaults.[/yellow]")
-
-        default_config_instance = AppConfig()
-        return default_config_instance.model_dump(mode="json", by_alias=True, exclude_none=True), False
-
-    @staticmethod
-    def _is_sensitive_key(key: str) -> bool:
-        """Check if a configuration key contains sensitive information that should be masked."""
-        sensitive_keys = ['api_key', 'key', 'token', 'secret', 'password']
-        key_lower = key.lower()
-        return any(sensitive_word in key_lower for sensitive_word in sensitive_keys)
+    def _path_filter(self, include_patterns: List[str], exclude_patterns: List[str]) -> Callable[[str], bool]:
+        """Builds a predicate for paths to review.
 
-    @staticmethod
-    def _mask_sensitive_value(value: any) -> str:
-        """Mask sensitive values for display."""
-        return "***HIDDEN***" if value and str(value).strip() else "***EMPTY***"
-
-    @staticmethod
-    def _find_matching_field(key_to_set: str) -> Optional[str]:
-        """Find the actual field name that matches the user input."""
-        # Direct match
-        if key_to_set in AppConfig.model_fields:
-            return key_to_set
-        
-        # Check aliases
-        for field_name, field_info in AppConfig.model_fields.items():
-            if field_info.alias == key_to_set:
-                return field_name
-        
-        # Check partial matches (e.g., "provider" -> "ai_provider")
-        for field_name in AppConfig.model_fields:
-            if field_name.endswith(f"_{key_to_set}") or field_name.startswith(f"{key_to_set}_"):
-                return field_name
-        
-        return None
-
-    @staticmethod
-    def _get_valid_enum_values(field_name: str) -> Optional[List[str]]:
-        """Get valid enum values for a field if it's an enum type."""
-        field_info = AppConfig.model_fields.get(field_name)
-        if not field_info:
-            return None
-        
-        # Handle Optional[Enum] types
-        field_type = field_info.annotation
-        if hasattr(field_type, '__origin__') and field_type.__origin__ is Union:
-            # Extract non-None type from Optional
-            for arg in field_type.__args__:
-                if arg is not type(None):
-                    field_type = arg
-                    break
-        
-        # Check if it's an enum
-        if hasattr(field_type, '__members__'):
-            return [member.value for member in field_type.__members__.values()]
-        
-        return None
-
-    def set_global_config_value(self, key_to_set: str, value_str: str):
-        """
-        Sets a specific key-value pair in the global configuration file.
-        Creates the file with defaults if it doesn't exist, then applies the change.
-        The key should match a field name or alias in AppConfig.
+        A configured default exclude is lifted only by an include that names the excluded area itself,
+        e.g. `--include 'vendor/**'` for `**/vendor/**`; a broad include such as `**/*.py` still drops
+        vendored and generated files.
         """
-        config_data, file_existed = self._load_or_create_global_config_data()
-
-        target_field_name = self._find_matching_field(key_to_set)
-
-        if not target_field_name:
-            valid_keys = list(AppConfig.model_fields.keys())
-            self.console.print(f"❌ [bold red]Error: Configuration key '{key_to_set}' is not recognized.[/bold red]")
-            self.console.print(f"Valid configuration keys: {', '.join(valid_keys)}")
-            return
-
-        # Check if it's an enum field and validate the value
-        valid_enum_values = self._get_valid_enum_values(target_field_name)
-        if valid_enum_values and value_str not in valid_enum_values:
-            self.console.print(f"❌ [bold red]Error: Invalid value '{value_str}' for '{target_field_name}'.[/bold red]")
-            self.console.print(f"Valid values: {', '.join(valid_enum_values)}")
-            return
-
-        # Set the value
-        config_data[target_field_name] = value_str
-        
-        # Show helpful message if user used a close match
-        if key_to_set != target_field_name:
-            self.console.print(f"ℹ️ [cyan]Note: Using field name '{target_field_name}' for your input '{key_to_set}'.[/cyan]")
-
-        try:
-            validated_config_instance = AppConfig(**config_data)
-
-            data_to_save = validated_config_instance.model_dump(mode="json", by_alias=True, exclude_none=True)
-
-            with open(GLOBAL_CONFIG_FILE, "w", encoding="utf-8") as f:
-                json.dump(data_to_save, f, indent=2)
-
-            final_key_in_json = target_field_name if target_field_name else key_to_set
-            final_value_in_json = data_to_save.get(final_key_in_json)
-            
-            # Mask sensitive values in console output
-            if self._is_sensitive_key(final_key_in_json):
-                display_value = self._mask_sensitive_value(final_value_in_json)
-            else:
-                display_value = json.dumps(final_value_in_json)
-
-            if not file_existed:
-                self.console.print(f"✅ Global configuration file created at: [green]{GLOBAL_CONFIG_FILE}[/green]")
-            else:
-                self.console.print(f"✅ Global configuration file updated at: [green]{GLOBAL_CONFIG_FILE}[/green]")
-            
-            self.console.print(f"   Set [cyan]{final_key_in_json}[/cyan] to [yellow]{display_value}[/yellow].")
-
-        except ValidationError as e:
-            self.console.print(f"❌ [bold red]Error: The new value for '{key_to_set}' ('{value_str}') resulted in an invalid configuration:\n{e}[/bold red]")
-            self.console.print(f"   Your changes were not saved. Please provide a valid value.")
-        except Exception as e:
-            self.console.print(f"❌ [bold red]Error creating global configuration file at {GLOBAL_CONFIG_FILE}: {e}[/bold red]")
-            raise
-
-    def _filter_and_limit_file_data(
-        self,
-        all_files_data: List[FileDetails],
-        include_patterns: List[str],
-        exclude_patterns: List[str],
-        max_files: Optional[int],
-    ) -> List[FileDetails]:
-        filtered_files: List[FileDetails] = []
-        for file_data in all_files_data:
-            file_path = Path(file_data["path"])
-
-            if any(file_path.full_match(pattern) for pattern in exclude_patterns):
+        include_re = _compile_globs(include_patterns)
+        exclude_re = _compile_globs(exclude_patterns)
+        default_exclude_re = _compile_globs(self.config.default_exclude_patterns)
+        # Each default exclude paired with the includes that name its literal part (`vendor`, `_pb2.py`)
+        default_excludes: List[Tuple[re.Pattern, Optional[re.Pattern]]] = []
+        for pattern in self.config.default_exclude_patterns:
+            pattern_re = _compile_globs([pattern])
+            if pattern_re is None:
                 continue
-
-            if not include_patterns or any(file_path.full_match(pattern) for pattern in include_patterns):
-                filtered_files.append(file_data)
-
+            core = pattern.strip("*/")
+            overriding = [p for p in include_patterns if core and core in p]
+            default_excludes.append((pattern_re, _compile_globs(overriding)))
+
+        def accepts(path: str) -> bool:
+            if exclude_re and exclude_re.match(path):
+                return False
+            if include_re is not None and not include_re.match(path):
+                return False
+            if default_exclude_re and default_exclude_re.match(path):
+                return all(
+                    override_re is not None and override_re.match(path)
+                    for pattern_re, override_re in default_excludes
+                    if pattern_re.match(path)
+                )
+            return True
+
+        return accepts
+
+    def _limit_file_data(self, filtered_files: List[FileDetails], max_files: Optional[int]) -> List[FileDetails]:
         if max_files is not None and len(filtered_files) > max_files:
             self.console.print(
                 f"[yellow]Limiting to {max_files} files out of {len(filtered_files)} "
                 f"found after pattern filtering.[/yellow]"
             )
-            # Sort by path before slicing for deterministic output if limiting
-            filtered_files.sort(key=lambda fd: fd["path"])
-            return filtered_files[:max_files]
+            # The first max_files paths in order, without sorting the whole selection
+            return heapq.nsmallest(max_files, filtered_files, key=lambda fd: fd.path)
+        filtered_files.sort(key=lambda fd: fd.path)
         return filtered_files
 
     def _display_file_review_to_console(self, review: AIReviewResponse, file_path: str):
@@ -340,7 +315,7 @@ class AppService:
         security = summary.get('security_assessment', {})
         if security:
             risk_level = security.get('risk_level', 'unknown')
-            risk_emoji = {'low': '🟢', 'medium': '🟡', 'high': '🟠', 'critical': '🔴'}.get(risk_level, '❓')
+            risk_emoji = _RISK_EMOJI.get(risk_level, '❓')
             self.console.print(f"\n🔒 [bold red]Security Assessment:[/bold red] {risk_emoji} {risk_level.upper()} RISK")
             
             if security.get('potential_backdoors'):
@@ -386,46 +361,47 @@ class AppService:
         failed_reviews: int
     ) -> str:
         """Generate a repository summary markdown report."""
-        md_content = f"# Repository Analysis Summary\n\n"
-        md_content += f"**Repository:** {repo_info}\n"
-        md_content += f"**Reviewed on:** {datetime.now().isoformat()}\n"
-        md_content += f"**Total files reviewed:** {total_files}\n"
-        md_content += f"**Failed reviews:** {failed_reviews}\n"
-        md_content += f"**Overall Score:** {summary['overall_score']}/10\n"
-        md_content += f"**Confidence:** {summary['confidence']}/10\n\n"
-        
-        md_content += f"## Executive Summary\n{summary['executive_summary']}\n\n"
+        parts: List[str] = [
+            "# Repository Analysis Summary\n\n",
+            f"**Repository:** {repo_info}\n",
+            f"**Reviewed on:** {datetime.now().isoformat()}\n",
+            f"**Total files reviewed:** {total_files}\n",
+            f"**Failed reviews:** {failed_reviews}\n",
+            f"**Overall Score:** {summary['overall_score']}/10\n",
+            f"**Confidence:** {summary['confidence']}/10\n\n",
+            f"## Executive Summary\n{summary['executive_summary']}\n\n",
+        ]
         
         # Security Assessment
         security = summary.get('security_assessment', {})
         if security:
             risk_level = security.get('risk_level', 'unknown')
-            md_content += f"## 🔒 Security Assessment\n"
-            md_content += f"**Risk Level:** {risk_level.upper()}\n\n"
+            parts.append("## 🔒 Security Assessment\n")
+            parts.append(f"**Risk Level:** {risk_level.upper()}\n\n")
             
             if security.get('potential_backdoors'):
-                md_content += f"### Potential Security Concerns\n"
+                parts.append("### Potential Security Concerns\n")
                 for concern in security['potential_backdoors']:
-                    md_content += f"- {concern}\n"
-                md_content += "\n"
+                    parts.append(f"- {concern}\n")
+                parts.append("\n")
             
             if security.get('vulnerabilities_found'):
-                md_content += f"### Vulnerabilities Found\n"
+                parts.append("### Vulnerabilities Found\n")
                 for vuln in security['vulnerabilities_found']:
-                    md_content += f"- {vuln}\n"
-                md_content += "\n"
+                    parts.append(f"- {vuln}\n")
+                parts.append("\n")
         
         # Architecture Assessment
         arch = summary.get('architecture_assessment', {})
         if arch:
-            md_content += f"## 🏗️ Architecture Assessment\n"
+            parts.append("## 🏗️ Architecture Assessment\n")
             if arch.get('patterns_used'):
-                md_content += f"**Design Patterns:** {', '.join(arch['patterns_used'])}\n"
+                parts.append(f"**Design Patterns:** {', '.join(arch['patterns_used'])}\n")
             if arch.get('structure_quality'):
-                md_content += f"**Structure Quality:** {arch['structure_quality']}\n"
+                parts.append(f"**Structure Quality:** {arch['structure_quality']}\n")
             if arch.get('modularity_score'):
-                md_content += f"**Modularity Score:** {arch['modularity_score']}/10\n"
-            md_content += "\n"
+                parts.append(f"**Modularity Score:** {arch['modularity_score']}/10\n")
+            parts.append("\n")
         
         # Key sections
         sections = {
@@ -436,18 +412,18 @@ class AppService:
         
         for title, items in sections.items():
             if items:
-                md_content += f"## {title}\n"
+                parts.append(f"## {title}\n")
                 for item in items:
-                    md_content += f"- {item}\n"
-                md_content += "\n"
+                    parts.append(f"- {item}\n")
+                parts.append("\n")
         
         if summary.get('sources'):
-            md_content += f"## 📚 Sources Consulted\n"
+            parts.append("## 📚 Sources Consulted\n")
             for source in summary['sources']:
-                md_content += f"- {source}\n"
-            md_content += "\n"
+                parts.append(f"- {source}\n")
+            parts.append("\n")
         
-        return md_content
+        return "".join(parts)
 
     def _save_repository_summary_to_markdown(
         self, 
@@ -457,18 +433,16 @@ class AppService:
         failed_reviews: int = 0
     ):
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        sanitized_repo_info = re.sub(r'[<>:"/\\|?*]', '_', repo_info)
+        sanitized_repo_info = _PATH_RESERVED_RE.sub('_', repo_info)
         filename = f"repo-summary-{timestamp}-{sanitized_repo_info[:50]}.md"
         
-        output_dir_path = Path(self.config.markdown_output_dir)
-        output_dir_path.mkdir(parents=True, exist_ok=True)
-        filepath = output_dir_path / filename
+        filepath = self._ensure_output_dir() / filename
 
         markdown_content = self._generate_repository_summary_markdown_content(summary, repo_info, total_files, failed_reviews)
 
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(markdown_content)
+            # One pre-encoded write instead of a series of default-sized buffer flushes
+            filepath.write_bytes(markdown_content.encode("utf-8"))
             self.console.print(f"[green]💾 Repository summary saved to: {filepath}[/green]")
         except Exception as e:
             self.console.print(f"[red]❌ Failed to save markdown file: {e}[/red]")
@@ -497,7 +471,9 @@ class AppService:
             self._display_repository_summary_to_console(repo_summary, repo_info)
             
             if self.config.save_to_markdown:
-                self._save_repository_summary_to_markdown(repo_summary, repo_info, len(files_to_review), 0)
+                await asyncio.to_thread(
+                    self._save_repository_summary_to_markdown, repo_summary, repo_info, len(files_to_review), 0
+                )
         except Exception as e:
             self.console.print(f"[yellow]⚠️ Failed to analyze repository: {e}[/yellow]")
 
@@ -510,40 +486,37 @@ class AppService:
         self.console.print("🔍 Analyzing repository files...")
         
         repo_root = Path(self.git_analyzer.repo.working_dir)
-        all_tracked_files_paths_str = self.git_analyzer.get_tracked_files()
+        all_tracked_files_paths_str = await asyncio.to_thread(self.git_analyzer.get_tracked_files)
 
         if not all_tracked_files_paths_str:
             self.console.print("[yellow]No tracked files found in the repository.[/yellow]")
             return
 
-        selected_file_paths_str: List[str] = []
-        for file_path_str in all_tracked_files_paths_str:
+        selected_file_paths_str = list(filter(
+            self._path_filter(include_patterns, exclude_patterns), all_tracked_files_paths_str
+        ))
 
-            file_path_obj = Path(file_path_str)
-
-            if any(file_path_obj.full_match(pattern) for pattern in exclude_patterns):
-                continue
-
-            if not include_patterns or any(file_path_obj.full_match(pattern) for pattern in include_patterns):
-                selected_file_paths_str.append(file_path_str)
-
-        sorted_selected_file_paths_str = sorted(selected_file_paths_str)
-
-        if max_files is not None and len(sorted_selected_file_paths_str) > max_files:
+        if max_files is not None and len(selected_file_paths_str) > max_files:
             self.console.print(
-                f"[yellow]Limiting to {max_files} files out of {len(sorted_selected_file_paths_str)} found.[/yellow]"
+                f"[yellow]Limiting to {max_files} files out of {len(selected_file_paths_str)} found.[/yellow]"
             )
-            final_file_paths_to_review_str = sorted_selected_file_paths_str[:max_files]
+            final_file_paths_to_review_str = heapq.nsmallest(max_files, selected_file_paths_str)
         else:
-            final_file_paths_to_review_str = sorted_selected_file_paths_str
+            final_file_paths_to_review_str = sorted(selected_file_paths_str)
 
         if not final_file_paths_to_review_str:
             self.console.print("[yellow]No files found to review based on include/exclude patterns.[/yellow]")
             return
 
+        files_to_review = await asyncio.to_thread(
+            self.git_analyzer.read_tracked_files,
+            final_file_paths_to_review_str,
+            max_bytes=self.config.max_file_bytes,
+            truncate_bytes=self.config.truncate_file_bytes
+        )
+
         await self._review_file_details_list_and_report(
-            [{"path": fp_str, "content": (repo_root / fp_str).read_text(encoding='utf-8', errors='ignore')} 
-             for fp_str in final_file_paths_to_review_str],
+            files_to_review,
             "Reviewing file",
             f"Local Repository ({repo_root})"
         )
@@ -558,18 +531,20 @@ class AppService:
     ):
         self.console.print(f"🔍 Fetching and analyzing remote repository: [cyan]{repo_url}[/cyan] (ref: [cyan]{ref}[/cyan])...")
         try:
-            all_files_data = self.git_analyzer.get_files_from_remote_archive(repo_url, ref)
+            cache_ttl = self.config.archive_cache_ttl_seconds if self.config.cache_remote_archives else None
+            # Filtering inside the extraction loop leaves excluded members unread
+            filtered_files_data = await asyncio.to_thread(
+                self.git_analyzer.get_files_from_remote_archive, repo_url, ref,
+                cache_ttl=cache_ttl, max_bytes=self.config.max_file_bytes,
+                path_filter=self._path_filter(include_patterns, exclude_patterns)
+            )
             self.console.print("[green]✅ Repository downloaded successfully[/green]")
         except RuntimeError as e:
             self.console.print(f"[bold red]❌ Failed to fetch or process remote repository: {e}[/bold red]")
             return
-        
-        # Sort files by path before filtering for consistent limiting if max_files is used
-        all_files_data.sort(key=lambda fd: fd["path"])
 
-        files_to_review = self._filter_and_limit_file_data(
-            all_files_data, include_patterns, exclude_patterns, max_files
-        )
+
+        files_to_review = self._limit_file_data(filtered_files_data, max_files)
 
         if not files_to_review:
             self.console.print("[yellow]No files found to review after applying include/exclude patterns and limits.[/yellow]")
@@ -577,6 +552,39 @@ class AppService:
 
         await self._review_file_details_list_and_report(files_to_review, "Reviewing remote file", f"{repo_url} (ref: {ref})")
 
+    @staticmethod
+    def _parse_review_metadata(content: str) -> dict:
+        """Extracts the date, score and summary header fields of a saved review; missing fields are left out."""
+        header_match = _REVIEW_HEADER_RE.search(content)
+        if not header_match:
+            return {}
+        return {
+            "date": header_match["date"].strip(),
+            "score": header_match["score"],
+            "summary": header_match["summary"].strip(),
+        }
+
+    @staticmethod
+    def _load_summary_cache(review_dir: Path) -> dict:
+        try:
+            cache = json_utils.loads((review_dir / SUMMARY_CACHE_FILENAME).read_bytes())
+        except (OSError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    @staticmethod
+    def _save_summary_cache(review_dir: Path, cache: dict):
+        # Best effort: a cache that cannot be written only costs a re-parse next time
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile("wb", dir=review_dir, suffix=".tmp", delete=False) as tmp:
+                tmp_path = tmp.name
+                tmp.write(json_utils.dumps(cache))
+            os.replace(tmp_path, review_dir / SUMMARY_CACHE_FILENAME)
+        except (OSError, TypeError, ValueError):
+            if tmp_path:
+                Path(tmp_path).unlink(missing_ok=True)
+
     async def generate_review_summary(self, since_date: Optional[datetime], min_score: Optional[int]):
         review_dir = Path(self.config.markdown_output_dir)
         if not review_dir.exists() or not review_dir.is_dir():
@@ -585,33 +593,46 @@ class AppService:
             )
             return
 
-        review_files = list(review_dir.glob("*.md"))
-        if not review_files:
-            self.console.print("[yellow]No review files found.[/yellow]")
-            return
+        # Parsed header fields keyed by file name, reused while a file's mtime and size are unchanged
+        cache = self._load_summary_cache(review_dir)
+        cache_dirty = False
 
+        present_files = set()
         summaries = []
-        for md_file in review_files:
-            content = md_file.read_text(encoding="utf-8")
-            
-            date_match = re.search(r"\*\*Date:\*\* (.*?)\n", content)
-            score_match = re.search(r"- \*\*Score:\*\* (\d+)/10", content)
-            summary_match = re.search(r"- \*\*Summary:\*\* (.*?)\n", content, re.DOTALL)
-
-            if not (date_match and score_match and summary_match):
+        for md_file in review_dir.glob("*.md"):
+            present_files.add(md_file.name)
+            stat = md_file.stat()
+            # A report is written after the commit it reviews, so one last modified before
+            # `since_date` cannot carry a later commit date and is skipped without being read
+            if since_date and datetime.fromtimestamp(stat.st_mtime_ns / 1e9, tz=since_date.tzinfo) < since_date:
+                continue
+            signature = [stat.st_mtime_ns, stat.st_size]
+            entry = cache.get(md_file.name)
+            if not isinstance(entry, dict) or entry.get("sig") != signature:
+                # The header sits at the top of the report, so try a short read before loading the rest of the file
+                with md_file.open("r", encoding="utf-8") as f:
+                    content = f.read(REVIEW_HEADER_READ_SIZE)
+                    metadata = self._parse_review_metadata(content)
+                    if not metadata:
+                        metadata = self._parse_review_metadata(content + f.read())
+                entry = {"sig": signature, **metadata}
+                cache[md_file.name] = entry
+                cache_dirty = True
+
+            if not ("date" in entry and "score" in entry and "summary" in entry):
                 self.console.print(f"[yellow]Could not parse all required fields from '{md_file.name}'. Skipping.[/yellow]")
                 continue
 
             try:
                 # Handle 'Z' for UTC explicitly for wider compatibility
-                review_date_str = date_match.group(1).strip()
+                review_date_str = entry["date"]
                 if review_date_str.endswith('Z'):
                     review_date = datetime.fromisoformat(review_date_str[:-1] + '+00:00')
                 else:
                     review_date = datetime.fromisoformat(review_date_str)
                 
-                review_score = int(score_match.group(1))
-                review_summary = summary_match.group(1).strip()
+                review_score = int(entry["score"])
+                review_summary = entry["summary"]
             except (ValueError, IndexError) as e:
                 self.console.print(f"[yellow]Error parsing data from '{md_file.name}': {e}. Skipping.[/yellow]")
                 continue
@@ -623,6 +644,18 @@ class AppService:
             
             summaries.append({"file": md_file.name, "date": review_date, "score": review_score, "summary": review_summary})
 
+        # Forget reports that were deleted or renamed so the cache does not grow without bound
+        stale_files = cache.keys() - present_files
+        for name in stale_files:
+            del cache[name]
+
+        if cache_dirty or stale_files:
+            self._save_summary_cache(review_dir, cache)
+
+        if not present_files:
+            self.console.print("[yellow]No review files found.[/yellow]")
+            return
+
         if not summaries:
             self.console.print("[yellow]No reviews match the specified criteria.[/yellow]")
             return
@@ -1,28 +1,66 @@
-import json
+import copy
+import functools
+import stat
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 import os
 
 from pydantic import ValidationError
 
+from ai_code_reviewer_py import json_utils
 from ai_code_reviewer_py.config_models import AppConfig
-from ai_code_reviewer_py.enums import AIProvider
+from ai_code_reviewer_py.enums import AIModel, AIProvider, PROVIDER_API_KEY_ENV_VARS, PROVIDER_MODELS
 from ai_code_reviewer_py.constants import GLOBAL_CONFIG_FILE
 
-def _load_json_config_data(config_path: Path) -> Dict[str, Any]:
-    if config_path.exists() and config_path.is_file():
+# (path, st_mtime_ns, st_size) of a config file; a changed file gets a new key, so cached entries never go stale
+ConfigFileSignature = Tuple[str, int, int]
+
+def _config_file_signature(config_path: Path) -> Optional[ConfigFileSignature]:
+    try:
+        file_stat = config_path.stat()
+    except OSError:
+        return None
+    if not stat.S_ISREG(file_stat.st_mode):
+        return None
+    return str(config_path), file_stat.st_mtime_ns, file_stat.st_size
+
+@functools.lru_cache(maxsize=8)
+def _read_json_config_file(signature: ConfigFileSignature) -> Dict[str, Any]:
+    # Errors propagate and are therefore not cached
+    return json_utils.loads(Path(signature[0]).read_bytes())
+
+def _load_json_config_data(
+    config_path: Path, signature: Optional[ConfigFileSignature] = None
+) -> Dict[str, Any]:
+    # Callers that already stat-ed the file pass its signature to skip a second stat
+    if signature is None:
+        signature = _config_file_signature(config_path)
+    if signature is not None:
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
+            return copy.deepcopy(_read_json_config_file(signature))
+        except json_utils.JSONDecodeError:
             print(f"⚠️ Warning: Could not parse config file {config_path}. Invalid JSON.")
         except Exception as e:
             print(f"⚠️ Warning: Error loading config file {config_path}: {e}")
     return {}
 
+@functools.lru_cache(maxsize=8)
+def _validated_base_config(signature: Optional[ConfigFileSignature], description: str) -> AppConfig:
+    file_config_data = _load_json_config_data(Path(signature[0]), signature) if signature else {}
+    try:
+        return AppConfig(**file_config_data)
+    except ValidationError as e:
+        print(f"⚠️ Warning: Invalid configuration data found in {description}: {e}")
+        print("    Falling back to complete default configuration.")
+        return AppConfig()
+
+def api_key_from_env(provider: AIProvider) -> str:
+    env_var = PROVIDER_API_KEY_ENV_VARS.get(provider)
+    return os.getenv(env_var, "") if env_var else ""
+
 def load_base_config(config_path_override: Optional[str] = None) -> AppConfig:
 
-    file_config_data = {}
+    source_signature: Optional[ConfigFileSignature] = None
     loaded_config_source_description = "defaults"
 
     potential_config_sources: list[tuple[Path, str]] = []
@@ -37,31 +75,23 @@ def load_base_config(config_path_override: Optional[str] = None) -> AppConfig:
     )
 
     for config_path_to_check, description in potential_config_sources:
-        if config_path_to_check.exists() and config_path_to_check.is_file():
-            data = _load_json_config_data(config_path_to_check)
-            if data:
-                file_config_data = data
-                loaded_config_source_description = description
-                break
+        signature = _config_file_signature(config_path_to_check)
+        if signature is not None and _load_json_config_data(config_path_to_check, signature):
+            source_signature = signature
+            loaded_config_source_description = description
+            break
 
-    try:
-        config = AppConfig(**file_config_data)
-    except ValidationError as e:
-        print(f"⚠️ Warning: Invalid configuration data found in {loaded_config_source_description}: {e}")
-        print("    Falling back to complete default configuration.")
-        config = AppConfig()
+    # Validation runs once per config file state; callers get their own copy to mutate
+    config = _validated_base_config(source_signature, loaded_config_source_description).model_copy(deep=True)
 
     # Populate API key from environment if not set in config and provider is known
     if not config.api_key and config.ai_provider:
-        if config.ai_provider == AIProvider.OPENAI:
-            config.api_key = os.getenv("OPENAI_API_KEY", "")
-        elif config.ai_provider == AIProvider.ANTHROPIC:
-            config.api_key = os.getenv("ANTHROPIC_API_KEY", "")
-        elif config.ai_provider == AIProvider.GOOGLE:
-            config.api_key = os.getenv("GOOGLE_API_KEY", "")
+        config.api_key = api_key_from_env(config.ai_provider)
 
     return config
 
+_KNOWN_MODELS = frozenset(AIModel)
+
 def validate_required_fields(config: AppConfig) -> bool:
     if not config.ai_provider:
         raise ValueError(
@@ -75,7 +105,22 @@ def validate_required_fields(config: AppConfig) -> bool:
             f"❌ {api_key_name} is required but not set.\n\n"
             f"Set it with: ai-code-reviewer config set api_key 'your_api_key'"
         )
+
+    # Custom model names pass through to litellm; only catch known models paired with the wrong provider
+    if config.model in _KNOWN_MODELS and config.model not in PROVIDER_MODELS.get(config.ai_provider, ()):
+        raise ValueError(
+            f"❌ Model '{AIModel(config.model).value}' is not available for provider '{config.ai_provider.value}'.\n\n"
+            f"Set a matching one with: ai-code-reviewer config set model '<model>'"
+        )
     return True
 
+# (provider, api_key, model) triples that already passed validation in this process.
+_VALIDATED_CACHE: set[Tuple[Optional[AIProvider], str, Optional[str]]] = set()
+
 def validate_final_config(config: AppConfig) -> bool:
-    return validate_required_fields(config)
\ No newline at end of file
+    key = (config.ai_provider, config.api_key, config.model)
+    if key in _VALIDATED_CACHE:
+        return True
+    validate_required_fields(config)
+    _VALIDATED_CACHE.add(key)
+    return True
\ No newline at end of file
@@ -5,6 +5,43 @@ from pydantic import BaseModel, Field, ConfigDict
 from ai_code_reviewer_py.enums import AIProvider, IssueSeverity, AIModel
 from ai_code_reviewer_py.constants import GLOBAL_CONFIG_DIR
 
+# Defaults built once at import; list fields hand out a fresh copy per instance instead of deep-copying a literal
+_DEFAULT_REVIEW_CRITERIA = (
+    "code quality",
+    "security vulnerabilities",
+    "performance issues",
+    "naming conventions",
+    "code complexity",
+    "test coverage",
+    "documentation",
+    "accessibility",
+    "dependency security",
+)
+_DEFAULT_BLOCKING_ISSUES = (IssueSeverity.CRITICAL, IssueSeverity.HIGH)
+_DEFAULT_MARKDOWN_OUTPUT_DIR = str(GLOBAL_CONFIG_DIR / "code-reviews")
+# Generated and vendored files that are rarely worth reviewing and often dominate a repository's size
+_DEFAULT_EXCLUDE_PATTERNS = (
+    "**/*.min.js",
+    "**/*.map",
+    "**/*_pb2.py",
+    "**/vendor/**",
+    "**/node_modules/**",
+    "dist/**",
+    ".git/**",
+)
+
+# Keyed by Optional[AIProvider]: an unset provider simply misses and gets the .get() fallback
+_API_KEY_NAMES: Dict[Optional[AIProvider], str] = {
+    AIProvider.OPENAI: "OpenAI API Key",
+    AIProvider.ANTHROPIC: "Anthropic API Key",
+    AIProvider.GOOGLE: "Google API Key",
+}
+_DEFAULT_MODELS: Dict[Optional[AIProvider], AIModel] = {
+    AIProvider.OPENAI: AIModel.GPT_4_1_MINI,
+    AIProvider.ANTHROPIC: AIModel.CLAUDE_SONNET_4_20250514,
+    AIProvider.GOOGLE: AIModel.GEMINI_2_5_FLASH_PREVIEW_05_20,
+}
+
 class AlternativeConfig(BaseModel):
     ai_provider: AIProvider = Field(...)
     model: Union[str, AIModel]
@@ -20,55 +57,45 @@ class AppConfig(BaseModel):
     max_tokens: int = Field(32000)
     api_key: str = Field("")
 
-    review_criteria: List[str] = Field([
-        "code quality",
-        "security vulnerabilities",
-        "performance issues",
-        "naming conventions",
-        "code complexity",
-        "test coverage",
-        "documentation",
-        "accessibility",
-        "dependency security"
-    ])
-
-    blocking_issues: List[IssueSeverity] = Field([IssueSeverity.CRITICAL, IssueSeverity.HIGH])
+    review_criteria: List[str] = Field(default_factory=lambda: list(_DEFAULT_REVIEW_CRITERIA))
+
+    blocking_issues: List[IssueSeverity] = Field(default_factory=lambda: list(_DEFAULT_BLOCKING_ISSUES))
     minimum_score: int = Field(6)
 
     save_to_markdown: bool = Field(True)
-    markdown_output_dir: str = Field(default_factory=lambda: str(GLOBAL_CONFIG_DIR / "code-reviews"))
+    markdown_output_dir: str = Field(_DEFAULT_MARKDOWN_OUTPUT_DIR)
     include_diff_in_markdown: bool = Field(True)
 
     enable_extended_thinking: bool = Field(False)
     enable_citations: bool = Field(False)
     enable_batch_processing: bool = Field(True)
     enable_anthropic_web_search: bool = Field(False)
+    enable_connection_prewarm: bool = Field(True)
+    enable_http2: bool = Field(True)
+    enable_streaming: bool = Field(True)
+    enable_json_mode: bool = Field(True)
 
     retry_attempts: int = Field(3)
     batch_size: int = Field(5)
+    marshal_token_budget: int = Field(6000, ge=0)
+    response_cache_size: int = Field(256, ge=0)
+    max_concurrency: int = Field(8, ge=1)
+    diff_concurrency: int = Field(8, ge=1)
+    diff_cache_size: int = Field(128, ge=0)
+    requests_per_minute: Optional[int] = Field(None, ge=1)
+    repository_chunk_chars: int = Field(200000, ge=1)
+    max_file_bytes: Optional[int] = Field(1000000, ge=1)
+    truncate_file_bytes: Optional[int] = Field(65536, ge=1)
+    cache_remote_archives: bool = Field(True)
+    archive_cache_ttl_seconds: int = Field(3600, ge=1)
+    default_exclude_patterns: List[str] = Field(default_factory=lambda: list(_DEFAULT_EXCLUDE_PATTERNS))
 
     alternative_configs: Optional[Dict[str, AlternativeConfig]] = Field(None)
 
-    model_config = ConfigDict(extra="ignore", validate_assignment=True, revalidate_instances="always")
+    model_config = ConfigDict(extra="ignore", validate_assignment=True)
 
     def get_required_api_key_name(self) -> str:
-        if not self.ai_provider:
-            return "API Key"
-        if self.ai_provider == AIProvider.OPENAI:
-            return "OpenAI API Key"
-        elif self.ai_provider == AIProvider.ANTHROPIC:
-            return "Anthropic API Key"
-        elif self.ai_provider == AIProvider.GOOGLE:
-            return "Google API Key"
-        return "API Key"
+        return _API_KEY_NAMES.get(self.ai_provider, "API Key")
 
     def get_default_model(self) -> Union[str, AIModel]:
-        if not self.ai_provider:
-            return AIModel.GPT_4_1
-        if self.ai_provider == AIProvider.OPENAI:
-            return AIModel.GPT_4_1
-        elif self.ai_provider == AIProvider.ANTHROPIC:
-            return AIModel.CLAUDE_SONNET_4_20250514
-        elif self.ai_provider == AIProvider.GOOGLE:
-            return AIModel.GEMINI_2_5_FLASH_PREVIEW_05_20
-        return AIModel.GPT_4_1
\ No newline at end of file
+        return _DEFAULT_MODELS.get(self.ai_provider, AIModel.GPT_4_1_MINI)
\ No newline at end of file
@@ -0,0 +1,154 @@
+# Reads and writes the global config file for `config set`, without the git and AI stacks `AppService` needs.
+import functools
+import json
+from typing import Any, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from rich.console import Console
+
+from ai_code_reviewer_py import json_utils
+from ai_code_reviewer_py.config_models import AppConfig
+from ai_code_reviewer_py.constants import GLOBAL_CONFIG_FILE, GLOBAL_CONFIG_DIR
+
+_SENSITIVE_KEY_WORDS = ('api_key', 'key', 'token', 'secret', 'password')
+
+
+class ConfigStore:
+    def __init__(self, console: Optional[Console] = None):
+        self.console = console or Console()
+
+    def _load_or_create_global_config_data(self) -> tuple[dict, bool]:
+        """
+        Loads global config data if it exists, otherwise returns default AppConfig data.
+        Returns a tuple of (config_data_dict, file_existed_boolean).
+        """
+        GLOBAL_CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+
+        if GLOBAL_CONFIG_FILE.exists():
+            try:
+                with open(GLOBAL_CONFIG_FILE, "rb") as f:
+                    return json_utils.loads(f.read()), True
+            except json_utils.JSONDecodeError:
+                self.console.print(f"[yellow]⚠️ Warning: Global config file {GLOBAL_CONFIG_FILE} is corrupted. Using defaults.[/yellow]")
+            except Exception as e:
+                self.console.print(f"[yellow]⚠️ Warning: Error reading global config file {GLOBAL_CONFIG_FILE}: {e}. Using defaults.[/yellow]")
+
+        default_config_instance = AppConfig()
+        return default_config_instance.model_dump(mode="json", by_alias=True, exclude_none=True), False
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _is_sensitive_key(key: str) -> bool:
+        """Check if a configuration key contains sensitive information that should be masked."""
+        key_lower = key.lower()
+        return any(sensitive_word in key_lower for sensitive_word in _SENSITIVE_KEY_WORDS)
+
+    @staticmethod
+    def _mask_sensitive_value(value: Any) -> str:
+        """Mask sensitive values for display."""
+        return "***HIDDEN***" if value and str(value).strip() else "***EMPTY***"
+
+    # AppConfig's fields are fixed for the life of the process, so these lookups never go stale
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _find_matching_field(key_to_set: str) -> Optional[str]:
+        """Find the actual field name that matches the user input."""
+        # Direct match
+        if key_to_set in AppConfig.model_fields:
+            return key_to_set
+
+        # Check aliases
+        for field_name, field_info in AppConfig.model_fields.items():
+            if field_info.alias == key_to_set:
+                return field_name
+
+        # Check partial matches (e.g., "provider" -> "ai_provider")
+        for field_name in AppConfig.model_fields:
+            if field_name.endswith(f"_{key_to_set}") or field_name.startswith(f"{key_to_set}_"):
+                return field_name
+
+        return None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_valid_enum_values(field_name: str) -> Optional[Tuple[str, ...]]:
+        """Get valid enum values for a field if it's an enum type."""
+        field_info = AppConfig.model_fields.get(field_name)
+        if not field_info:
+            return None
+
+        # Handle Optional[Enum] types
+        field_type = field_info.annotation
+        if hasattr(field_type, '__origin__') and field_type.__origin__ is Union:
+            # Extract non-None type from Optional
+            for arg in field_type.__args__:
+                if arg is not type(None):
+                    field_type = arg
+                    break
+
+        # Check if it's an enum
+        if hasattr(field_type, '__members__'):
+            return tuple(member.value for member in field_type.__members__.values())
+
+        return None
+
+    def set_value(self, key_to_set: str, value_str: str):
+        """
+        Sets a specific key-value pair in the global configuration file.
+        Creates the file with defaults if it doesn't exist, then applies the change.
+        The key should match a field name or alias in AppConfig.
+        """
+        config_data, file_existed = self._load_or_create_global_config_data()
+
+        target_field_name = self._find_matching_field(key_to_set)
+
+        if not target_field_name:
+            valid_keys = list(AppConfig.model_fields.keys())
+            self.console.print(f"❌ [bold red]Error: Configuration key '{key_to_set}' is not recognized.[/bold red]")
+            self.console.print(f"Valid configuration keys: {', '.join(valid_keys)}")
+            return
+
+        # Check if it's an enum field and validate the value
+        valid_enum_values = self._get_valid_enum_values(target_field_name)
+        if valid_enum_values and value_str not in valid_enum_values:
+            self.console.print(f"❌ [bold red]Error: Invalid value '{value_str}' for '{target_field_name}'.[/bold red]")
+            self.console.print(f"Valid values: {', '.join(valid_enum_values)}")
+            return
+
+        # Set the value
+        config_data[target_field_name] = value_str
+
+        # Show helpful message if user used a close match
+        if key_to_set != target_field_name:
+            self.console.print(f"ℹ️ [cyan]Note: Using field name '{target_field_name}' for your input '{key_to_set}'.[/cyan]")
+
+        try:
+            validated_config_instance = AppConfig(**config_data)
+
+            data_to_save = validated_config_instance.model_dump(mode="json", by_alias=True, exclude_none=True)
+
+            with open(GLOBAL_CONFIG_FILE, "wb") as f:
+                f.write(json_utils.dumps(data_to_save, indent=True))
+
+            final_key_in_json = target_field_name if target_field_name else key_to_set
+            final_value_in_json = data_to_save.get(final_key_in_json)
+
+            # Mask sensitive values in console output
+            if self._is_sensitive_key(final_key_in_json):
+                display_value = self._mask_sensitive_value(final_value_in_json)
+            else:
+                display_value = json.dumps(final_value_in_json)
+
+            if not file_existed:
+                self.console.print(f"✅ Global configuration file created at: [green]{GLOBAL_CONFIG_FILE}[/green]")
+            else:
+                self.console.print(f"✅ Global configuration file updated at: [green]{GLOBAL_CONFIG_FILE}[/green]")
+
+            self.console.print(f"   Set [cyan]{final_key_in_json}[/cyan] to [yellow]{display_value}[/yellow].")
+
+        except ValidationError as e:
+            self.console.print(f"❌ [bold red]Error: The new value for '{key_to_set}' ('{value_str}') resulted in an invalid configuration:\n{e}[/bold red]")
+            self.console.print(f"   Your changes were not saved. Please provide a valid value.")
+        except Exception as e:
+            self.console.print(f"❌ [bold red]Error creating global configuration file at {GLOBAL_CONFIG_FILE}: {e}[/bold red]")
+            raise
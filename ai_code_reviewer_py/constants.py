@@ -1,4 +1,6 @@
 from pathlib import Path
 
 GLOBAL_CONFIG_DIR = Path.home() / ".ai-code-reviewer-py"
-GLOBAL_CONFIG_FILE = GLOBAL_CONFIG_DIR / "config.json"
\ No newline at end of file
+GLOBAL_CONFIG_FILE = GLOBAL_CONFIG_DIR / "config.json"
+ARCHIVE_CACHE_DIR = GLOBAL_CONFIG_DIR / "archive-cache"
+SUMMARY_CACHE_FILENAME = "_summary_cache.json"
@@ -30,3 +30,21 @@ class AIModel(str, Enum):
     GEMINI_2_5_PRO_PREVIEW_05_06 = "gemini-2.5-pro-preview-05-06"
     GEMINI_2_5_FLASH_PREVIEW_05_20 = "gemini-2.5-flash-preview-05-20"
     CLAUDE_3_5_SONNET_LATEST = "claude-3.5-sonnet-20240620"
+
+# Environment variable consulted for each provider's API key when none is configured
+PROVIDER_API_KEY_ENV_VARS = {
+    AIProvider.OPENAI: "OPENAI_API_KEY",
+    AIProvider.ANTHROPIC: "ANTHROPIC_API_KEY",
+    AIProvider.GOOGLE: "GOOGLE_API_KEY",
+}
+
+# Models each provider serves, for rejecting a configured model that belongs to another provider
+PROVIDER_MODELS = {
+    AIProvider.OPENAI: frozenset({AIModel.GPT_4_1, AIModel.GPT_4_1_MINI, AIModel.GPT_4_1_NANO}),
+    AIProvider.ANTHROPIC: frozenset({
+        AIModel.CLAUDE_SONNET_4_20250514,
+        AIModel.CLAUDE_3_7_SONNET_20250219,
+        AIModel.CLAUDE_3_5_SONNET_LATEST,
+    }),
+    AIProvider.GOOGLE: frozenset({AIModel.GEMINI_2_5_PRO_PREVIEW_05_06, AIModel.GEMINI_2_5_FLASH_PREVIEW_05_20}),
+}
@@ -1,15 +1,113 @@
+import functools
 import git
+import hashlib
+import httpx
+import os
 import re
-from typing import List, Optional, TypedDict
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Literal, Optional, Set
 from datetime import datetime
 import tarfile
 import io
-import urllib.request
-import urllib.parse
 from git import Git
+from pathlib import Path
+from ai_code_reviewer_py.constants import ARCHIVE_CACHE_DIR
 from ai_code_reviewer_py.models import FileDetails
 
-class CommitInfo(TypedDict):
+TRUNCATION_MARKER = "\n\n… [truncated]"
+# Read size for streamed archives; tarfile's default (10 KiB records) means thousands of
+# tiny socket reads and zlib calls for a multi-MB tarball
+TAR_BUFFER_SIZE = 256 * 1024
+# Downloaded GitHub archives kept in ARCHIVE_CACHE_DIR; the least recently downloaded go first
+ARCHIVE_CACHE_MAX_ENTRIES = 10
+# Like git, treat a file as binary when a NUL byte shows up in its first 8000 bytes
+BINARY_SNIFF_BYTES = 8000
+# Archive members skipped by name alone, before any of their bytes are read
+_BINARY_EXTENSIONS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.ico', '.webp', '.pdf', '.zip', '.gz', '.tgz',
+    '.bz2', '.xz', '.7z', '.jar', '.whl', '.so', '.dylib', '.dll', '.exe', '.bin', '.o', '.a',
+    '.pyc', '.class', '.woff', '.woff2', '.ttf', '.otf', '.eot', '.mp3', '.mp4', '.mov', '.wav',
+})
+
+# Allow-lists for refs passed to git; used with fullmatch so, unlike `$`, a trailing newline
+# cannot slip through, and every shell metacharacter is already excluded
+_COMMIT_RANGE_RE = re.compile(r'[a-zA-Z0-9_.^~/-]+')
+_GIT_REF_RE = re.compile(r'[a-zA-Z0-9_./-]+')
+_FULL_SHA_RE = re.compile(r'[0-9a-f]{40}')
+# Full or abbreviated object names (SHA-1 or SHA-256); nothing git could read as a range or revision expression
+_SHA_RE = re.compile(r'[0-9a-fA-F]{4,64}')
+# owner/repo from https, SSH and scheme-less GitHub URLs; the lazy repo group leaves a `.git` suffix outside
+_GITHUB_URL_RE = re.compile(
+    r'(?:https://github\.com/|git@github\.com:|github\.com[:/])([A-Za-z0-9_.-]+)/([A-Za-z0-9_.-]+?)(?:\.git)?/?'
+)
+
+# `git log` record layout: unit separators between fields, a record separator after each commit
+_COMMIT_LOG_FORMAT = "format:%H%x1f%an%x1f%ae%x1f%at%x1f%B%x1e"
+
+# One client for all archive downloads, so falling back to the next archive URL reuses the
+# keep-alive connection instead of repeating the TCP and TLS handshakes. HTTP/1.1 on purpose:
+# a single sequential download gains nothing from multiplexing and streams faster without h2 framing
+_archive_http_client: Optional[httpx.Client] = None
+_archive_http_client_lock = threading.Lock()
+
+
+def _get_archive_http_client() -> httpx.Client:
+    global _archive_http_client
+    with _archive_http_client_lock:
+        if _archive_http_client is None:
+            _archive_http_client = httpx.Client(follow_redirects=True, timeout=httpx.Timeout(60.0))
+        return _archive_http_client
+
+
+class _ResponseReader:
+    """File-like, read-once view of a streamed httpx response; closing it closes the response."""
+
+    def __init__(self, response: httpx.Response):
+        self._response = response
+        self._chunks = response.iter_bytes(TAR_BUFFER_SIZE)
+        self._buffer = b""
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            data = self._buffer + b"".join(self._chunks)
+            self._buffer = b""
+            return data
+        while len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def close(self):
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class _TeeReader:
+    """Passes reads through from `source` while copying every byte read to `sink`."""
+
+    def __init__(self, source, sink):
+        self._source = source
+        self._sink = sink
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._source.read(size)
+        self._sink.write(data)
+        return data
+
+@dataclass(slots=True, frozen=True)
+class CommitInfo:
     hash: str
     message: str
     author_name: str
@@ -18,42 +116,51 @@ class CommitInfo(TypedDict):
     body: str
 
 class GitAnalyzer:
-    def __init__(self, repo_path: str = '.'):
+    def __init__(self, repo_path: str = '.', diff_cache_size: int = 128):
         try:
             self.repo = git.Repo(repo_path, search_parent_directories=True)
         except git.InvalidGitRepositoryError:
             raise ValueError(f"Invalid Git repository at {repo_path}")
         except Exception as e:
             raise RuntimeError(f"Error initializing Git repository: {e}")
+        # Diffs keyed by full commit hash; a commit's diff never changes, so entries only leave by LRU eviction
+        self._diff_cache_size = diff_cache_size
+        self._diff_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._diff_cache_lock = threading.Lock()
 
+    # Pure functions of their input and often called with the same refs; invalid input raises
+    # and is therefore never cached
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def _validate_commit_range(range_str: str) -> str:
         """Validate and sanitize commit range input."""
         range_str = range_str.strip().strip('\'"')
         
         # Allow only safe characters for git ranges
-        if not re.match(r'^[a-zA-Z0-9_.^~/-]+$', range_str):
+        if not _COMMIT_RANGE_RE.fullmatch(range_str):
             raise ValueError(f"Invalid characters in commit range: {range_str}")
-        
-        # Prevent command injection patterns
-        dangerous_patterns = [';', '|', '&', '$', '`', '(', ')', '<', '>', '\n', '\r']
-        if any(pattern in range_str for pattern in dangerous_patterns):
-            raise ValueError(f"Potentially dangerous commit range: {range_str}")
             
         return range_str
 
     @staticmethod
+    def _validate_sha(commit_hash: str) -> str:
+        """Validate a full or abbreviated commit hash."""
+        commit_hash = commit_hash.strip()
+
+        if not _SHA_RE.fullmatch(commit_hash):
+            raise ValueError(f"Invalid commit hash: {commit_hash}")
+
+        return commit_hash
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def _validate_git_ref(ref: str) -> str:
         """Validate git reference."""
         ref = ref.strip().strip('\'"')
         
-        if not re.match(r'^[a-zA-Z0-9_./-]+$', ref):
+        if not _GIT_REF_RE.fullmatch(ref):
             raise ValueError(f"Invalid git reference: {ref}")
             
-        dangerous_patterns = [';', '|', '&', '$', '`', '(', ')', '<', '>', '\n', '\r']
-        if any(pattern in ref for pattern in dangerous_patterns):
-            raise ValueError(f"Potentially dangerous git reference: {ref}")
-            
         return ref
 
     def get_commits(self, range_str: str = 'HEAD~1..HEAD') -> List[CommitInfo]:
@@ -62,21 +169,36 @@ class GitAnalyzer:
             
             if '..' not in range_str:
                 if range_str == "HEAD":
-                    commit_objects = [self.repo.head.commit]
+                    commit = self.repo.head.commit
                 else:
-                    commit_objects = [self.repo.commit(range_str)]
-            else:
-                commit_objects = list(self.repo.iter_commits(rev=range_str))
+                    commit = self.repo.commit(range_str)
+                body = str(commit.message).strip()
+                return [CommitInfo(
+                    hash=commit.hexsha,
+                    message=body.partition('\n')[0],
+                    author_name=commit.author.name or "",
+                    author_email=commit.author.email or "",
+                    date=datetime.fromtimestamp(commit.authored_date),
+                    body=body
+                )]
 
+            # One `git log` for the whole range instead of an object-database round trip per commit
+            # --no-show-signature keeps GPG output from a `log.showSignature` config out of the records
+            raw_log = self.repo.git.log("--no-show-signature", range_str, pretty=_COMMIT_LOG_FORMAT)
             commits_data: List[CommitInfo] = []
-            for commit in commit_objects:
+            for record in raw_log.split('\x1e'):
+                record = record.lstrip('\n')
+                if not record:
+                    continue
+                hexsha, author_name, author_email, authored_date, message = record.split('\x1f', 4)
+                body = message.strip()
                 commits_data.append(CommitInfo(
-                    hash=commit.hexsha,
-                    message=str(commit.message).strip().split('\n', 1)[0],
-                    author_name=commit.author.name,
-                    author_email=commit.author.email,
-                    date=datetime.fromtimestamp(commit.authored_date),
-                    body=str(commit.message).strip()
+                    hash=hexsha,
+                    message=body.partition('\n')[0],
+                    author_name=author_name,
+                    author_email=author_email,
+                    date=datetime.fromtimestamp(int(authored_date)),
+                    body=body
                 ))
             return commits_data
         except git.GitCommandError as e:
@@ -86,14 +208,26 @@ class GitAnalyzer:
 
     def get_commit_diff(self, commit_hash: str) -> str:
         try:
-            commit_hash = self._validate_commit_range(commit_hash)
+            commit_hash = self._validate_sha(commit_hash)
             
-            commit = self.repo.commit(commit_hash)
-            parent = commit.parents[0] if commit.parents else self.repo.tree()
-            diff_output = self.repo.git.show(commit.hexsha, "--unified=3", "--pretty=format:")
+            # Hashes from get_commits are already full SHAs; only abbreviated ones need resolving (refs are rejected above)
+            if _FULL_SHA_RE.fullmatch(commit_hash):
+                hexsha = commit_hash
+            else:
+                hexsha = self.repo.commit(commit_hash).hexsha
+            with self._diff_cache_lock:
+                cached = self._diff_cache.get(hexsha)
+                if cached is not None:
+                    self._diff_cache.move_to_end(hexsha)
+                    return cached
+            # `git show` diffs an initial commit against the empty tree itself
+            diff_output = self.repo.git.show(hexsha, "--unified=3", "--pretty=format:")
+            if self._diff_cache_size > 0:
+                with self._diff_cache_lock:
+                    self._diff_cache[hexsha] = diff_output
+                    if len(self._diff_cache) > self._diff_cache_size:
+                        self._diff_cache.popitem(last=False)
             return diff_output
-        except IndexError:
-            raise ValueError(f"Commit {commit_hash} seems to have no parents and is not an initial commit, or is invalid.")
         except Exception as e:
             raise RuntimeError(f"An unexpected error occurred while getting diff for {commit_hash}: {e}")
 
@@ -114,6 +248,69 @@ class GitAnalyzer:
         except git.GitCommandError as e:
             raise RuntimeError(f"Failed to list tracked files: {e}") from e
 
+    def read_tracked_files(
+        self, paths: List[str], max_bytes: Optional[int] = None, truncate_bytes: Optional[int] = None
+    ) -> List[FileDetails]:
+        """Reads tracked files as they are in the working tree, taking unchanged ones from the git object database.
+
+        Paths with unstaged changes are read from disk; every other path is read from its index blob,
+        which holds the same content without a filesystem read per file.
+        Files larger than `max_bytes` are skipped before they are read; of files larger than
+        `truncate_bytes` only that many leading bytes are read and a truncation marker is appended.
+        Unchanged files with identical content share one string, which is read and decoded only once.
+        """
+        entries = self.repo.index.entries
+        odb = self.repo.odb
+        modified_paths = self._get_unstaged_paths()
+        files_data: List[FileDetails] = []
+        contents_by_blob: Dict[bytes, str] = {}
+        for path in paths:
+            try:
+                if path in modified_paths:
+                    content = self._read_worktree_file(path, max_bytes, truncate_bytes)
+                    if content is not None:
+                        files_data.append(FileDetails(path=path, content=content))
+                    continue
+                binsha = entries[(path, 0)].binsha
+                content = contents_by_blob.get(binsha)
+                if content is not None:
+                    files_data.append(FileDetails(path=path, content=content))
+                    continue
+                size = odb.info(binsha).size
+                if max_bytes is not None and size > max_bytes:
+                    print(f"Warning: Skipping {path}: larger than {max_bytes} bytes.")
+                    continue
+                if truncate_bytes is not None and size > truncate_bytes:
+                    content = odb.stream(binsha).read(truncate_bytes).decode('utf-8', errors='ignore') + TRUNCATION_MARKER
+                else:
+                    content = odb.stream(binsha).read().decode('utf-8', errors='ignore')
+                contents_by_blob[binsha] = content
+                files_data.append(FileDetails(path=path, content=content))
+            except Exception as e:
+                print(f"Warning: Could not read file {path}: {e}")
+        return files_data
+
+    def _get_unstaged_paths(self) -> Set[str]:
+        """Returns the tracked paths whose working-tree content differs from the index."""
+        try:
+            output = self.repo.git.diff("--name-only", "-z")
+        except git.GitCommandError as e:
+            raise RuntimeError(f"Failed to list modified files: {e}") from e
+        return set(filter(None, output.split('\0')))
+
+    def _read_worktree_file(
+        self, path: str, max_bytes: Optional[int], truncate_bytes: Optional[int]
+    ) -> Optional[str]:
+        full_path = os.path.join(self.repo.working_dir, path)
+        size = os.path.getsize(full_path)
+        if max_bytes is not None and size > max_bytes:
+            print(f"Warning: Skipping {path}: larger than {max_bytes} bytes.")
+            return None
+        with open(full_path, 'rb') as f:
+            if truncate_bytes is not None and size > truncate_bytes:
+                return f.read(truncate_bytes).decode('utf-8', errors='ignore') + TRUNCATION_MARKER
+            return f.read().decode('utf-8', errors='ignore')
+
     @staticmethod
     def _is_github_url(repo_url: str) -> bool:
         """Check if the repository URL is from GitHub."""
@@ -122,18 +319,10 @@ class GitAnalyzer:
     @staticmethod
     def _parse_github_url(repo_url: str) -> tuple[str, str]:
         """Parse GitHub URL to extract owner and repo name."""
-        # Handle various GitHub URL formats
-        patterns = [
-            r'https://github\.com/([^/]+)/([^/]+)(?:\.git)?/?$',
-            r'git@github\.com:([^/]+)/([^/]+)(?:\.git)?$',
-            r'github\.com[:/]([^/]+)/([^/]+)(?:\.git)?/?$'
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, repo_url.strip())
-            if match:
-                owner, repo = match.groups()
-                return owner, repo.rstrip('.git')
+        match = _GITHUB_URL_RE.fullmatch(repo_url.strip())
+        if match:
+            owner, repo = match.groups()
+            return owner, repo
         
         raise ValueError(f"Could not parse GitHub URL: {repo_url}")
 
@@ -146,8 +335,8 @@ class GitAnalyzer:
         return repo_url
 
     @staticmethod
-    def _download_github_archive(repo_url: str, ref: str = "HEAD") -> bytes:
-        """Download repository archive from GitHub using HTTP."""
+    def _open_github_archive(repo_url: str, ref: str = "HEAD"):
+        """Opens the repository's tar.gz archive on GitHub; the caller reads and closes the response."""
         owner, repo = GitAnalyzer._parse_github_url(repo_url)
         
         # Try different archive URL formats
@@ -157,41 +346,73 @@ class GitAnalyzer:
             f"https://github.com/{owner}/{repo}/archive/refs/tags/{ref}.tar.gz"
         ]
         
-        last_error = None
+        client = _get_archive_http_client()
+        last_error: str | Exception | None = None
         for url in archive_urls:
             try:
-                with urllib.request.urlopen(url, timeout=60) as response:
-                    if response.status == 200:
-                        return response.read()
+                response = client.send(client.build_request("GET", url), stream=True)
             except Exception as e:
                 last_error = e
                 continue
+            if response.status_code == 200:
+                return _ResponseReader(response)
+            # Drain the short error body so the connection goes back to the pool for the next URL
+            last_error = f"HTTP {response.status_code} for {url}"
+            response.read()
+            response.close()
         
         raise RuntimeError(f"Failed to download archive from GitHub. Last error: {last_error}")
 
     @staticmethod
-    def _extract_files_from_tar_gz(archive_bytes: bytes) -> List[FileDetails]:
-        """Extract files from tar.gz archive bytes."""
+    def _extract_files_from_tar_stream(
+        fileobj,
+        mode: Literal['r|gz', 'r|*'],
+        strip_top_level_dir: bool = False,
+        max_bytes: Optional[int] = None,
+        path_filter: Optional[Callable[[str], bool]] = None,
+    ) -> List[FileDetails]:
+        """Extracts text files from a tar stream member by member, as the bytes arrive.
+
+        Binary files, files larger than `max_bytes` and paths rejected by `path_filter` are
+        skipped without being read or decoded. Files with identical content share one string.
+        """
         files_data: List[FileDetails] = []
+        # Keyed by a short digest so the raw bytes of every member are not kept alive for the lookup
+        contents_by_digest: Dict[bytes, str] = {}
         
-        tar_stream = io.BytesIO(archive_bytes)
-        with tarfile.open(fileobj=tar_stream, mode="r:gz") as tar:
-            members = [m for m in tar.getmembers() if m.isfile() and m.name]
-            
-            for member in members:
+        with tarfile.open(fileobj=fileobj, mode=mode, bufsize=TAR_BUFFER_SIZE) as tar:
+            for member in tar:
+                if not (member.isfile() and member.name):
+                    continue
+                path = member.name
+                if strip_top_level_dir:
+                    # Remove the top-level directory from path (GitHub adds repo-ref/ prefix)
+                    _, sep, tail = path.partition('/')
+                    if sep:
+                        path = tail
+                if not path or (path_filter is not None and not path_filter(path)):
+                    continue
+                if os.path.splitext(member.name)[1].lower() in _BINARY_EXTENSIONS:
+                    continue
+                if max_bytes is not None and member.size > max_bytes:
+                    print(f"Warning: Skipping {member.name}: larger than {max_bytes} bytes.")
+                    continue
                 try:
                     extracted_file = tar.extractfile(member)
                     if extracted_file:
-                        file_content_bytes = extracted_file.read()
-                        file_content_str = file_content_bytes.decode('utf-8', errors='replace')
-                        
-                        # Remove the top-level directory from path (GitHub adds repo-ref/ prefix)
-                        clean_path = '/'.join(member.name.split('/')[1:]) if '/' in member.name else member.name
-                        if clean_path:  # Skip empty paths
-                            files_data.append(FileDetails(
-                                path=clean_path,
-                                content=file_content_str
-                            ))
+                        head = extracted_file.read(BINARY_SNIFF_BYTES)
+                        if b'\x00' in head:
+                            continue  # Binary: the rest is never read into memory or decoded
+                        file_content_bytes = head + extracted_file.read()
+                        digest = hashlib.blake2b(file_content_bytes, digest_size=16).digest()
+                        file_content_str = contents_by_digest.get(digest)
+                        if file_content_str is None:
+                            file_content_str = file_content_bytes.decode('utf-8', errors='replace')
+                            contents_by_digest[digest] = file_content_str
+                        files_data.append(FileDetails(
+                            path=path,
+                            content=file_content_str
+                        ))
                 except UnicodeDecodeError:
                     print(f"Warning: Could not decode file {member.name} as UTF-8. Skipping.")
                 except Exception as e:
@@ -200,46 +421,124 @@ class GitAnalyzer:
         return files_data
 
     @staticmethod
-    def get_files_from_remote_archive(repo_url: str, ref: str = "HEAD") -> List[FileDetails]:
-        """Get files from remote repository archive safely without executing any code."""
+    def _archive_cache_path(repo_url: str, ref: str) -> Path:
+        key = hashlib.sha256(f"{repo_url}\0{ref}".encode("utf-8")).hexdigest()
+        return ARCHIVE_CACHE_DIR / f"{key}.tar.gz"
+
+    @staticmethod
+    def _evict_archive_cache(keep: int = ARCHIVE_CACHE_MAX_ENTRIES):
+        entries = []
+        for path in ARCHIVE_CACHE_DIR.glob("*.tar.gz"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        entries.sort(reverse=True)
+        for _, path in entries[keep:]:
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _get_github_archive_files(
+        repo_url: str,
+        ref: str,
+        cache_ttl: Optional[float],
+        max_bytes: Optional[int] = None,
+        path_filter: Optional[Callable[[str], bool]] = None,
+    ) -> List[FileDetails]:
+        """Extracts a GitHub archive, reusing a cached download younger than `cache_ttl` seconds.
+
+        With `cache_ttl=None` nothing is cached. A download is extracted while it streams in and
+        is teed into a temp file that only replaces the cache entry once the archive was read fully.
+        """
+        if cache_ttl is None:
+            # Decompress straight off the socket instead of buffering the whole archive first
+            with GitAnalyzer._open_github_archive(repo_url, ref) as response:
+                return GitAnalyzer._extract_files_from_tar_stream(
+                    response, "r|gz", strip_top_level_dir=True, max_bytes=max_bytes, path_filter=path_filter
+                )
+
+        cache_path = GitAnalyzer._archive_cache_path(repo_url, ref)
+        try:
+            if time.time() - cache_path.stat().st_mtime < cache_ttl:
+                with open(cache_path, "rb") as cached:
+                    return GitAnalyzer._extract_files_from_tar_stream(
+                        cached, "r|gz", strip_top_level_dir=True, max_bytes=max_bytes, path_filter=path_filter
+                    )
+        except FileNotFoundError:
+            pass
+        except tarfile.TarError:
+            cache_path.unlink(missing_ok=True)  # Corrupt entry; download it again
+
+        ARCHIVE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with GitAnalyzer._open_github_archive(repo_url, ref) as response:
+            with tempfile.NamedTemporaryFile(dir=ARCHIVE_CACHE_DIR, suffix=".tmp", delete=False) as tmp:
+                try:
+                    files_data = GitAnalyzer._extract_files_from_tar_stream(
+                        _TeeReader(response, tmp), "r|gz", strip_top_level_dir=True,
+                        max_bytes=max_bytes, path_filter=path_filter
+                    )
+                    # tarfile stops at the end-of-archive marker; keep the trailing padding too
+                    shutil.copyfileobj(response, tmp, TAR_BUFFER_SIZE)
+                except BaseException:
+                    tmp.close()
+                    os.unlink(tmp.name)
+                    raise
+        os.replace(tmp.name, cache_path)
+        GitAnalyzer._evict_archive_cache()
+        return files_data
+
+    @staticmethod
+    def _archive_via_shallow_clone(repo_url: str, ref: str) -> bytes:
+        """Builds a tar of `ref` from a throwaway depth-1 clone, for remotes without `git archive --remote`.
+
+        The clone stays bare, so the files are not checked out just to be archived again. Blob filtering
+        is left off because `git archive` would then fetch every missing blob in its own round trip.
+        """
+        clone_options: Dict[str, Any] = {} if ref == "HEAD" else {"branch": ref}
+        with tempfile.TemporaryDirectory(prefix="ai-code-reviewer-") as clone_dir:
+            repo = git.Repo.clone_from(repo_url, clone_dir, depth=1, bare=True, **clone_options)
+            try:
+                return repo.git.archive("HEAD", format='tar', stdout_as_string=False)
+            finally:
+                repo.close()
+
+    @staticmethod
+    def get_files_from_remote_archive(
+        repo_url: str,
+        ref: str = "HEAD",
+        cache_ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        path_filter: Optional[Callable[[str], bool]] = None,
+    ) -> List[FileDetails]:
+        """Get files from remote repository archive safely without executing any code.
+
+        GitHub archives are cached on disk for `cache_ttl` seconds when it is set; binary files,
+        files larger than `max_bytes` and paths `path_filter` rejects are left out.
+        """
         try:
             repo_url = GitAnalyzer._validate_repo_url(repo_url)
             ref = GitAnalyzer._validate_git_ref(ref)
             
             if GitAnalyzer._is_github_url(repo_url):
-                archive_bytes = GitAnalyzer._download_github_archive(repo_url, ref)
-                return GitAnalyzer._extract_files_from_tar_gz(archive_bytes)
+                return GitAnalyzer._get_github_archive_files(repo_url, ref, cache_ttl, max_bytes, path_filter)
             else:
                 # Fall back to git archive for other providers
                 g = Git()
-                tar_bytes = g.archive(remote=repo_url, format='tar', ref=ref, kill_after_timeout=120, stdout_as_bytes=True)
-                
-                files_data: List[FileDetails] = []
-                tar_stream = io.BytesIO(tar_bytes)
-                with tarfile.open(fileobj=tar_stream, mode="r|*") as tar:
-                    for member in tar:
-                        if member.isfile() and member.name: 
-                            try:
-                                extracted_file = tar.extractfile(member)
-                                if extracted_file:
-                                    file_content_bytes = extracted_file.read()
-                                    file_content_str = file_content_bytes.decode('utf-8', errors='replace')
-                                    files_data.append(FileDetails(
-                                        path=member.name,
-                                        content=file_content_str
-                                    ))
-                            except UnicodeDecodeError:
-                                print(f"Warning: Could not decode file {member.name} as UTF-8. Skipping.")
-                            except Exception as e:
-                                print(f"Warning: Could not read file {member.name} from archive: {e}")
-                return files_data
+                try:
+                    tar_bytes = g.archive(ref, remote=repo_url, format='tar', kill_after_timeout=120, stdout_as_string=False)
+                except git.GitCommandError as e:
+                    # Many self-hosted servers disable upload-archive, but a clone always works
+                    if 'upload-archive' not in str(e.stderr):
+                        raise
+                    tar_bytes = GitAnalyzer._archive_via_shallow_clone(repo_url, ref)
+                return GitAnalyzer._extract_files_from_tar_stream(
+                    io.BytesIO(tar_bytes), "r|*", max_bytes=max_bytes, path_filter=path_filter
+                )
         except git.GitCommandError as e:
             error_message = f"Failed to fetch archive from '{repo_url}' (ref: {ref}). Git command failed: {e.stderr}"
             raise RuntimeError(error_message) from e
-        except urllib.error.HTTPError as e:
-            raise RuntimeError(f"HTTP error downloading from '{repo_url}' (ref: {ref}): {e.code} {e.reason}") from e
-        except urllib.error.URLError as e:
-            raise RuntimeError(f"Network error downloading from '{repo_url}': {e.reason}") from e
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Network error downloading from '{repo_url}': {e}") from e
         except tarfile.TarError as e:
             raise RuntimeError(f"Failed to process tar archive from '{repo_url}': {e}") from e
         except Exception as e:
@@ -0,0 +1,27 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson  # type: ignore[import-not-found,import-untyped]
+except ImportError:  # orjson ships with the optional "speedups" extra
+    orjson = None  # type: ignore[assignment]
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers only need to catch the latter.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Parses JSON with orjson when it is installed, falling back to the standard library."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serializes to UTF-8 JSON bytes, optionally indented by two spaces, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    # Match orjson's output: non-ASCII characters are written as-is, compact separators when not indenting
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
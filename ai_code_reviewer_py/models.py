@@ -1,4 +1,4 @@
-from typing import List, Optional, TypedDict, Dict, Any
+from typing import List, NamedTuple, Optional, TypedDict, Dict, Any
 from ai_code_reviewer_py.enums import IssueSeverity, IssueCategory
 
 class AIReviewIssue(TypedDict):
@@ -27,7 +27,7 @@ class CommitDetails(TypedDict):
     author: str
     date: str
 
-class FileDetails(TypedDict):
+class FileDetails(NamedTuple):
     path: str
     content: str
 
@@ -0,0 +1,24 @@
+import pytest
+
+# Modules that import the global config paths by name; patching `constants` alone would not reach them
+_GLOBAL_CONFIG_FILE_TARGETS = (
+    "ai_code_reviewer_py.cli.GLOBAL_CONFIG_FILE",
+    "ai_code_reviewer_py.config_loader.GLOBAL_CONFIG_FILE",
+    "ai_code_reviewer_py.config_store.GLOBAL_CONFIG_FILE",
+)
+_GLOBAL_CONFIG_DIR_TARGETS = (
+    "ai_code_reviewer_py.config_store.GLOBAL_CONFIG_DIR",
+)
+
+
+@pytest.fixture
+def mock_global_config_paths(mocker, tmp_path):
+    # Using a shorter, simpler directory name to avoid complex wrapping by Rich
+    mock_config_dir = tmp_path / "aicr_test_config"
+    mock_config_file = mock_config_dir / "config.json"
+
+    for target in _GLOBAL_CONFIG_FILE_TARGETS:
+        mocker.patch(target, mock_config_file)
+    for target in _GLOBAL_CONFIG_DIR_TARGETS:
+        mocker.patch(target, mock_config_dir)
+    return mock_config_file, mock_config_dir
@@ -1,10 +1,15 @@
 import pytest
+import asyncio
 from datetime import datetime
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 from ai_code_reviewer_py.git_analyzer import CommitInfo
+from ai_code_reviewer_py.models import FileDetails
+from ai_code_reviewer_py import json_utils
 from ai_code_reviewer_py.ai_reviewer import AIReviewer
 from ai_code_reviewer_py.config_models import AppConfig
 from ai_code_reviewer_py.enums import AIProvider, AIModel
+from ai_code_reviewer_py.exceptions import ReviewGenerationError
 
 
 @pytest.fixture
@@ -34,6 +39,11 @@ def config():
     )
 
 
+async def _stream_chunks(pieces):
+    for piece in pieces:
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+
 def test_ai_reviewer_init(config):
     reviewer = AIReviewer(config)
     
@@ -55,6 +65,23 @@ def test_get_default_model():
     reviewer = AIReviewer(config_none)
     assert reviewer._get_default_model() == AIModel.GPT_4_1_MINI.value
 
+    for provider in AIProvider:
+        config = AppConfig(ai_provider=provider)
+        assert AIReviewer(config)._get_default_model() == config.get_default_model()
+
+
+def test_web_search_tool_added_only_for_supported_models():
+    supported = AIReviewer(AppConfig(ai_provider=AIProvider.ANTHROPIC, model="claude-sonnet-4-20250514", enable_anthropic_web_search=True))
+    unsupported = AIReviewer(AppConfig(ai_provider=AIProvider.ANTHROPIC, model="claude-unknown", enable_anthropic_web_search=True))
+
+    assert supported._litellm_kwargs["tools"][0]["name"] == "web_search"
+    assert "tools" not in unsupported._litellm_kwargs
+
+
+def test_json_mode_requested_only_for_supporting_providers(config, ai_reviewer):
+    assert ai_reviewer._litellm_kwargs["response_format"] == {"type": "json_object"}
+    assert "response_format" not in AIReviewer(config)._litellm_kwargs
+
 
 def test_build_prompt(config, sample_commit):
     reviewer = AIReviewer(config)
@@ -66,6 +93,48 @@ def test_build_prompt(config, sample_commit):
     assert "Test Author" in prompt
     assert "- old line\n+ new line" in prompt
     assert "code quality" in prompt.lower()
+    assert prompt.startswith(reviewer._review_prefix)
+    assert prompt.endswith(diff)
+
+
+def test_prompt_prefix_has_no_citation_placeholders_when_disabled(config):
+    without = AIReviewer(config)
+    with_citations = AIReviewer(config.model_copy(update={"enable_citations": True}))
+
+    assert "citation" not in without._review_prefix.lower()
+    assert "\n\n\n" not in without._review_prefix
+    assert not any(line.isspace() for line in without._repository_prefix.splitlines())
+    assert '"citation":' in with_citations._review_prefix
+    assert '"sources":' in with_citations._repository_prefix
+
+
+def test_build_repository_review_prompt(config):
+    reviewer = AIReviewer(config)
+    files_data = [
+        FileDetails(path="a.py", content="print('a')"),
+        FileDetails(path="b.py", content="print('b')"),
+    ]
+
+    prompt = reviewer._build_repository_review_prompt(files_data, "my-repo")
+
+    assert prompt.startswith(reviewer._repository_prefix)
+    assert "Repository: my-repo\nTotal Files: 2" in prompt
+    assert "=== FILE: a.py ===\nprint('a')\n=== END FILE ===\n\n=== FILE: b.py ===" in prompt
+
+
+@pytest.mark.asyncio
+async def test_anthropic_request_marks_static_prefix_cacheable(config, sample_commit):
+    reviewer = AIReviewer(config)
+    prompt = reviewer._build_prompt("+ new line", sample_commit)
+
+    with patch("ai_code_reviewer_py.ai_reviewer.litellm.acompletion", new_callable=AsyncMock, return_value=_stream_chunks(["{}"])) as mock_completion:
+        await reviewer._call_llm_with_litellm(prompt, cache_prefix=reviewer._review_prefix)
+    await reviewer.aclose()
+
+    prefix_block, dynamic_block = mock_completion.call_args.kwargs["messages"][1]["content"]
+    assert prefix_block["cache_control"] == {"type": "ephemeral"}
+    assert prefix_block["text"] + dynamic_block["text"] == prompt
+    assert "cache_control" not in dynamic_block
 
 
 @pytest.mark.asyncio
@@ -89,9 +158,59 @@ async def test_review_code_with_retry_success(ai_reviewer):
         assert result == mock_response
         mock_review.assert_called_once_with(diff, commit)
 
+@pytest.mark.asyncio
+async def test_review_code_with_retry_returns_last_error(ai_reviewer, sample_commit):
+    errors = [RuntimeError("first"), RuntimeError("second")]
+
+    with patch.object(ai_reviewer, 'review_code', new_callable=AsyncMock, side_effect=errors) as mock_review, \
+         patch("ai_code_reviewer_py.ai_reviewer.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        result = await ai_reviewer.review_code_with_retry("diff", sample_commit, max_retries=2)
+
+    assert result is errors[1]
+    assert mock_review.call_count == 2
+    delay = mock_sleep.call_args.args[0]
+    assert 1 <= delay < 2
+
+
+@pytest.mark.asyncio
+async def test_identical_reviews_share_one_llm_call(ai_reviewer, sample_commit):
+    async def slow_llm(prompt, cache_prefix=None):
+        await asyncio.sleep(0.01)
+        return '{"score": 8, "summary": "Cached"}'
+
+    with patch.object(ai_reviewer, '_call_llm_with_litellm', side_effect=slow_llm) as mock_llm:
+        first, second = await asyncio.gather(
+            ai_reviewer.review_code("+ line", sample_commit),
+            ai_reviewer.review_code("+ line", sample_commit)
+        )
+        third = await ai_reviewer.review_code("+ line", sample_commit)
+
+    assert mock_llm.call_count == 1
+    assert first == second == third
+    first["summary"] = "mutated"
+    assert third["summary"] == "Cached"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_prompts_coalesce_without_cache(sample_commit):
+    reviewer = AIReviewer(AppConfig(ai_provider="openai", api_key="test-key", response_cache_size=0))
+
+    async def slow_llm(prompt, cache_prefix=None):
+        await asyncio.sleep(0.01)
+        return '{"score": 8, "summary": "Shared"}'
+
+    with patch.object(reviewer, '_call_llm_with_litellm', side_effect=slow_llm) as mock_llm:
+        await asyncio.gather(*(reviewer.review_code("+ line", sample_commit) for _ in range(3)))
+        assert mock_llm.call_count == 1
+        await reviewer.review_code("+ line", sample_commit)
+
+    assert mock_llm.call_count == 2
+    assert not reviewer._inflight
+
+
 @pytest.mark.asyncio
 async def test_review_entire_repository_with_retry_success(ai_reviewer):
-    files_data = [{"path": "test.py", "content": "print('hello')"}]
+    files_data = [FileDetails(path="test.py", content="print('hello')")]
     repo_info = "test-repo"
     
     with patch.object(ai_reviewer, 'review_entire_repository', new_callable=AsyncMock) as mock_review:
@@ -101,4 +220,176 @@ async def test_review_entire_repository_with_retry_success(ai_reviewer):
         result = await ai_reviewer.review_entire_repository_with_retry(files_data, repo_info)
         
         assert result == mock_response
-        mock_review.assert_called_once_with(files_data, repo_info)
\ No newline at end of file
+        mock_review.assert_called_once_with(files_data, repo_info)
+
+
+@pytest.mark.asyncio
+async def test_review_entire_repository_maps_chunks_then_reduces():
+    reviewer = AIReviewer(AppConfig(ai_provider="openai", api_key="test-key", repository_chunk_chars=10))
+    files_data = [
+        FileDetails(path="a.py", content="a" * 8),
+        FileDetails(path="b.py", content="b" * 8),
+        FileDetails(path="c.py", content="c" * 2),
+    ]
+
+    async def fake_llm(prompt, cache_prefix=None):
+        if cache_prefix == reviewer._chunk_summary_prefix:
+            return '{"files": [{"path": "chunk"}]}'
+        return '{"overall_score": 7, "executive_summary": "Combined"}'
+
+    with patch.object(reviewer, '_call_llm_with_litellm', side_effect=fake_llm) as mock_llm:
+        result = await reviewer.review_entire_repository(files_data, "test-repo")
+
+    assert result["executive_summary"] == "Combined"
+    assert mock_llm.call_count == 3
+    reduce_prompt = mock_llm.call_args_list[-1].args[0]
+    assert "=== PART 2 ===" in reduce_prompt
+    assert "Total Files: 3" in reduce_prompt
+    assert "a" * 8 not in reduce_prompt
+
+@pytest.mark.asyncio
+async def test_review_multiple_commits_respects_max_concurrency(sample_commit):
+    reviewer = AIReviewer(AppConfig(ai_provider="openai", api_key="test-key", max_concurrency=2, batch_size=1))
+    in_flight = 0
+    peak = 0
+
+    async def fake_review(diff, commit):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return {"score": 8, "summary": "ok", "confidence": 9, "issues": []}
+
+    with patch.object(reviewer, 'review_code_with_retry', side_effect=fake_review):
+        results = await reviewer.review_multiple_commits([sample_commit] * 6, ["diff"] * 6)
+
+    assert len(results) == 6
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_review_multiple_commits_reports_cancelled_batch_as_error(sample_commit):
+    reviewer = AIReviewer(AppConfig(ai_provider="openai", api_key="test-key", batch_size=1))
+    review = {"score": 8, "summary": "ok", "confidence": 9, "issues": []}
+
+    async def fake_review(diff, commit):
+        if diff == "cancelled":
+            raise asyncio.CancelledError()
+        return review
+
+    with patch.object(reviewer, 'review_code_with_retry', side_effect=fake_review):
+        results = await reviewer.review_multiple_commits([sample_commit] * 2, ["cancelled", "fine"])
+
+    assert isinstance(results[0], ReviewGenerationError)
+    assert results[1] == review
+
+
+@pytest.mark.asyncio
+async def test_review_multiple_commits_marshals_small_commits(sample_commit):
+    reviewer = AIReviewer(AppConfig(ai_provider="openai", api_key="test-key", batch_size=2))
+    batched_response = (
+        '{"reviews": [{"index": 1, "score": 6, "summary": "second"}, '
+        '{"index": 0, "score": 9, "summary": "first"}]}'
+    )
+    fallback_review = {"score": 5, "summary": "single", "confidence": 5, "issues": []}
+
+    with patch.object(reviewer, '_call_llm_with_litellm', new_callable=AsyncMock, return_value=batched_response) as mock_llm, \
+         patch.object(reviewer, 'review_code_with_retry', new_callable=AsyncMock, return_value=fallback_review) as mock_single:
+        results = await reviewer.review_multiple_commits([sample_commit] * 3, ["+ a", "+ b", "x" * 40000])
+
+    assert [r["summary"] for r in results] == ["first", "second", "single"]
+    assert mock_llm.call_count == 1
+    assert "=== COMMIT 1 ===" in mock_llm.call_args.args[0]
+    mock_single.assert_called_once_with("x" * 40000, sample_commit)
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_shared_and_released(ai_reviewer):
+    import litellm
+
+    client = ai_reviewer._get_http_client()
+    assert ai_reviewer._get_http_client() is client
+    assert litellm.aclient_session is client
+
+    await ai_reviewer.aclose()
+
+    assert client.is_closed
+    assert litellm.aclient_session is None
+
+
+@pytest.mark.asyncio
+async def test_prewarm_opens_connections_and_ignores_failures(ai_reviewer):
+    client = ai_reviewer._get_http_client()
+    with patch.object(client, 'head', new_callable=AsyncMock, side_effect=OSError("offline")) as mock_head:
+        await ai_reviewer.prewarm(connections=3)
+    assert mock_head.await_count == 3
+    await ai_reviewer.aclose()
+
+
+def test_parse_response_extracts_fenced_json_and_coerces_numbers():
+    response_text = 'Here you go:\n```json\n{"score": "8", "summary": "Looks good", "issues": [],}\n```'
+
+    parsed = AIReviewer._parse_response(response_text)
+
+    assert parsed["score"] == 8
+    assert parsed["summary"] == "Looks good"
+    assert parsed["confidence"] == 5
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_stops_once_json_object_closes(ai_reviewer):
+    received = []
+
+    async def stream():
+        for piece in ['```json\n{"summary": "uses {braces} and \\"quotes\\"", ', '"score": 8}', "\n```", " trailing"]:
+            received.append(piece)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+    text = await AIReviewer._collect_streamed_response(stream())
+
+    assert len(received) == 2
+    assert AIReviewer._parse_response(text)["summary"] == 'uses {braces} and "quotes"'
+
+
+@pytest.mark.asyncio
+async def test_streamed_response_reads_past_braces_in_leading_prose(ai_reviewer):
+    received = []
+
+    async def stream():
+        for piece in ["The `{}` literal in foo.py and the {x: 1} snippet ", 'are fine.\n{"score": 6, ', '"summary": "ok"}', " trailing"]:
+            received.append(piece)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+    text = await AIReviewer._collect_streamed_response(stream())
+
+    assert len(received) == 3
+    assert text == '{"score": 6, "summary": "ok"}'
+    assert AIReviewer._parse_response(text)["score"] == 6
+
+
+def test_parse_response_tries_bare_object_once_before_raw_decode(mocker):
+    loads = mocker.spy(json_utils, "loads")
+
+    parsed = AIReviewer._parse_response('{"score": 7, "summary": "Fine"} Note: see {x} and }')
+
+    assert parsed["score"] == 7
+    assert loads.call_count == 1
+
+
+def test_parse_response_decodes_fenced_object_without_brace_slicing(mocker):
+    loads = mocker.spy(json_utils, "loads")
+
+    parsed = AIReviewer._parse_response('Sure:\n```json\n{"score": 5, "summary": "Meh"} and {more}\n```')
+
+    assert parsed["score"] == 5
+    assert loads.call_count == 0
+
+
+def test_parse_response_ignores_prose_after_json_object():
+    response_text = '{"score": 7, "summary": "Fine", "confidence": 9} Note: consider {refactoring} later.'
+
+    parsed = AIReviewer._parse_response(response_text)
+
+    assert parsed["score"] == 7
+    assert parsed["confidence"] == 9
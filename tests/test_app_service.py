@@ -1,11 +1,19 @@
 import pytest
-from unittest.mock import MagicMock, patch, mock_open, AsyncMock
-from pathlib import Path
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import ANY, MagicMock, patch, mock_open, AsyncMock
+from pathlib import Path, PurePosixPath
 from datetime import datetime, timezone
+from types import SimpleNamespace
+from rich.padding import Padding
 
-from ai_code_reviewer_py.app_service import AppService
+from ai_code_reviewer_py.app_service import AppService, REVIEW_HEADER_READ_SIZE, _compile_globs
 from ai_code_reviewer_py.ai_reviewer import AIReviewer
 from ai_code_reviewer_py.config_models import AppConfig
+from ai_code_reviewer_py.constants import SUMMARY_CACHE_FILENAME
+from ai_code_reviewer_py.git_analyzer import CommitInfo
 from ai_code_reviewer_py.models import AIReviewResponse, FileDetails, AIReviewIssue, RepositorySummaryResponse
 
 
@@ -25,10 +33,17 @@ def app_service(mock_config):
         return service
 
 
+def _commit(commit_hash: str, message: str) -> CommitInfo:
+    return CommitInfo(hash=commit_hash, message=message, author_name="Dev", author_email="dev@example.com",
+                      date=datetime(2024, 1, 1, 10, 0, 0), body=message)
+
+
 def create_mock_md_file(name: str, content: str) -> MagicMock:
     mock_file = MagicMock(spec=Path)
     mock_file.name = name
     mock_file.read_text.return_value = content
+    mock_file.open = mock_open(read_data=content)
+    mock_file.stat.return_value = SimpleNamespace(st_mtime_ns=time.time_ns(), st_size=len(content))
     return mock_file
 
 
@@ -110,6 +125,27 @@ async def test_generate_review_summary_with_since_filter(app_service):
         assert "Old review" not in output_str
 
 
+
+@pytest.mark.asyncio
+async def test_generate_review_summary_since_filter_skips_files_modified_earlier(app_service):
+    md_content = """# Code Review for Commit abcdef01
+**Date:** 2024-01-10T12:00:00
+- **Score:** 6/10
+- **Summary:** Old review
+"""
+    old_file = create_mock_md_file("old.md", md_content)
+    old_file.stat.return_value = SimpleNamespace(
+        st_mtime_ns=int(datetime(2024, 1, 10, 13, 0).timestamp() * 1e9), st_size=len(md_content)
+    )
+
+    with patch("pathlib.Path.exists", return_value=True), \
+         patch("pathlib.Path.is_dir", return_value=True), \
+         patch("pathlib.Path.glob", return_value=iter([old_file])):
+        await app_service.generate_review_summary(datetime(2024, 2, 1), None)
+
+    old_file.open.assert_not_called()
+    app_service.console.print.assert_any_call("[yellow]No reviews match the specified criteria.[/yellow]")
+
 @pytest.mark.asyncio
 async def test_generate_review_summary_with_min_score_filter(app_service):
     md_content_1 = """# Code Review for Commit 12345678
@@ -156,11 +192,220 @@ async def test_generate_review_summary_malformed_file(app_service):
         assert "No reviews match the specified criteria" in output_str # Because the only file was skipped
 
 
+@pytest.mark.asyncio
+async def test_generate_review_summary_reuses_cached_metadata(app_service, tmp_path):
+    app_service.config.markdown_output_dir = str(tmp_path)
+    (tmp_path / "review1.md").write_text(
+        "**Date:** 2024-01-15T10:00:00Z\n- **Score:** 8/10\n- **Summary:** Cached work\n", encoding="utf-8"
+    )
+    await app_service.generate_review_summary(None, None)
+    assert (tmp_path / SUMMARY_CACHE_FILENAME).exists()
+
+    app_service.console.reset_mock()
+    with patch("pathlib.Path.open", wraps=Path.open, autospec=True) as mock_open_path:
+        await app_service.generate_review_summary(None, None)
+
+    opened = [call.args[0].name for call in mock_open_path.call_args_list]
+    assert "review1.md" not in opened
+    output_str = " ".join(str(call_args) for call_args in app_service.console.print.call_args_list)
+    assert "Cached work" in output_str
+
+
+
+@pytest.mark.asyncio
+async def test_generate_review_summary_drops_cache_entries_for_removed_reports(app_service, tmp_path):
+    app_service.config.markdown_output_dir = str(tmp_path)
+    header = "**Date:** 2024-01-15T10:00:00Z\n- **Score:** 8/10\n- **Summary:** Work\n"
+    (tmp_path / "keep.md").write_text(header, encoding="utf-8")
+    (tmp_path / "old.md").write_text(header, encoding="utf-8")
+    await app_service.generate_review_summary(None, None)
+
+    (tmp_path / "old.md").rename(tmp_path / "renamed.md")
+    await app_service.generate_review_summary(None, None)
+
+    cache = json.loads((tmp_path / SUMMARY_CACHE_FILENAME).read_text())
+    assert sorted(cache) == ["keep.md", "renamed.md"]
+
+
+@pytest.mark.asyncio
+async def test_generate_review_summary_reads_past_header_prefix(app_service, tmp_path):
+    app_service.config.markdown_output_dir = str(tmp_path)
+    (tmp_path / "review1.md").write_text(
+        f"**Message:** {'x' * REVIEW_HEADER_READ_SIZE}\n**Date:** 2024-01-15T10:00:00Z\n"
+        "- **Score:** 8/10\n- **Summary:** Long message\n",
+        encoding="utf-8"
+    )
+
+    await app_service.generate_review_summary(None, None)
+
+    output_str = " ".join(str(call_args) for call_args in app_service.console.print.call_args_list)
+    assert "Long message" in output_str
+
+def test_print_review_details_uses_severity_emoji(app_service):
+    review: AIReviewResponse = {
+        "score": 5, "summary": "Issues", "confidence": 8,
+        "issues": [
+            {"severity": "critical", "description": "SQL injection", "suggestion": "Use parameters"},
+            {"severity": "weird", "description": "Odd", "suggestion": "Check"},
+        ]
+    }
+
+    app_service._print_review_details_to_console(review)
+
+    rendered = [call.args[0].renderable for call in app_service.console.print.call_args_list if isinstance(call.args[0], Padding)]
+    assert rendered[0].startswith("🚨 [bold magenta]CRITICAL:")
+    assert rendered[1].startswith("❓ [bold magenta]WEIRD:")
+
+
+def test_save_commit_review_to_markdown_writes_utf8(app_service, tmp_path):
+    app_service.config.markdown_output_dir = str(tmp_path / "reviews")
+    commit = CommitInfo(
+        hash="abc12345", message="Fix naïve parser", author_name="Dev", author_email="dev@example.com",
+        date=datetime(2024, 1, 1, 10, 0, 0), body="Fix naïve parser"
+    )
+    review: AIReviewResponse = {"score": 8, "summary": "Looks good ✅", "confidence": 9, "issues": []}
+
+    app_service._save_commit_review_to_markdown(review, commit, "+ café")
+
+    saved = list((tmp_path / "reviews").glob("*.md"))
+    assert len(saved) == 1
+    content = saved[0].read_text(encoding="utf-8")
+    assert "Looks good ✅" in content
+    assert "+ café" in content
+
+
+def test_compile_globs_matches_path_full_match():
+    patterns = ["**/*.py", "docs/*.md", ".github/**"]
+    paths = ["main.py", "src/pkg/mod.py", "docs/index.md", "docs/api/ref.md", ".github/workflows/ci.yml", "README.md"]
+
+    compiled = _compile_globs(patterns)
+
+    for path in paths:
+        expected = any(PurePosixPath(path).full_match(pattern) for pattern in patterns)
+        assert bool(compiled.match(path)) == expected, path
+    assert _compile_globs([]) is None
+
+
+@pytest.mark.asyncio
+async def test_review_commits_in_range_reviews_diffs_as_they_arrive(app_service):
+    app_service.config.batch_size = 2
+    app_service.config.save_to_markdown = False
+    commits = [_commit(f"c{i}", f"Commit {i}") for i in range(4)]
+    app_service.git_analyzer.get_commits.return_value = commits
+    fetch_threads = set()
+
+    def fake_diff(commit_hash):
+        fetch_threads.add(threading.get_ident())
+        time.sleep(0.2 if commit_hash == "c0" else 0.01)
+        return f"diff-{commit_hash}"
+
+    review_calls = []
+
+    async def fake_review(group_commits, group_diffs):
+        review_calls.append([c.hash for c in group_commits])
+        assert group_diffs == [f"diff-{c.hash}" for c in group_commits]
+        return [{"hash": c.hash} for c in group_commits]
+
+    app_service.git_analyzer.get_commit_diff.side_effect = fake_diff
+    app_service.ai_reviewer.review_multiple_commits = AsyncMock(side_effect=fake_review)
+    app_service._display_review_to_console = MagicMock()
+
+    await app_service.review_commits_in_range("HEAD~4..HEAD")
+
+    # The slow first diff does not hold back the batch of commits whose diffs were already fetched
+    assert "c0" not in review_calls[0]
+    assert sorted(h for call in review_calls for h in call) == ["c0", "c1", "c2", "c3"]
+    assert all(len(call) <= 2 for call in review_calls)
+    assert threading.get_ident() not in fetch_threads
+    displayed = sorted(call.args[0]["hash"] for call in app_service._display_review_to_console.call_args_list)
+    assert displayed == ["c0", "c1", "c2", "c3"]
+
+
+
+@pytest.mark.asyncio
+async def test_review_commits_in_range_cancels_started_reviews_when_a_diff_fails(app_service):
+    app_service.config.batch_size = 1
+    app_service.git_analyzer.get_commits.return_value = [_commit("c0", "Commit 0"), _commit("c1", "Commit 1")]
+
+    def fake_diff(commit_hash):
+        if commit_hash == "c1":
+            time.sleep(0.05)
+            raise RuntimeError("bad commit")
+        return "diff-c0"
+
+    review_started = asyncio.Event()
+    review_cancelled = asyncio.Event()
+
+    async def fake_review(group_commits, group_diffs):
+        review_started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            review_cancelled.set()
+            raise
+
+    app_service.git_analyzer.get_commit_diff.side_effect = fake_diff
+    app_service.ai_reviewer.review_multiple_commits = AsyncMock(side_effect=fake_review)
+
+    with pytest.raises(RuntimeError, match="bad commit"):
+        await app_service.review_commits_in_range("HEAD~2..HEAD")
+
+    assert review_started.is_set()
+    assert review_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_iter_diffs_stops_fetching_after_a_failure(app_service):
+    app_service.config.diff_concurrency = 2
+    commits = [_commit(f"c{i}", f"Commit {i}") for i in range(6)]
+    fetched = []
+
+    def fake_diff(commit_hash):
+        fetched.append(commit_hash)
+        if commit_hash == "c0":
+            raise RuntimeError("bad commit")
+        time.sleep(0.05)
+        return f"diff-{commit_hash}"
+
+    app_service.git_analyzer.get_commit_diff.side_effect = fake_diff
+
+    with pytest.raises(RuntimeError, match="bad commit"):
+        async for _ in app_service._iter_diffs(commits):
+            pass
+
+    assert len(fetched) < len(commits)
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+@pytest.mark.asyncio
+async def test_review_commits_in_range_runs_git_and_saves_off_the_event_loop(app_service):
+    app_service.config.save_to_markdown = True
+    worker_threads = {}
+
+    def record(name, result=None):
+        def call(*args, **kwargs):
+            worker_threads[name] = threading.get_ident()
+            return result
+        return call
+
+    commit = _commit("c0", "Commit 0")
+    app_service.git_analyzer.get_commits.side_effect = record("get_commits", [commit])
+    app_service.git_analyzer.get_commit_diff.return_value = "diff"
+    app_service.ai_reviewer.review_multiple_commits = AsyncMock(return_value=[{"score": 8}])
+    app_service._display_review_to_console = MagicMock()
+    app_service._save_commit_review_to_markdown = MagicMock(side_effect=record("save"))
+
+    await app_service.review_commits_in_range("HEAD~1..HEAD")
+
+    assert set(worker_threads) == {"get_commits", "save"}
+    assert threading.get_ident() not in worker_threads.values()
+    app_service._save_commit_review_to_markdown.assert_called_once_with({"score": 8}, commit, "diff")
+
 @pytest.mark.asyncio
 async def test_review_file_details_list_and_report(app_service, mock_config):
     files_to_review: list[FileDetails] = [
-        {"path": "file1.py", "content": "content1"},
-        {"path": "file2.py", "content": "content2"},
+        FileDetails(path="file1.py", content="content1"),
+        FileDetails(path="file2.py", content="content2"),
     ]
     mock_review_1: AIReviewResponse = {"score": 8, "summary": "Review for file1", "confidence": 7, "issues": []}
     mock_review_2_error = ValueError("AI failed for file2")
@@ -199,18 +444,22 @@ async def test_review_repository_files_flow(app_service, mock_config):
     app_service.git_analyzer.repo.working_dir = "/fake/repo/root"
     app_service.git_analyzer.get_tracked_files = MagicMock(return_value=list(mock_file_contents.keys()))
 
-    def mock_read_text_side_effect(self_path_obj, encoding='utf-8', errors='ignore'):
-        relative_path_str = str(self_path_obj.relative_to(Path("/fake/repo/root")))
-        return mock_file_contents.get(relative_path_str, "default content")
+    app_service.git_analyzer.read_tracked_files = MagicMock(
+        side_effect=lambda paths, max_bytes=None, truncate_bytes=None: [FileDetails(path=p, content=mock_file_contents[p]) for p in paths]
+    )
 
-    with patch("pathlib.Path.read_text", side_effect=mock_read_text_side_effect, autospec=True):
-        await app_service.review_repository_files(
-            include_patterns=["src/**/*.py"],
-            exclude_patterns=["**/test_*.py"],
-            max_files=None
-        )
+    await app_service.review_repository_files(
+        include_patterns=["src/**/*.py"],
+        exclude_patterns=["**/test_*.py"],
+        max_files=None
+    )
 
     app_service.git_analyzer.get_tracked_files.assert_called_once()
+    app_service.git_analyzer.read_tracked_files.assert_called_once_with(
+        ["src/main.py", "src/sub/helper.py"],
+        max_bytes=mock_config.max_file_bytes,
+        truncate_bytes=mock_config.truncate_file_bytes
+    )
     app_service.ai_reviewer.review_entire_repository_with_retry.assert_called_once()
 
 
@@ -229,16 +478,15 @@ async def test_review_repository_files_max_files_limit(app_service):
 
     app_service.ai_reviewer.review_entire_repository_with_retry = AsyncMock(return_value={"overall_score": 8})
 
-    def mock_read_text_side_effect(self_path_obj, encoding='utf-8', errors='ignore'):
-        relative_path_str = str(self_path_obj.relative_to(Path("/fake/repo/root")))
-        return mock_file_contents.get(relative_path_str, "default content")
+    app_service.git_analyzer.read_tracked_files = MagicMock(
+        side_effect=lambda paths, max_bytes=None, truncate_bytes=None: [FileDetails(path=p, content=mock_file_contents[p]) for p in paths]
+    )
 
-    with patch("pathlib.Path.read_text", side_effect=mock_read_text_side_effect, autospec=True):
-        await app_service.review_repository_files(
-            include_patterns=["**/*.py"], 
-            exclude_patterns=[], 
-            max_files=2
-        )
+    await app_service.review_repository_files(
+        include_patterns=["**/*.py"], 
+        exclude_patterns=[], 
+        max_files=2
+    )
 
     app_service.console.print.assert_any_call("[yellow]Limiting to 2 files out of 3 found.[/yellow]")
     
@@ -251,9 +499,9 @@ async def test_review_external_repository(app_service, mock_config, mocker):
         FileDetails(path="src/main.py", content="content1"),
         FileDetails(path="README.md", content="content2")
     ]
-    app_service.git_analyzer.get_files_from_remote_archive = MagicMock(return_value=sorted(mock_files_data, key=lambda x: x["path"]))
+    app_service.git_analyzer.get_files_from_remote_archive = MagicMock(return_value=sorted(mock_files_data, key=lambda x: x.path))
     
-    mocker.patch.object(app_service, "_filter_and_limit_file_data", return_value=mock_files_data)
+    mocker.patch.object(app_service, "_limit_file_data", return_value=mock_files_data)
 
     mock_review_and_report_helper = mocker.patch.object(app_service, "_review_file_details_list_and_report", new_callable=AsyncMock)
 
@@ -265,9 +513,84 @@ async def test_review_external_repository(app_service, mock_config, mocker):
 
     await app_service.review_external_repository(repo_url, ref, include, exclude, max_f)
 
-    app_service.git_analyzer.get_files_from_remote_archive.assert_called_once_with(repo_url, ref)
-    app_service._filter_and_limit_file_data.assert_called_once_with(
-        sorted(mock_files_data, key=lambda x: x["path"]), 
-        include, exclude, max_f
+    app_service.git_analyzer.get_files_from_remote_archive.assert_called_once_with(
+        repo_url, ref, cache_ttl=mock_config.archive_cache_ttl_seconds, max_bytes=mock_config.max_file_bytes,
+        path_filter=ANY
     )
-    mock_review_and_report_helper.assert_called_once_with(mock_files_data, "Reviewing remote file", f"{repo_url} (ref: {ref})")
\ No newline at end of file
+    path_filter = app_service.git_analyzer.get_files_from_remote_archive.call_args.kwargs["path_filter"]
+    assert path_filter("src/main.py") and not path_filter("README.md") and not path_filter("docs/conf.py")
+    app_service._limit_file_data.assert_called_once_with(sorted(mock_files_data, key=lambda x: x.path), max_f)
+    mock_review_and_report_helper.assert_called_once_with(mock_files_data, "Reviewing remote file", f"{repo_url} (ref: {ref})")
+
+
+def test_limit_file_data_returns_first_paths_in_order(app_service):
+    files = [FileDetails(path=p, content="") for p in ["src/d.py", "src/b.py", "src/a.py", "src/c.py"]]
+
+    limited = app_service._limit_file_data(list(files), 2)
+    unlimited = app_service._limit_file_data(list(files), None)
+
+    assert [f.path for f in limited] == ["src/a.py", "src/b.py"]
+    assert [f.path for f in unlimited] == ["src/a.py", "src/b.py", "src/c.py", "src/d.py"]
+
+
+def test_path_filter_applies_default_excludes(app_service):
+    accepts = app_service._path_filter(["**/*"], ["docs/**"])
+
+    assert accepts("src/app.py")
+    assert not accepts("docs/index.md")
+    assert not accepts("static/js/app.min.js")
+    assert not accepts("web/node_modules/left-pad/index.js")
+    assert not accepts("proto/service_pb2.py")
+
+    app_service.config.default_exclude_patterns = []
+    assert app_service._path_filter(["**/*"], [])("static/js/app.min.js")
+
+
+def test_path_filter_explicit_include_overrides_default_excludes(app_service):
+    accepts = app_service._path_filter(["vendor/**", "dist/**"], ["vendor/skip/**"])
+
+    assert accepts("vendor/lib/util.py")
+    assert accepts("dist/bundle.js")
+    assert not accepts("vendor/skip/x.py")
+    assert not accepts("src/app.py")
+    assert app_service._path_filter(["**/*", "src/**"], [])("src/app.py")
+    assert not app_service._path_filter(["**/*", "src/**"], [])("vendor/lib/util.py")
+
+
+def test_path_filter_broad_include_keeps_default_excludes(app_service):
+    app_service.config = AppConfig()
+    accepts = app_service._path_filter(["**/*.py"], [])
+
+    assert accepts("src/app.py")
+    assert not accepts("api/foo_pb2.py")
+    assert not accepts("vendor/lib/x.py")
+    assert not accepts("node_modules/p/x.py")
+    assert app_service._path_filter(["**/*_pb2.py"], [])("api/foo_pb2.py")
+
+
+def test_generate_markdown_filename_sanitizes_message():
+    commit = CommitInfo(
+        hash="abc12345def", message="Fix naïve_parser: handle <tags> & 100% cases", author_name="Dev",
+        author_email="dev@example.com", date=datetime(2024, 1, 1, 10, 0, 0), body=""
+    )
+
+    filename = AppService._generate_markdown_filename(commit)
+
+    assert filename == "20240101-100000-abc12345-Fix-naïveparser-handle-tags--100-cases.md"
+
+
+def test_save_commit_review_to_markdown_creates_output_dir_once(app_service, tmp_path):
+    app_service.config.markdown_output_dir = str(tmp_path / "reviews")
+    review: AIReviewResponse = {"score": 8, "summary": "Fine", "confidence": 9, "issues": []}
+    commits = [
+        CommitInfo(hash=f"abc1234{i}", message=f"Change {i}", author_name="Dev", author_email="dev@example.com",
+                   date=datetime(2024, 1, 1, 10, 0, i), body="")
+        for i in range(3)
+    ]
+
+    with patch("pathlib.Path.mkdir", autospec=True, side_effect=Path.mkdir) as mock_mkdir:
+        for commit in commits:
+            app_service._save_commit_review_to_markdown(review, commit, "")
+
+    assert mock_mkdir.call_count == 1
+    assert len(list((tmp_path / "reviews").glob("*.md"))) == 3
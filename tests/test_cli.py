@@ -5,16 +5,53 @@ import click
 from unittest.mock import patch, MagicMock
 from click.testing import CliRunner
 import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+from types import SimpleNamespace
 from ai_code_reviewer_py.cli import cli
 from ai_code_reviewer_py import __version__
 from ai_code_reviewer_py.config_models import AppConfig, AIProvider
 
+# The CLI applies its overrides to a copy of the loaded config, so these can be shared between tests
+_DEFAULT_APP_CONFIG = AppConfig()
+_DUMMY_KEY_APP_CONFIG = _DEFAULT_APP_CONFIG.model_copy(update={"api_key": "dummy_key"})
+_PROVIDER_TEST_APP_CONFIG = _DEFAULT_APP_CONFIG.model_copy(update={"api_key": "dummy_key_for_provider_test"})
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def runner():
+    # CliRunner keeps no state between invocations, so one instance serves the whole module
     return CliRunner()
 
 
+@pytest.fixture
+def mocked_cli_service(mocker):
+    """Patches config loading, validation and AppService for the command bodies in `_cli`.
+
+    Every review method is an AsyncMock; tests adjust `load_config`, `validate` or `service` as needed.
+    """
+    load_config = mocker.patch(
+        "ai_code_reviewer_py.config_loader.load_base_config", return_value=_DUMMY_KEY_APP_CONFIG
+    )
+    validate = mocker.patch("ai_code_reviewer_py._cli.validate_final_config", return_value=True)
+    service_cls = mocker.patch("ai_code_reviewer_py._cli.AppService")
+    service = service_cls.return_value
+    for method in ("review_commits_in_range", "review_repository_files", "review_external_repository", "generate_review_summary"):
+        setattr(service, method, AsyncMock())
+    return SimpleNamespace(load_config=load_config, validate=validate, service_cls=service_cls, service=service)
+
+
+@pytest.fixture
+def store_console(mocker):
+    """Replaces the Rich console `config set` prints through, so tests skip rendering and read the calls."""
+    return mocker.patch("ai_code_reviewer_py.config_store.Console").return_value
+
+
+def _printed(console):
+    return [str(c.args[0]) for c in console.print.call_args_list]
+
+
 def test_cli_version(runner):
     result = runner.invoke(cli, ["--version"], prog_name="ai-code-reviewer-py")
     assert result.exit_code == 0
@@ -27,84 +64,65 @@ def test_cli_help(runner):
     assert "AI Code Reviewer CLI" in result.output
 
 
+@pytest.mark.parametrize("module", ["ai_code_reviewer_py.app_service", "litellm", "git", "pydantic"])
+def test_cli_import_does_not_load_heavy_modules(module):
+    code = f"import sys, ai_code_reviewer_py.cli; print({module!r} in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+
 def test_review_command_help(runner):
     result = runner.invoke(cli, ["review", "--help"])
     assert result.exit_code == 0
     assert "Review commits in the specified range" in result.output
 
 
-def test_review_command_with_mocked_service(runner, mocker):
-    mock_load_config = mocker.patch("ai_code_reviewer_py.cli.load_base_config")
-    mocker.patch("ai_code_reviewer_py.cli.validate_final_config", return_value=True)
-    
-    mock_app_service_constructor = mocker.patch("ai_code_reviewer_py.cli.AppService")
-    mock_service_instance = mock_app_service_constructor.return_value
-    mock_service_instance.review_commits_in_range = mocker.AsyncMock()
-    
+def test_review_command_with_mocked_service(runner, mocker, mocked_cli_service):
     mock_config = mocker.MagicMock(spec=AppConfig)
-    mock_load_config.return_value = mock_config
+    mocked_cli_service.load_config.return_value = mock_config
     
     result = runner.invoke(cli, ["review", "HEAD~1..HEAD"])
     
     assert result.exit_code == 0
-    mock_load_config.assert_called_once()
-    mock_app_service_constructor.assert_called_once_with(mock_config)
-    mock_service_instance.review_commits_in_range.assert_called_once_with("HEAD~1..HEAD")
-
+    mocked_cli_service.load_config.assert_called_once()
+    mocked_cli_service.service_cls.assert_called_once_with(mock_config)
+    mocked_cli_service.service.review_commits_in_range.assert_called_once_with("HEAD~1..HEAD")
 
-@pytest.fixture
-def mock_global_config_paths(mocker, tmp_path):
-    # Using a shorter, simpler directory name to avoid complex wrapping by Rich
-    mock_config_dir = tmp_path / "aicr_test_config" 
-    mock_config_file = mock_config_dir / "config.json"
-    
-    mocker.patch("ai_code_reviewer_py.constants.GLOBAL_CONFIG_FILE", mock_config_file)
-    mocker.patch("ai_code_reviewer_py.constants.GLOBAL_CONFIG_DIR", mock_config_dir)
-    # Also need to mock for app_service if it imports directly
-    mocker.patch("ai_code_reviewer_py.app_service.GLOBAL_CONFIG_FILE", mock_config_file)
-    mocker.patch("ai_code_reviewer_py.app_service.GLOBAL_CONFIG_DIR", mock_config_dir)
-    # Mock for cli.py's direct import of GLOBAL_CONFIG_FILE
-    mocker.patch("ai_code_reviewer_py.cli.GLOBAL_CONFIG_FILE", mock_config_file)
-    return mock_config_file, mock_config_dir
 
-
-def test_config_set_api_key_new_file(runner, mocker, mock_global_config_paths):
+def test_config_set_api_key_new_file(runner, mocker, mock_global_config_paths, store_console):
     mock_config_file, _ = mock_global_config_paths
-    # Ensure AppConfig() can be instantiated correctly with mocked constants
-    # The mock_global_config_paths fixture should handle the constants.GLOBAL_CONFIG_DIR mocking
-    mocker.patch("ai_code_reviewer_py.cli.load_base_config", return_value=AppConfig()) 
+    # The mock_global_config_paths fixture points config_store at the temporary config dir
+    mocker.patch("ai_code_reviewer_py.config_loader.load_base_config", return_value=_DEFAULT_APP_CONFIG) 
 
-    result = runner.invoke(cli, ["config", "set", "api_key", "test_api_123"], catch_exceptions=False)
+    result = runner.invoke(cli, ["config", "set", "api_key", "test_api_123"])
     
-    assert result.exit_code == 0
-    assert "✅ Global configuration file created at:" in result.output
-    assert str(mock_config_file) in result.output.replace("\n", "")
-    assert '   Set api_key to ***HIDDEN***.' in result.output
+    assert result.exit_code == 0, result.output
+    printed = _printed(store_console)
+    assert any("Global configuration file created at:" in line and str(mock_config_file) in line for line in printed)
+    assert "   Set [cyan]api_key[/cyan] to [yellow]***HIDDEN***[/yellow]." in printed
     
     assert mock_config_file.exists()
     with open(mock_config_file, "r") as f:
         data = json.load(f)
     assert data["api_key"] == "test_api_123"
-    # Create a new AppConfig instance to get its default max_tokens
-    # This AppConfig() will also use the mocked GLOBAL_CONFIG_DIR due to the fixture
-    assert data.get("max_tokens") == AppConfig().max_tokens # Check other defaults persist
+    assert data.get("max_tokens") == _DEFAULT_APP_CONFIG.max_tokens # Check other defaults persist
 
 
-def test_config_set_model_existing_file(runner, mocker, mock_global_config_paths):
+def test_config_set_model_existing_file(runner, mocker, mock_global_config_paths, store_console):
     mock_config_file, mock_config_dir = mock_global_config_paths
     mock_config_dir.mkdir(parents=True, exist_ok=True)
     initial_config_data = {"model": "old_model", "max_tokens": 1000}
     with open(mock_config_file, "w") as f:
         json.dump(initial_config_data, f)
 
-    mocker.patch("ai_code_reviewer_py.cli.load_base_config", return_value=AppConfig(**initial_config_data))
+    mocker.patch("ai_code_reviewer_py.config_loader.load_base_config", return_value=AppConfig(**initial_config_data))
 
     result = runner.invoke(cli, ["config", "set", "model", "new_model_456"])
     
-    assert result.exit_code == 0
-    assert "✅ Global configuration file updated at:" in result.output
-    assert str(mock_config_file) in result.output.replace("\n", "")
-    assert '   Set model to "new_model_456".' in result.output
+    assert result.exit_code == 0, result.output
+    printed = _printed(store_console)
+    assert any("Global configuration file updated at:" in line and str(mock_config_file) in line for line in printed)
+    assert '   Set [cyan]model[/cyan] to [yellow]"new_model_456"[/yellow].' in printed
     
     with open(mock_config_file, "r") as f:
         data = json.load(f)
@@ -115,7 +133,7 @@ def test_config_set_model_existing_file(runner, mocker, mock_global_config_paths
 def test_config_show_no_file(runner, mocker, mock_global_config_paths):
     mock_config_file, _ = mock_global_config_paths
     # This mock is for the main cli group, not directly used by 'config show' logic itself
-    mocker.patch("ai_code_reviewer_py.cli.load_base_config", return_value=AppConfig())
+    mocker.patch("ai_code_reviewer_py.config_loader.load_base_config", return_value=_DEFAULT_APP_CONFIG)
     result = runner.invoke(cli, ["config", "show"])
     assert result.exit_code == 0
     assert f"Global configuration file is expected at: {mock_config_file}" in result.output
@@ -130,120 +148,91 @@ def test_config_show_existing_file(runner, mocker, mock_global_config_paths):
         json.dump(config_content, f, indent=2)
     
     # This mock is for the main cli group
-    mocker.patch("ai_code_reviewer_py.cli.load_base_config", return_value=AppConfig())
+    mocker.patch("ai_code_reviewer_py.config_loader.load_base_config", return_value=_DEFAULT_APP_CONFIG)
     result = runner.invoke(cli, ["config", "show"])
     assert result.exit_code == 0
     assert f"Global configuration file is expected at: {mock_config_file}" in result.output
     assert '"api_key": "fake_key_shown"' in result.output
 
 
-@pytest.mark.parametrize(
-    "cli_option, cli_value, config_attr, expected_value",  # Ensure these names are used
-    [
-        ("--include", "**/*.py", "include_patterns", ["**/*.py"]),
-        ("--exclude", "docs/**", "exclude_patterns", ["docs/**"]),
-        ("--max-files", "10", "max_files", 10),
-        ("--provider", "openai", "ai_provider", AIProvider.OPENAI),
-        ("--web-search", None, "enable_anthropic_web_search", True),
-        ("--no-citations", None, "enable_citations", False),
-        ("--batch", None, "enable_batch_processing", True),
-        ("--no-extended-thinking", None, "enable_extended_thinking", False),
-        ("--save-markdown", None, "save_to_markdown", True),
-        ("--markdown-dir", "my_repo_reviews", "markdown_output_dir", "my_repo_reviews"),
-    ]
+# (option, value or None for flags, config attribute or review_repository_files argument, expected)
+_REVIEW_REPO_OPTIONS = (
+    ("--include", "**/*.py", "include_patterns", ["**/*.py"]),
+    ("--exclude", "docs/**", "exclude_patterns", ["docs/**"]),
+    ("--max-files", "10", "max_files", 10),
+    ("--provider", "openai", "ai_provider", AIProvider.OPENAI),
+    ("--web-search", None, "enable_anthropic_web_search", True),
+    ("--no-citations", None, "enable_citations", False),
+    ("--batch", None, "enable_batch_processing", True),
+    ("--no-extended-thinking", None, "enable_extended_thinking", False),
+    ("--save-markdown", None, "save_to_markdown", True),
+    ("--markdown-dir", "my_repo_reviews", "markdown_output_dir", "my_repo_reviews"),
+)
+# Positions of the arguments passed on to review_repository_files rather than set on the config
+_REVIEW_REPO_FILE_ARGS = {"include_patterns": 0, "exclude_patterns": 1, "max_files": 2}
+
+_REVIEW_OPTIONS = (
+    ("--provider", "anthropic", "ai_provider", AIProvider.ANTHROPIC),
+    ("--web-search", None, "enable_anthropic_web_search", True),
+    ("--no-web-search", None, "enable_anthropic_web_search", False),
+    ("--citations", None, "enable_citations", True),
+    ("--no-citations", None, "enable_citations", False),
+    ("--batch", None, "enable_batch_processing", True),
+    ("--no-batch", None, "enable_batch_processing", False),
+    ("--extended-thinking", None, "enable_extended_thinking", True),
+    ("--no-extended-thinking", None, "enable_extended_thinking", False),
+    ("--save-markdown", None, "save_to_markdown", True),
+    ("--no-save-markdown", None, "save_to_markdown", False),
+    ("--markdown-dir", "./custom_reviews", "markdown_output_dir", "./custom_reviews"),
+    ("--include-diff", None, "include_diff_in_markdown", True),
+    ("--no-include-diff", None, "include_diff_in_markdown", False),
 )
-def test_review_repo_command_options(runner, mocker, cli_option, cli_value, config_attr, expected_value): # Ensure these names match above
-    mock_load_config = mocker.patch("ai_code_reviewer_py.cli.load_base_config")
-    mocker.patch("ai_code_reviewer_py.cli.validate_final_config", return_value=True)
-    mock_app_service_constructor = mocker.patch("ai_code_reviewer_py.cli.AppService")
-    mock_service_instance = mock_app_service_constructor.return_value
-    mock_service_instance.review_repository_files = mocker.AsyncMock()
-
-    initial_config_data = {"api_key": "dummy_key_for_provider_test"} if config_attr == "ai_provider" else {}
-    mock_base_config = AppConfig(**initial_config_data)
-    mock_load_config.return_value = mock_base_config
-
-    cli_args = ["review-repo", cli_option]
-    if cli_value is not None:
-        cli_args.append(cli_value)
-    
-    result = runner.invoke(cli, cli_args)
-    
-    assert result.exit_code == 0, f"CLI failed with output: {result.output}"
-    
-    mock_app_service_constructor.assert_called_once()
-    final_config_passed_to_service = mock_app_service_constructor.call_args[0][0]
-    
-    if config_attr in ["include_patterns", "exclude_patterns", "max_files"]:
-        # These are passed as positional arguments to review_repository_files
-        service_pos_args = mock_service_instance.review_repository_files.call_args[0]
-        if config_attr == "include_patterns":
-            actual_value = service_pos_args[0]
-        elif config_attr == "exclude_patterns":
-            actual_value = service_pos_args[1]
-        elif config_attr == "max_files":
-            actual_value = service_pos_args[2]
-        else: # Should not happen based on the if condition
-            actual_value = None 
-
-        if isinstance(expected_value, list): 
-            assert list(actual_value) == expected_value
-        else:
-            assert actual_value == expected_value
-    else: 
-        actual_config_value = getattr(final_config_passed_to_service, config_attr)
-        assert actual_config_value == expected_value, \
-            f"For option {cli_option}, expected {config_attr}={expected_value}, got {actual_config_value}" # Ensure cli_option is used here
 
 
-@pytest.mark.parametrize(
-    "option_name, option_value, expected_config_attr, expected_config_value",
-    [
-        ("--provider", "anthropic", "ai_provider", AIProvider.ANTHROPIC),
-        ("--web-search", None, "enable_anthropic_web_search", True),
-        ("--no-web-search", None, "enable_anthropic_web_search", False),
-        ("--citations", None, "enable_citations", True),
-        ("--no-citations", None, "enable_citations", False),
-        ("--batch", None, "enable_batch_processing", True),
-        ("--no-batch", None, "enable_batch_processing", False),
-        ("--extended-thinking", None, "enable_extended_thinking", True),
-        ("--no-extended-thinking", None, "enable_extended_thinking", False),
-        ("--save-markdown", None, "save_to_markdown", True),
-        ("--no-save-markdown", None, "save_to_markdown", False),
-        ("--markdown-dir", "./custom_reviews", "markdown_output_dir", "./custom_reviews"),
-        ("--include-diff", None, "include_diff_in_markdown", True), # Assuming True is the default for the option
-        ("--no-include-diff", None, "include_diff_in_markdown", False),
-    ]
-)
-def test_review_command_options(runner, mocker, option_name, option_value, expected_config_attr, expected_config_value):
-    mock_load_config = mocker.patch("ai_code_reviewer_py.cli.load_base_config")
-    mocker.patch("ai_code_reviewer_py.cli.validate_final_config", return_value=True)
-    mock_app_service_constructor = mocker.patch("ai_code_reviewer_py.cli.AppService")
-    mock_service_instance = mock_app_service_constructor.return_value
-    mock_service_instance.review_commits_in_range = mocker.AsyncMock()
-
-    # Create a base AppConfig instance to be returned by load_base_config
+def _invoke_with_option(runner, mocked_cli_service, command, option, value, config_attr):
+    """Runs `command option [value]` against the shared mocks and returns the config AppService got."""
+    mocked_cli_service.service_cls.reset_mock()
     # For provider, ensure api_key is set if provider is set, to pass validation
-    initial_config_data = {"api_key": "dummy_key_for_provider_test"} if expected_config_attr == "ai_provider" else {}
-    mock_base_config = AppConfig(**initial_config_data)
-    mock_load_config.return_value = mock_base_config
+    mocked_cli_service.load_config.return_value = (
+        _PROVIDER_TEST_APP_CONFIG if config_attr == "ai_provider" else _DEFAULT_APP_CONFIG
+    )
 
-    cli_args = ["review", "HEAD~1..HEAD", option_name]
-    if option_value is not None:
-        cli_args.append(option_value)
-    
+    cli_args = [*command, option] if value is None else [*command, option, value]
     result = runner.invoke(cli, cli_args)
-    
+
     assert result.exit_code == 0, f"CLI failed with output: {result.output}"
-    
-    mock_app_service_constructor.assert_called_once()
-    # The AppService is instantiated with the final config.
-    # We need to check the config that was passed to its constructor.
-    final_config_passed_to_service = mock_app_service_constructor.call_args[0][0]
-    
-    actual_value = getattr(final_config_passed_to_service, expected_config_attr)
-    assert actual_value == expected_config_value, \
-        f"For option {option_name}, expected {expected_config_attr}={expected_config_value}, got {actual_value}"
+    mocked_cli_service.service_cls.assert_called_once()
+    return mocked_cli_service.service_cls.call_args[0][0]
+
+
+def test_review_repo_command_options(runner, mocked_cli_service, subtests):
+    for cli_option, cli_value, config_attr, expected_value in _REVIEW_REPO_OPTIONS:
+        with subtests.test(msg=cli_option):
+            final_config_passed_to_service = _invoke_with_option(
+                runner, mocked_cli_service, ["review-repo"], cli_option, cli_value, config_attr
+            )
+
+            if config_attr in _REVIEW_REPO_FILE_ARGS:
+                service_pos_args = mocked_cli_service.service.review_repository_files.call_args[0]
+                actual_value = service_pos_args[_REVIEW_REPO_FILE_ARGS[config_attr]]
+                if isinstance(expected_value, list):
+                    actual_value = list(actual_value)
+            else:
+                actual_value = getattr(final_config_passed_to_service, config_attr)
+            assert actual_value == expected_value, \
+                f"For option {cli_option}, expected {config_attr}={expected_value}, got {actual_value}"
+
+
+def test_review_command_options(runner, mocked_cli_service, subtests):
+    for option_name, option_value, expected_config_attr, expected_config_value in _REVIEW_OPTIONS:
+        with subtests.test(msg=option_name):
+            final_config_passed_to_service = _invoke_with_option(
+                runner, mocked_cli_service, ["review", "HEAD~1..HEAD"], option_name, option_value, expected_config_attr
+            )
+
+            actual_value = getattr(final_config_passed_to_service, expected_config_attr)
+            assert actual_value == expected_config_value, \
+                f"For option {option_name}, expected {expected_config_attr}={expected_config_value}, got {actual_value}"
 
 
 @pytest.mark.parametrize(
@@ -253,29 +242,22 @@ def test_review_command_options(runner, mocker, option_name, option_value, expec
          {"repo_url": "https://example.com/repo.git", "ref": "HEAD", "include_patterns": ["**/*"], "exclude_patterns": [], "max_files": None}),
         (["review-remote", "https://another.com/r.git", "--ref", "develop", "--include", "*.py", "--exclude", "tests/*", "--max-files", "5"],
          {"repo_url": "https://another.com/r.git", "ref": "develop", "include_patterns": ["*.py"], "exclude_patterns": ["tests/*"], "max_files": 5}),
-    ]
+        (["review-remote", "https://github.com/o/r", "--no-cache"],
+         {"repo_url": "https://github.com/o/r", "ref": "HEAD", "include_patterns": ["**/*"], "exclude_patterns": [], "max_files": None, "cache_remote_archives": False}),
+    ],
+    ids=["defaults", "ref-include-exclude-max-files", "no-cache"],
 )
-def test_review_remote_command_options(runner, mocker, cli_args, expected_service_args):
-    mock_load_config = mocker.patch("ai_code_reviewer_py.cli.load_base_config")
-    mocker.patch("ai_code_reviewer_py.cli.validate_final_config", return_value=True)
-    mock_app_service_constructor = mocker.patch("ai_code_reviewer_py.cli.AppService")
-    mock_service_instance = mock_app_service_constructor.return_value
-    mock_service_instance.review_external_repository = mocker.AsyncMock()
-
-    # Base config for AppService instantiation
-    mock_base_config = AppConfig(api_key="dummy_key") # Ensure api_key for validation
-    mock_load_config.return_value = mock_base_config
-
+def test_review_remote_command_options(runner, mocked_cli_service, cli_args, expected_service_args):
     result = runner.invoke(cli, cli_args)
     
     assert result.exit_code == 0, f"CLI failed with output: {result.output}"
     
-    mock_app_service_constructor.assert_called_once()
-    final_config_passed_to_service = mock_app_service_constructor.call_args[0][0]
+    mocked_cli_service.service_cls.assert_called_once()
+    final_config_passed_to_service = mocked_cli_service.service_cls.call_args[0][0]
     assert isinstance(final_config_passed_to_service, AppConfig)
 
-    mock_service_instance.review_external_repository.assert_called_once()
-    call_args, _ = mock_service_instance.review_external_repository.call_args
+    mocked_cli_service.service.review_external_repository.assert_called_once()
+    call_args, _ = mocked_cli_service.service.review_external_repository.call_args
     
     assert call_args[0] == expected_service_args["repo_url"]
     assert call_args[1] == expected_service_args["ref"]
@@ -283,6 +265,18 @@ def test_review_remote_command_options(runner, mocker, cli_args, expected_servic
     assert list(call_args[2]) == expected_service_args["include_patterns"]
     assert list(call_args[3]) == expected_service_args["exclude_patterns"]
     assert call_args[4] == expected_service_args["max_files"]
+    assert final_config_passed_to_service.cache_remote_archives is expected_service_args.get("cache_remote_archives", True)
+
+
+def test_command_errors_are_reported_without_abort(runner, mocked_cli_service):
+    mocked_cli_service.validate.side_effect = ValueError("❌ API Key is required")
+
+    result = runner.invoke(cli, ["review-repo"])
+
+    assert result.exit_code == 1
+    assert "❌ API Key is required" in result.output
+    assert "Aborted!" not in result.output
+    mocked_cli_service.service_cls.assert_not_called()
 
 
 def test_summarize_command_help(runner):
@@ -291,30 +285,30 @@ def test_summarize_command_help(runner):
     assert "Generate a summary of saved review markdown files" in result.output
 
 
-def test_summarize_command_with_mocked_service(runner, mocker):
-    mock_load_config = mocker.patch("ai_code_reviewer_py.cli.load_base_config")
-    mock_app_service_constructor = mocker.patch("ai_code_reviewer_py.cli.AppService")
-    mock_service_instance = mock_app_service_constructor.return_value
-    mock_service_instance.generate_review_summary = mocker.AsyncMock()
-    
-    mock_config = AppConfig() # Default config
-    mock_load_config.return_value = mock_config
+def test_summarize_command_with_mocked_service(runner, mocked_cli_service):
+    mock_config = _DEFAULT_APP_CONFIG
+    mocked_cli_service.load_config.return_value = mock_config
     
     result = runner.invoke(cli, ["summarize", "--since", "2024-01-01", "--min-score", "7"])
     assert result.exit_code == 0
-    mock_app_service_constructor.assert_called_once_with(mock_config)
-    mock_service_instance.generate_review_summary.assert_called_once()
-    # You could assert the datetime and int args if needed by inspecting call_args
+    mocked_cli_service.service_cls.assert_called_once_with(mock_config)
+    mocked_cli_service.service.generate_review_summary.assert_called_once_with(datetime(2024, 1, 1), 7)
+
 
+def test_summarize_command_rejects_malformed_since(runner, mocked_cli_service):
+    result = runner.invoke(cli, ["summarize", "--since", "01/02/2024"])
+    assert result.exit_code == 2
+    assert "does not match the format YYYY-MM-DD" in result.output
+    mocked_cli_service.service_cls.assert_not_called()
 
-@patch('ai_code_reviewer_py.cli.AppService')
-@patch('ai_code_reviewer_py.cli.validate_final_config')
-@patch('ai_code_reviewer_py.cli.asyncio.run')
-def test_review_repo_command(mock_asyncio_run, mock_validate, mock_app_service_class):
+
+@patch('ai_code_reviewer_py._cli.AppService')
+@patch('ai_code_reviewer_py._cli.validate_final_config')
+@patch('ai_code_reviewer_py._cli.asyncio.run')
+def test_review_repo_command(mock_asyncio_run, mock_validate, mock_app_service_class, runner):
     mock_service = MagicMock()
     mock_app_service_class.return_value = mock_service
     
-    runner = CliRunner()
     result = runner.invoke(cli, [
         'review-repo', 
         '--include', '**/*.py',
@@ -326,14 +320,13 @@ def test_review_repo_command(mock_asyncio_run, mock_validate, mock_app_service_c
     mock_asyncio_run.assert_called_once()
     mock_app_service_class.assert_called_once()
 
-@patch('ai_code_reviewer_py.cli.AppService')
-@patch('ai_code_reviewer_py.cli.validate_final_config')
-@patch('ai_code_reviewer_py.cli.asyncio.run')
-def test_review_remote_command(mock_asyncio_run, mock_validate, mock_app_service_class):
+@patch('ai_code_reviewer_py._cli.AppService')
+@patch('ai_code_reviewer_py._cli.validate_final_config')
+@patch('ai_code_reviewer_py._cli.asyncio.run')
+def test_review_remote_command(mock_asyncio_run, mock_validate, mock_app_service_class, runner):
     mock_service = MagicMock()
     mock_app_service_class.return_value = mock_service
     
-    runner = CliRunner()
     result = runner.invoke(cli, [
         'review-remote',
         'https://github.com/example/repo.git',
@@ -346,61 +339,94 @@ def test_review_remote_command(mock_asyncio_run, mock_validate, mock_app_service
     mock_asyncio_run.assert_called_once()
     mock_app_service_class.assert_called_once()
 
-@patch('ai_code_reviewer_py.cli.AppService')
-def test_config_set_command(mock_app_service_class):
-    mock_service = MagicMock()
-    mock_app_service_class.return_value = mock_service
+@patch('ai_code_reviewer_py.config_store.ConfigStore')
+def test_config_set_command(mock_config_store_class, runner):
+    mock_store = MagicMock()
+    mock_config_store_class.return_value = mock_store
     
-    runner = CliRunner()
     result = runner.invoke(cli, ['config', 'set', 'api_key', 'test-key-123'])
     
     assert result.exit_code == 0
-    mock_service.set_global_config_value.assert_called_once_with('api_key', 'test-key-123')
+    mock_store.set_value.assert_called_once_with('api_key', 'test-key-123')
+
+
+def test_config_set_does_not_load_review_stack(tmp_path):
+    code = (
+        "import sys\n"
+        "from ai_code_reviewer_py.cli import cli\n"
+        "cli(['config', 'set', 'max_tokens', '1234'], standalone_mode=False)\n"
+        "print([m for m in ('ai_code_reviewer_py.app_service', 'litellm', 'git') if m in sys.modules])\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        env={**os.environ, "HOME": str(tmp_path)}, cwd=tmp_path
+    )
+    assert result.stdout.strip().endswith("[]")
+    assert json.loads((tmp_path / ".ai-code-reviewer-py" / "config.json").read_text())["max_tokens"] == 1234
 
 @patch('ai_code_reviewer_py.cli.GLOBAL_CONFIG_FILE')
-@patch('builtins.open')
-def test_config_show_command_exists(mock_open, mock_config_file):
-    mock_config_file.exists.return_value = True
-    mock_open.return_value.__enter__.return_value.read.return_value = '{"api_key": "***"}'
+def test_config_show_command_exists(mock_config_file, runner):
+    mock_config_file.read_text.return_value = '{"api_key": "***"}'
     
-    runner = CliRunner()
     result = runner.invoke(cli, ['config', 'show'])
     
     assert result.exit_code == 0
     assert "Current content:" in result.output
+    assert '{"api_key": "***"}' in result.output
 
 @patch('ai_code_reviewer_py.cli.GLOBAL_CONFIG_FILE')
-def test_config_show_command_not_exists(mock_config_file):
-    mock_config_file.exists.return_value = False
+def test_config_show_command_not_exists(mock_config_file, runner):
+    mock_config_file.read_text.side_effect = FileNotFoundError
     
-    runner = CliRunner()
     result = runner.invoke(cli, ['config', 'show'])
     
     assert result.exit_code == 0
     assert "Global configuration file does not exist yet" in result.output
 
-@patch('ai_code_reviewer_py.cli.AppService')
-@patch('ai_code_reviewer_py.cli.asyncio.run')
-def test_review_command_with_range(mock_asyncio_run, mock_app_service_class):
+@patch('ai_code_reviewer_py._cli.AppService')
+@patch('ai_code_reviewer_py._cli.asyncio.run')
+def test_review_command_with_range(mock_asyncio_run, mock_app_service_class, runner):
     mock_service = MagicMock()
     mock_app_service_class.return_value = mock_service
     
-    runner = CliRunner()
     result = runner.invoke(cli, ['review', 'HEAD~3..HEAD'])
     
     assert result.exit_code == 0
     mock_asyncio_run.assert_called_once()
     mock_app_service_class.assert_called_once()
 
-@patch('ai_code_reviewer_py.cli.AppService')
-@patch('ai_code_reviewer_py.cli.asyncio.run')
-def test_review_command_default_range(mock_asyncio_run, mock_app_service_class):
+@patch('ai_code_reviewer_py._cli.AppService')
+@patch('ai_code_reviewer_py._cli.asyncio.run')
+def test_review_command_default_range(mock_asyncio_run, mock_app_service_class, runner):
     mock_service = MagicMock()
     mock_app_service_class.return_value = mock_service
     
-    runner = CliRunner()
     result = runner.invoke(cli, ['review'])
     
     assert result.exit_code == 0
     mock_asyncio_run.assert_called_once()
-    mock_app_service_class.assert_called_once()
\ No newline at end of file
+    mock_app_service_class.assert_called_once()
+
+def test_review_command_overrides_leave_base_config_untouched(runner, mocked_cli_service):
+    base_config = AppConfig(api_key="dummy_key", save_to_markdown=True)
+    mocked_cli_service.load_config.return_value = base_config
+
+    result = runner.invoke(cli, ["review", "--provider", "anthropic", "--no-save-markdown"])
+
+    assert result.exit_code == 0, result.output
+    final_config = mocked_cli_service.service_cls.call_args[0][0]
+    assert final_config.ai_provider == AIProvider.ANTHROPIC
+    assert final_config.save_to_markdown is False
+    assert base_config.ai_provider is None
+    assert base_config.save_to_markdown is True
+
+
+def test_review_repo_command_runs_on_configured_loop_factory(runner, mocker, mocked_cli_service):
+    loop_factory = mocker.MagicMock()
+    mocker.patch("ai_code_reviewer_py._cli._LOOP_FACTORY", loop_factory)
+    mock_asyncio_run = mocker.patch("ai_code_reviewer_py._cli.asyncio.run", side_effect=lambda coro, **kwargs: coro.close())
+
+    result = runner.invoke(cli, ["review-repo"])
+
+    assert result.exit_code == 0, result.output
+    assert mock_asyncio_run.call_args.kwargs == {"loop_factory": loop_factory}
@@ -1,22 +1,14 @@
 import pytest
 import json
 from pathlib import Path
-from ai_code_reviewer_py.config_loader import load_base_config, validate_final_config
+from ai_code_reviewer_py import json_utils
+from ai_code_reviewer_py import config_loader
+from ai_code_reviewer_py.config_loader import _load_json_config_data, api_key_from_env, load_base_config, validate_final_config
 from ai_code_reviewer_py.config_models import AppConfig
-from ai_code_reviewer_py.enums import AIProvider
+from ai_code_reviewer_py.enums import AIModel, AIProvider
 
 
-@pytest.fixture
-def mock_global_constants_for_config(mocker, tmp_path):
-    mock_config_file = tmp_path / "ai-code-reviewer-py" / "config.json"
-    mock_config_dir = tmp_path / "ai-code-reviewer-py"
-    
-    mocker.patch("ai_code_reviewer_py.constants.GLOBAL_CONFIG_FILE", mock_config_file)
-    mocker.patch("ai_code_reviewer_py.constants.GLOBAL_CONFIG_DIR", mock_config_dir)
-    return mock_config_file, mock_config_dir
-
-
-def test_load_base_config_defaults(mocker, mock_global_constants_for_config):
+def test_load_base_config_defaults(mocker, mock_global_config_paths):
     mocker.patch("ai_code_reviewer_py.config_loader._load_json_config_data", return_value={}) # Ensure no file is loaded
     mocker.patch("pathlib.Path.exists", return_value=False)
     
@@ -27,8 +19,8 @@ def test_load_base_config_defaults(mocker, mock_global_constants_for_config):
     assert config.max_tokens == 32000
 
 
-def test_load_base_config_from_file(tmp_path, mocker, mock_global_constants_for_config):
-    mock_config_file_path, _ = mock_global_constants_for_config
+def test_load_base_config_from_file(tmp_path, mocker, mock_global_config_paths):
+    mock_config_file_path, _ = mock_global_config_paths
     config_file = tmp_path / "test-config.json"
     config_data = {
         "ai_provider": "openai",
@@ -48,14 +40,103 @@ def test_load_base_config_from_file(tmp_path, mocker, mock_global_constants_for_
     assert config.max_tokens == 8000
 
 
-def test_validate_final_config_valid(mocker, mock_global_constants_for_config):
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_load_json_config_data_with_and_without_orjson(tmp_path, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(json_utils, "orjson", None)
+    config_data = {"ai_provider": "openai", "custom_prompt": "Révise ✅", "exclude_patterns": ["*.md"]}
+    config_file = tmp_path / "config.json"
+    config_file.write_bytes(json_utils.dumps(config_data, indent=True))
+
+    assert json.loads(config_file.read_text(encoding="utf-8")) == config_data
+    assert _load_json_config_data(config_file) == config_data
+
+    config_file.write_text("{not json", encoding="utf-8")
+    assert _load_json_config_data(config_file) == {}
+
+
+def test_load_base_config_reuses_parsed_file_until_it_changes(tmp_path, mocker, mock_global_config_paths):
+    config_file = tmp_path / "cached-config.json"
+    config_file.write_text(json.dumps({"ai_provider": "openai", "model": "gpt-4"}))
+    loads_spy = mocker.spy(json_utils, "loads")
+
+    first = load_base_config(str(config_file))
+    first.model = "mutated"
+    second = load_base_config(str(config_file))
+
+    assert second.model == "gpt-4"
+    assert loads_spy.call_count == 1
+
+    config_file.write_text(json.dumps({"ai_provider": "openai", "model": "gpt-4.1-long"}))
+    assert load_base_config(str(config_file)).model == "gpt-4.1-long"
+    assert loads_spy.call_count == 2
+
+
+def test_load_base_config_stats_the_chosen_file_once(tmp_path, mocker, mock_global_config_paths):
+    config_file = tmp_path / "stat-once-config.json"
+    config_file.write_text(json.dumps({"ai_provider": "google"}))
+    signature_spy = mocker.spy(config_loader, "_config_file_signature")
+
+    assert load_base_config(str(config_file)).ai_provider == AIProvider.GOOGLE
+    signature_spy.assert_called_once_with(config_file)
+
+
+def test_load_base_config_reads_provider_api_key_from_env(tmp_path, monkeypatch, mock_global_config_paths):
+    config_file = tmp_path / "provider-config.json"
+    config_file.write_text(json.dumps({"ai_provider": "anthropic"}))
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "env-anthropic-key")
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+
+    config = load_base_config(str(config_file))
+
+    assert config.api_key == "env-anthropic-key"
+    assert config.get_required_api_key_name() == "Anthropic API Key"
+    assert api_key_from_env(AIProvider.GOOGLE) == ""
+
+def test_validate_final_config_valid(mocker, mock_global_config_paths):
     config = AppConfig(ai_provider=AIProvider.OPENAI, api_key="test-api-key")
     assert validate_final_config(config) is True
 
 
-def test_validate_final_config_no_api_key(mocker, mock_global_constants_for_config):
+def test_validate_final_config_no_api_key(mocker, mock_global_config_paths):
     config = AppConfig()
     mocker.patch("os.getenv", return_value=None)
     
     with pytest.raises(ValueError, match="is required but not set"): # Match generic message part
-        validate_final_config(config)
\ No newline at end of file
+        validate_final_config(config)
+
+def test_validate_final_config_caches_passing_pairs(mocker, mock_global_config_paths):
+    mocker.patch.object(config_loader, "_VALIDATED_CACHE", set())
+    spy = mocker.spy(config_loader, "validate_required_fields")
+    config = AppConfig(ai_provider=AIProvider.OPENAI, api_key="test-api-key")
+
+    assert validate_final_config(config) is True
+    assert validate_final_config(config.model_copy()) is True
+    assert spy.call_count == 1
+
+    with pytest.raises(ValueError, match="is required but not set"):
+        validate_final_config(config.model_copy(update={"api_key": ""}))
+    with pytest.raises(ValueError, match="is required but not set"):
+        validate_final_config(config.model_copy(update={"api_key": ""}))
+
+
+@pytest.mark.parametrize(
+    "provider, model, valid",
+    [
+        (AIProvider.OPENAI, "gpt-4.1-mini", True),
+        (AIProvider.ANTHROPIC, AIModel.CLAUDE_3_7_SONNET_20250219, True),
+        (AIProvider.GOOGLE, "my-fine-tuned-model", True),
+        (AIProvider.OPENAI, AIModel.CLAUDE_SONNET_4_20250514, False),
+        (AIProvider.ANTHROPIC, "gemini-2.5-pro-preview-05-06", False),
+    ],
+)
+def test_validate_final_config_checks_model_provider(mocker, mock_global_config_paths, provider, model, valid):
+    mocker.patch.object(config_loader, "_VALIDATED_CACHE", set())
+    config = AppConfig(ai_provider=provider, api_key="test-api-key", model=model)
+
+    if valid:
+        assert validate_final_config(config) is True
+    else:
+        with pytest.raises(ValueError, match=f"is not available for provider '{provider.value}'"):
+            validate_final_config(config)
@@ -1,9 +1,12 @@
 import pytest
 from datetime import datetime
 import git # Import for git.InvalidGitRepositoryError
+import os
 import tarfile
 import io
-from ai_code_reviewer_py.git_analyzer import GitAnalyzer, CommitInfo
+import httpx
+from ai_code_reviewer_py.git_analyzer import GitAnalyzer, CommitInfo, TAR_BUFFER_SIZE, TRUNCATION_MARKER, _ResponseReader
+from ai_code_reviewer_py.models import FileDetails
 
 
 @pytest.fixture
@@ -11,6 +14,27 @@ def mock_repo(mocker):
     return mocker.patch("ai_code_reviewer_py.git_analyzer.git.Repo")
 
 
+def _tar_bytes(members, mode: str = "w") -> bytes:
+    """Builds a tar archive in memory from (name, content) pairs."""
+    tar_buffer = io.BytesIO()
+    with tarfile.open(fileobj=tar_buffer, mode=mode) as tar:
+        for name, content in members:
+            info = tarfile.TarInfo(name=name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return tar_buffer.getvalue()
+
+
+@pytest.fixture(scope="module")
+def sample_tar_bytes():
+    # Two text files and a binary one that extraction skips; built once and only ever read
+    return _tar_bytes([
+        ("src/file1.py", "print('hello world')".encode('utf-8')),
+        ("docs/file2.txt", "Test content".encode('utf-8')),
+        ("assets/logo.png", b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR"),
+    ])
+
+
 def test_git_analyzer_init_success(mock_repo):
     analyzer = GitAnalyzer()
     mock_repo.assert_called_once_with('.', search_parent_directories=True) # Analyzer should init
@@ -40,12 +64,47 @@ def test_get_commits_single_commit(mock_repo, mocker):
     
     assert len(commits) == 1
     commit = commits[0]
-    assert commit['hash'] == "abc123"
-    assert commit['message'] == "Test commit"
-    assert commit['author_name'] == "Test Author"
-    assert commit['author_email'] == "test@example.com"
-    assert isinstance(commit['date'], datetime)
-    assert commit['body'] == "Test commit\n\nLonger description"
+    assert commit.hash == "abc123"
+    assert commit.message == "Test commit"
+    assert commit.author_name == "Test Author"
+    assert commit.author_email == "test@example.com"
+    assert isinstance(commit.date, datetime)
+    assert commit.body == "Test commit\n\nLonger description"
+
+
+def test_get_commits_range_matches_commit_objects(tmp_path):
+    repo = git.Repo.init(tmp_path)
+    actor = git.Actor("Ünïcode Author", "author@example.com")
+    for i, message in enumerate(["Initial", "Second\n\nWith a body\nover lines", "Third | with \u00e9"]):
+        (tmp_path / "f.txt").write_text(str(i))
+        repo.index.add(["f.txt"])
+        repo.index.commit(message, author=actor, committer=actor)
+
+    commits = GitAnalyzer(str(tmp_path)).get_commits("HEAD~2..HEAD")
+
+    expected = list(repo.iter_commits(rev="HEAD~2..HEAD"))
+    assert [c.hash for c in commits] == [c.hexsha for c in expected]
+    assert [c.body for c in commits] == ["Third | with \u00e9", "Second\n\nWith a body\nover lines"]
+    assert [c.message for c in commits] == ["Third | with \u00e9", "Second"]
+    assert all(c.author_name == "Ünïcode Author" and c.author_email == "author@example.com" for c in commits)
+    assert [c.date for c in commits] == [datetime.fromtimestamp(c.authored_date) for c in expected]
+
+
+def test_get_commits_range_ignores_show_signature_config(tmp_path, mocker):
+    repo = git.Repo.init(tmp_path)
+    for i in range(2):
+        (tmp_path / "f.txt").write_text(str(i))
+        repo.index.add(["f.txt"])
+        repo.index.commit(f"Commit {i}")
+    with repo.config_writer() as config:
+        config.set_value("log", "showSignature", "true")
+
+    analyzer = GitAnalyzer(str(tmp_path))
+    execute = mocker.spy(git.Git, "execute")
+    commits = analyzer.get_commits("HEAD~1..HEAD")
+
+    assert [c.message for c in commits] == ["Commit 1"]
+    assert "--no-show-signature" in execute.call_args.args[1]
 
 
 def test_get_commit_diff(mock_repo, mocker):
@@ -69,6 +128,54 @@ def test_get_commit_diff(mock_repo, mocker):
     mock_repo_instance.git.show.assert_called_once_with(mock_commit_obj.hexsha, "--unified=3", "--pretty=format:")
 
 
+
+def test_get_commit_diff_uses_full_sha_without_resolving(mock_repo, mocker):
+    mock_repo_instance = mocker.MagicMock()
+    mock_repo.return_value = mock_repo_instance
+    mock_repo_instance.git.show.return_value = "diff content"
+    sha = "0123456789abcdef0123456789abcdef01234567"
+
+    assert GitAnalyzer().get_commit_diff(sha) == "diff content"
+    mock_repo_instance.commit.assert_not_called()
+    mock_repo_instance.git.show.assert_called_once_with(sha, "--unified=3", "--pretty=format:")
+
+
+@pytest.mark.parametrize("value", ["HEAD", "HEAD~1", "abc123..def456", "abc", "abc123^", "-p"])
+def test_get_commit_diff_rejects_anything_but_a_hash(mock_repo, value):
+    with pytest.raises(RuntimeError, match="Invalid commit hash"):
+        GitAnalyzer().get_commit_diff(value)
+    mock_repo.return_value.git.show.assert_not_called()
+
+
+def test_get_commit_diff_of_initial_commit(tmp_path):
+    repo = git.Repo.init(tmp_path)
+    (tmp_path / "a.txt").write_text("hello\n")
+    repo.index.add(["a.txt"])
+    root = repo.index.commit("root")
+
+    diff = GitAnalyzer(str(tmp_path)).get_commit_diff(root.hexsha)
+
+    assert "+++ b/a.txt" in diff and "+hello" in diff
+
+
+def test_get_commit_diff_caches_by_hash_with_lru_eviction(mock_repo, mocker):
+    mock_repo_instance = mocker.MagicMock()
+    mock_repo.return_value = mock_repo_instance
+    mock_repo_instance.commit.side_effect = lambda ref: mocker.MagicMock(hexsha=ref, parents=[])
+    mock_repo_instance.git.show.side_effect = lambda sha, *args: f"diff {sha}"
+
+    analyzer = GitAnalyzer(diff_cache_size=2)
+    assert analyzer.get_commit_diff("aaaa") == "diff aaaa"
+    assert analyzer.get_commit_diff("bbbb") == "diff bbbb"
+    assert analyzer.get_commit_diff("aaaa") == "diff aaaa"
+    assert mock_repo_instance.git.show.call_count == 2
+
+    analyzer.get_commit_diff("cccc")  # evicts "bbbb", the least recently used
+    analyzer.get_commit_diff("aaaa")
+    assert mock_repo_instance.git.show.call_count == 3
+    analyzer.get_commit_diff("bbbb")
+    assert mock_repo_instance.git.show.call_count == 4
+
 def test_get_tracked_files(mock_repo, mocker):
     mock_repo_instance = mocker.MagicMock()
     mock_repo.return_value = mock_repo_instance
@@ -83,42 +190,232 @@ def test_get_tracked_files(mock_repo, mocker):
     mock_repo_instance.git.ls_files.assert_called_once_with()
 
 
-def test_get_files_from_remote_archive_success(mocker):
+def test_read_tracked_files_reads_index_blobs(tmp_path):
+    repo = git.Repo.init(tmp_path)
+    (tmp_path / "small.py").write_text("print('hi')\n")
+    (tmp_path / "big.bin").write_bytes(b"x" * 100)
+    repo.index.add(["small.py", "big.bin"])
+
+    analyzer = GitAnalyzer(str(tmp_path))
+    files = analyzer.read_tracked_files(["small.py", "big.bin", "missing.py"], max_bytes=50)
+
+    assert files == [FileDetails(path="small.py", content="print('hi')\n")]
+
+
+def test_read_tracked_files_reads_unstaged_edits_from_disk(tmp_path, mocker):
+    repo = git.Repo.init(tmp_path)
+    (tmp_path / "edited.py").write_text("staged\n")
+    (tmp_path / "clean.py").write_text("clean\n")
+    (tmp_path / "grown.py").write_text("small\n")
+    repo.index.add(["edited.py", "clean.py", "grown.py"])
+    (tmp_path / "edited.py").write_text("unstaged edit\n")
+    (tmp_path / "grown.py").write_text("y" * 100)
+    analyzer = GitAnalyzer(str(tmp_path))
+    stream = mocker.spy(analyzer.repo.odb, "stream")
+
+    files = analyzer.read_tracked_files(["edited.py", "clean.py", "grown.py"], max_bytes=50)
+
+    assert files == [
+        FileDetails(path="edited.py", content="unstaged edit\n"),
+        FileDetails(path="clean.py", content="clean\n"),
+    ]
+    assert stream.call_count == 1
+
+
+def test_read_tracked_files_truncates_large_blobs(tmp_path):
+    repo = git.Repo.init(tmp_path)
+    (tmp_path / "long.py").write_text("a" * 30 + "b" * 30)
+    (tmp_path / "short.py").write_text("tiny\n")
+    repo.index.add(["long.py", "short.py"])
+
+    analyzer = GitAnalyzer(str(tmp_path))
+    files = analyzer.read_tracked_files(["long.py", "short.py"], truncate_bytes=30)
+
+    assert files == [
+        FileDetails(path="long.py", content="a" * 30 + TRUNCATION_MARKER),
+        FileDetails(path="short.py", content="tiny\n"),
+    ]
+
+
+def test_read_tracked_files_reads_duplicate_blobs_once(tmp_path, mocker):
+    repo = git.Repo.init(tmp_path)
+    for name in ["a/__init__.py", "b/__init__.py", "c.py"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text("# pkg\n" if name.endswith("__init__.py") else "other\n")
+    repo.index.add(["a/__init__.py", "b/__init__.py", "c.py"])
+    analyzer = GitAnalyzer(str(tmp_path))
+    stream = mocker.spy(analyzer.repo.odb, "stream")
+
+    files = analyzer.read_tracked_files(["a/__init__.py", "b/__init__.py", "c.py"])
+
+    assert [f.content for f in files] == ["# pkg\n", "# pkg\n", "other\n"]
+    assert files[0].content is files[1].content
+    assert stream.call_count == 2
+
+def test_get_files_from_remote_archive_success(mocker, sample_tar_bytes):
     mock_git_instance = mocker.MagicMock()
-    
-    # Create a dummy tar archive in memory
-    tar_buffer = io.BytesIO()
-    with tarfile.open(fileobj=tar_buffer, mode="w") as tar:
-        # Add file1.py
-        file1_content = "print('hello world')".encode('utf-8')
-        file1_info = tarfile.TarInfo(name="src/file1.py")
-        file1_info.size = len(file1_content)
-        tar.addfile(file1_info, io.BytesIO(file1_content))
-        
-        # Add file2.txt
-        file2_content = "Test content".encode('utf-8')
-        file2_info = tarfile.TarInfo(name="docs/file2.txt")
-        file2_info.size = len(file2_content)
-        tar.addfile(file2_info, io.BytesIO(file2_content))
-    tar_buffer.seek(0)
-    
-    mock_git_instance.archive.return_value = tar_buffer.getvalue()
+    mock_git_instance.archive.return_value = sample_tar_bytes
     mocker.patch("ai_code_reviewer_py.git_analyzer.Git", return_value=mock_git_instance)
 
     analyzer = GitAnalyzer() # Not used for this static method, but good practice
     files_data = analyzer.get_files_from_remote_archive("https://example.com/repo.git", "main")
 
     assert len(files_data) == 2
-    assert {"path": "src/file1.py", "content": "print('hello world')"} in files_data
-    assert {"path": "docs/file2.txt", "content": "Test content"} in files_data
+    assert FileDetails(path="src/file1.py", content="print('hello world')") in files_data
+    assert FileDetails(path="docs/file2.txt", content="Test content") in files_data
     mock_git_instance.archive.assert_called_once_with(
+        'main',
         remote="https://example.com/repo.git",
         format='tar',
-        ref='main',
         kill_after_timeout=120,
-        stdout_as_bytes=True
+        stdout_as_string=False
+    )
+
+
+def _mock_archive_client(mocker, handler):
+    """Serves archive downloads from `handler` through the shared client's code path."""
+    client = httpx.Client(transport=httpx.MockTransport(handler), follow_redirects=True)
+    mocker.patch("ai_code_reviewer_py.git_analyzer._get_archive_http_client", return_value=client)
+    return client
+
+
+def _chunked(payload: bytes, size: int = 1024):
+    """Response body that arrives in pieces, like a socket, and can only be consumed once."""
+    for start in range(0, len(payload), size):
+        yield payload[start:start + size]
+
+
+def test_get_files_from_remote_archive_streams_github_tarball(mocker):
+    tar_buffer = io.BytesIO()
+    with tarfile.open(fileobj=tar_buffer, mode="w:gz") as tar:
+        content = b"print('streamed')"
+        info = tarfile.TarInfo(name="repo-main/src/app.py")
+        info.size = len(content)
+        tar.addfile(info, io.BytesIO(content))
+        dir_info = tarfile.TarInfo(name="repo-main/docs")
+        dir_info.type = tarfile.DIRTYPE
+        tar.addfile(dir_info)
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, content=_chunked(tar_buffer.getvalue()))
+
+    _mock_archive_client(mocker, handler)
+    reader_read = mocker.spy(_ResponseReader, "read")
+    reader_close = mocker.spy(_ResponseReader, "close")
+    tar_open = mocker.spy(tarfile, "open")
+
+    files_data = GitAnalyzer.get_files_from_remote_archive("https://github.com/owner/repo", "main")
+
+    assert files_data == [FileDetails(path="src/app.py", content="print('streamed')")]
+    assert requested == ["https://github.com/owner/repo/archive/main.tar.gz"]
+    assert all(call.args[1] >= 0 for call in reader_read.call_args_list), "archive must be read incrementally"
+    reader_close.assert_called_once()
+    assert tar_open.call_args.kwargs["bufsize"] == TAR_BUFFER_SIZE
+
+
+def test_open_github_archive_falls_back_over_one_connection(mocker):
+    archive = b"archive-bytes"
+    served = []
+
+    def handler(request):
+        served.append(request.url.path)
+        if request.url.path.endswith("/refs/tags/v1.tar.gz"):
+            return httpx.Response(200, content=_chunked(archive, 4))
+        return httpx.Response(404, content=b"Not Found")
+
+    client = _mock_archive_client(mocker, handler)
+    close_unread = mocker.spy(httpx.Response, "close")
+
+    with GitAnalyzer._open_github_archive("https://github.com/owner/repo", "v1") as reader:
+        assert reader.read(5) + reader.read() == archive
+
+    assert served == [
+        "/owner/repo/archive/v1.tar.gz",
+        "/owner/repo/archive/refs/heads/v1.tar.gz",
+        "/owner/repo/archive/refs/tags/v1.tar.gz",
+    ]
+    # Failed attempts are drained before closing so their connection stays reusable
+    assert all(call.args[0].is_stream_consumed for call in close_unread.call_args_list)
+    client.close()
+
+
+def _github_tarball(content: bytes) -> bytes:
+    return _tar_bytes([("repo-main/app.py", content)], mode="w:gz")
+
+
+def test_get_files_from_remote_archive_reuses_cached_github_download(tmp_path, mocker):
+    mocker.patch("ai_code_reviewer_py.git_analyzer.ARCHIVE_CACHE_DIR", tmp_path)
+    archive = _github_tarball(b"v1")
+    downloads = []
+
+    def handler(request):
+        downloads.append(request.url.path)
+        return httpx.Response(200, content=_chunked(archive))
+
+    _mock_archive_client(mocker, handler)
+
+    first = GitAnalyzer.get_files_from_remote_archive("https://github.com/owner/repo", "main", cache_ttl=60)
+    second = GitAnalyzer.get_files_from_remote_archive("https://github.com/owner/repo", "main", cache_ttl=60)
+
+    assert first == second == [FileDetails(path="app.py", content="v1")]
+    assert len(downloads) == 1
+    cached = GitAnalyzer._archive_cache_path("https://github.com/owner/repo", "main")
+    assert cached.read_bytes() == archive
+    assert list(tmp_path.glob("*.tmp")) == []
+
+    # Expired entries are downloaded again
+    os.utime(cached, (0, 0))
+    GitAnalyzer.get_files_from_remote_archive("https://github.com/owner/repo", "main", cache_ttl=60)
+    assert len(downloads) == 2
+
+    # Without a TTL nothing is read from or written to the cache
+    GitAnalyzer.get_files_from_remote_archive("https://github.com/owner/repo", "other")
+    assert len(downloads) == 3
+    assert not GitAnalyzer._archive_cache_path("https://github.com/owner/repo", "other").exists()
+
+
+def test_evict_archive_cache_keeps_newest_entries(tmp_path, mocker):
+    mocker.patch("ai_code_reviewer_py.git_analyzer.ARCHIVE_CACHE_DIR", tmp_path)
+    for age in range(5):
+        entry = tmp_path / f"{age}.tar.gz"
+        entry.write_bytes(b"")
+        os.utime(entry, (1000 - age, 1000 - age))
+
+    GitAnalyzer._evict_archive_cache(keep=2)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["0.tar.gz", "1.tar.gz"]
+
+
+def test_extract_files_skips_binary_names_and_oversized_members():
+    tar_buffer = io.BytesIO(_tar_bytes([("small.py", b"ok"), ("big.txt", b"x" * 50), ("logo.SVG.png", b"text-looking")]))
+
+    files_data = GitAnalyzer._extract_files_from_tar_stream(tar_buffer, "r|*", max_bytes=10)
+
+    assert files_data == [FileDetails(path="small.py", content="ok")]
+
+
+def test_extract_files_shares_identical_contents():
+    tar_buffer = io.BytesIO(_tar_bytes([("a/__init__.py", b"# pkg\n"), ("b/__init__.py", b"# pkg\n"), ("c.py", b"other\n")]))
+
+    files_data = GitAnalyzer._extract_files_from_tar_stream(tar_buffer, "r|*")
+
+    assert [f.content for f in files_data] == ["# pkg\n", "# pkg\n", "other\n"]
+    assert files_data[0].content is files_data[1].content
+
+
+def test_extract_files_skips_filtered_paths_before_reading(mocker):
+    tar_buffer = io.BytesIO(_tar_bytes([("repo-main/src/app.py", b"ok"), ("repo-main/node_modules/lib.js", b"vendored")]))
+    extractfile = mocker.spy(tarfile.TarFile, "extractfile")
+
+    files_data = GitAnalyzer._extract_files_from_tar_stream(
+        tar_buffer, "r|*", strip_top_level_dir=True, path_filter=lambda path: path.startswith("src/")
     )
 
+    assert files_data == [FileDetails(path="src/app.py", content="ok")]
+    assert [call.args[1].name for call in extractfile.call_args_list] == ["repo-main/src/app.py"]
+
 
 def test_get_files_from_remote_archive_git_command_error(mocker):
     mock_git_instance = mocker.MagicMock()
@@ -127,4 +424,70 @@ def test_get_files_from_remote_archive_git_command_error(mocker):
 
     analyzer = GitAnalyzer()
     with pytest.raises(RuntimeError, match=r"Failed to fetch archive from 'https://example.com/repo.git' \(ref: main\)\. Git command failed: \s*stderr: 'fatal: error'"):
-        analyzer.get_files_from_remote_archive("https://example.com/repo.git", "main")
\ No newline at end of file
+        analyzer.get_files_from_remote_archive("https://example.com/repo.git", "main")
+
+def test_get_files_from_remote_archive_clones_when_upload_archive_is_disabled(tmp_path, mocker):
+    origin = git.Repo.init(tmp_path / "origin")
+    (tmp_path / "origin" / "app.py").write_text("v1\n")
+    origin.index.add(["app.py"])
+    origin.index.commit("first")
+    origin.create_tag("v1")
+    (tmp_path / "origin" / "app.py").write_text("v2\n")
+    origin.index.add(["app.py"])
+    origin.index.commit("second")
+    mock_git_instance = mocker.MagicMock()
+    mock_git_instance.archive.side_effect = git.GitCommandError(
+        "archive", 128, stderr="fatal: remote error: upload-archive: archiver died"
+    )
+    mocker.patch("ai_code_reviewer_py.git_analyzer.Git", return_value=mock_git_instance)
+    clone_url = (tmp_path / "origin").as_uri()
+    mocker.patch.object(GitAnalyzer, "_validate_repo_url", side_effect=lambda url: url)
+
+    latest = GitAnalyzer.get_files_from_remote_archive(clone_url, "HEAD")
+    tagged = GitAnalyzer.get_files_from_remote_archive(clone_url, "v1")
+
+    assert latest == [FileDetails(path="app.py", content="v2\n")]
+    assert tagged == [FileDetails(path="app.py", content="v1\n")]
+
+
+@pytest.mark.parametrize("value", ["HEAD~1..HEAD", "main...feature/x", "'abc123^'"])
+def test_validate_commit_range_accepts_safe_ranges(value):
+    assert GitAnalyzer._validate_commit_range(value) == value.strip("'")
+
+
+@pytest.mark.parametrize("value", ["HEAD;rm -rf", "a|b", "$(id)", "main\n\"", "a b", ""])
+def test_validate_commit_range_and_ref_reject_unsafe_input(value):
+    with pytest.raises(ValueError, match="Invalid characters in commit range"):
+        GitAnalyzer._validate_commit_range(value)
+    with pytest.raises(ValueError, match="Invalid git reference"):
+        GitAnalyzer._validate_git_ref(value)
+
+
+def test_validators_cache_valid_refs_but_keep_rejecting_invalid_ones():
+    GitAnalyzer._validate_git_ref.cache_clear()
+
+    assert GitAnalyzer._validate_git_ref(" main ") == GitAnalyzer._validate_git_ref(" main ") == "main"
+    assert GitAnalyzer._validate_git_ref.cache_info().hits == 1
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            GitAnalyzer._validate_git_ref("main;id")
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://github.com/owner/widget", ("owner", "widget")),
+        ("https://github.com/owner/widget.git", ("owner", "widget")),
+        ("https://github.com/my.org/repo.js/", ("my.org", "repo.js")),
+        ("git@github.com:owner/tig.git", ("owner", "tig")),
+        ("  github.com/owner/repo  ", ("owner", "repo")),
+    ],
+)
+def test_parse_github_url_keeps_repo_name_intact(url, expected):
+    assert GitAnalyzer._parse_github_url(url) == expected
+
+
+@pytest.mark.parametrize("url", ["https://github.com/owner", "https://github.com/owner/repo/tree/main", "https://gitlab.com/o/r"])
+def test_parse_github_url_rejects_other_shapes(url):
+    with pytest.raises(ValueError, match="Could not parse GitHub URL"):
+        GitAnalyzer._parse_github_url(url)
@@ -4,8 +4,10 @@ from unittest.mock import patch, MagicMock, AsyncMock
 from ai_code_reviewer_py.config_models import AppConfig
 from ai_code_reviewer_py.app_service import AppService
 from ai_code_reviewer_py.enums import AIProvider
+from ai_code_reviewer_py.git_analyzer import CommitInfo
+from ai_code_reviewer_py.models import FileDetails
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def integration_config():
     return AppConfig(
         ai_provider=AIProvider.OPENAI,
@@ -14,7 +16,9 @@ def integration_config():
         markdown_output_dir="test_reviews"
     )
 
-@pytest.fixture
+# Shared across the workflow tests; each test patches what it needs with patch.object,
+# which restores the service's state on exit.
+@pytest.fixture(scope="module")
 def integration_service(integration_config):
     return AppService(integration_config)
 
@@ -22,14 +26,14 @@ def integration_service(integration_config):
 async def test_full_commit_review_workflow(integration_service):
     """Test the complete workflow of reviewing commits"""
     mock_commits = [
-        {
-            "hash": "abc123",
-            "message": "Add new feature",
-            "author_name": "Test Author",
-            "author_email": "test@example.com",
-            "date": datetime(2024, 1, 1, 10, 0, 0),
-            "body": "Add new feature\n\nDetailed description"
-        }
+        CommitInfo(
+            hash="abc123",
+            message="Add new feature",
+            author_name="Test Author",
+            author_email="test@example.com",
+            date=datetime(2024, 1, 1, 10, 0, 0),
+            body="Add new feature\n\nDetailed description"
+        )
     ]
     
     mock_diff = "--- a/file.py\n+++ b/file.py\n@@ -1,1 +1,2 @@\n print('hello')\n+print('world')"
@@ -59,7 +63,7 @@ async def test_full_commit_review_workflow(integration_service):
         args = mock_review_multiple.call_args[0]
         assert len(args[0]) == 1  # commits
         assert len(args[1]) == 1  # diffs
-        assert args[0][0]["hash"] == "abc123"
+        assert args[0][0].hash == "abc123"
         assert args[1][0] == mock_diff
 
 @pytest.mark.asyncio
@@ -82,10 +86,11 @@ async def test_full_repository_review_workflow(integration_service):
     
     with patch.object(integration_service.git_analyzer, 'get_tracked_files', return_value=mock_files), \
          patch.object(integration_service.ai_reviewer, 'review_entire_repository_with_retry', new_callable=AsyncMock) as mock_repo_review, \
-         patch('pathlib.Path.read_text', return_value="test content"):
+         patch.object(integration_service.git_analyzer, 'read_tracked_files',
+                      side_effect=lambda paths, max_bytes=None, truncate_bytes=None: [FileDetails(path=p, content="test content") for p in paths]), \
+         patch.object(integration_service.git_analyzer.repo, 'working_dir', "/test/repo"):
         
         mock_repo_review.return_value = mock_repo_summary
-        integration_service.git_analyzer.repo.working_dir = "/test/repo"
         
         await integration_service.review_repository_files(
             include_patterns=["**/*.py"],